@@ -1,36 +1,43 @@
 from fastapi import APIRouter, UploadFile, File, Form
-import os, uuid
+from fastapi.responses import StreamingResponse
+import os, uuid, json
 from datetime import datetime
 from concurrent.futures import ProcessPoolExecutor
 from app.services.video_processing import extract_frames
-from app.services.deepfake_detector import predict_image
-from app.services.audio_processing import AudioProcessor
-from app.utils.helpers import save_analysis_result, create_smart_timeline, create_analysis_summary, create_segment_analysis_details
+from app.services.audio_processing import audio_processor
+from app.services.analysis_pipeline import StageTimer, run_branches
+from app.services.report_worker import schedule_reports
+from app.services.frame_columns import FrameColumns
+from app.services.analysis_events import analysis_notifier
+from app.core.config import ANALYSIS_LONG_POLL_MAX_SEC, ANALYSIS_SSE_HEARTBEAT_SEC, ANALYSIS_SSE_RETRY_MS
+from app.utils.helpers import get_analysis_result, save_analysis_result, save_frame_results, create_smart_timeline, create_analysis_summary, create_segment_analysis_details
 import asyncio
 
 router = APIRouter()
 
 # 전역 함수 (멀티프로세싱에서 호출 가능)
+# deepfake_detector는 torch를 불러오므로 서버 import 시점이 아닌 첫 추론 시점에 import
 def analyze_single_frame(frame):
+    from app.services.deepfake_detector import predict_image
     return {**predict_image(frame["path"]), "time": frame["time"]}
 
+def analyze_frame_batch(frames):
+    """프레임 배치를 한 번의 processor(images=[...]) 호출로 분석"""
+    from app.services.deepfake_detector import predict_batch
+    batch_results = predict_batch([frame["path"] for frame in frames])
+    return [{**result, "time": frame["time"]} for frame, result in zip(frames, batch_results)]
+
 def analyze_frames_in_parallel(frames, batch_size=5):
     """메모리 절약을 위한 배치 처리"""
     results = []
+    batches = [frames[i:i + batch_size] for i in range(0, len(frames), batch_size)]
     
-    # 프레임을 배치로 나누어 처리
-    for i in range(0, len(frames), batch_size):
-        batch = frames[i:i + batch_size]
-        print(f"배치 {i//batch_size + 1} 처리 중... ({len(batch)}개 프레임)")
-        
-        # 작은 배치로 병렬 처리
-        with ProcessPoolExecutor(max_workers=2) as executor:  # 워커 수 감소
-            batch_results = list(executor.map(analyze_single_frame, batch))
+    # 워커 풀은 한 번만 생성하여 배치마다 모델을 다시 로드하지 않음
+    # (추론은 inference_mode에서 수행되어 배치마다 gc.collect()가 필요 없음)
+    with ProcessPoolExecutor(max_workers=2) as executor:  # 워커 수 감소
+        for batch_num, batch_results in enumerate(executor.map(analyze_frame_batch, batches), start=1):
+            print(f"배치 {batch_num} 처리 완료 ({len(batch_results)}개 프레임)")
             results.extend(batch_results)
-        
-        # 메모리 정리
-        import gc
-        gc.collect()
     
     return results
 
@@ -60,7 +67,8 @@ async def start_analysis(user_id: str = Form(...), video: UploadFile = File(...)
         with open(video_path, "wb") as buffer:
             buffer.write(await video.read())
         
-        # 백그라운드에서 분석 시작
+        # 백그라운드에서 분석 시작 (완료 시 대기 중인 결과 조회 요청에 알림)
+        analysis_notifier.start(analysis_id)
         asyncio.create_task(process_video_background(analysis_id, video_path, user_id, video.filename))
         
         # 즉시 분석 ID 반환
@@ -75,20 +83,25 @@ async def start_analysis(user_id: str = Form(...), video: UploadFile = File(...)
         return {"error": str(e)}
 
 @router.get("/get-result/{analysis_id}", summary="Get Analysis Result")
-async def get_result(analysis_id: str):
+async def get_result(analysis_id: str, wait: float = 0):
     """
     분석 결과 조회
     
     Args:
         analysis_id: 분석 ID
+        wait: 분석이 끝나지 않았으면 완료될 때까지 최대 wait초 대기 (long-poll, 0이면 즉시 응답)
     
     Returns:
         분석 결과 또는 진행 상태
     """
     try:
-        from app.utils.helpers import get_analysis_result
+        result = None
+        if wait > 0:
+            result = await analysis_notifier.wait(analysis_id, min(wait, ANALYSIS_LONG_POLL_MAX_SEC))
         
-        result = get_analysis_result(analysis_id)
+        # 이 프로세스에서 진행 중인 분석은 저장소를 읽지 않음
+        if result is None and not analysis_notifier.is_processing(analysis_id):
+            result = await _lookup_result(analysis_id)
         
         if result:
             return {
@@ -105,53 +118,119 @@ async def get_result(analysis_id: str):
         print(f"결과 조회 오류: {e}")
         return {"error": str(e)}
 
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+async def _lookup_result(analysis_id: str):
+    """완료된 결과 (저장에 실패해 메모리에만 있는 최종 결과 우선, 없으면 저장소 조회)"""
+    return analysis_notifier.unsaved_result(analysis_id) or await get_analysis_result(analysis_id)
+
+async def _result_events(analysis_id: str):
+    """분석 완료까지 연결을 유지하고 완료 시 결과 이벤트 하나를 보낸 뒤 종료"""
+    result = None
+    if analysis_id in analysis_notifier:
+        yield _sse_event("status", {"status": "processing"})
+        while analysis_id in analysis_notifier:
+            result = await analysis_notifier.wait(analysis_id, ANALYSIS_SSE_HEARTBEAT_SEC)
+            if result is None and analysis_id in analysis_notifier:
+                yield ": keep-alive\n\n"
+    
+    if result is None:
+        result = await _lookup_result(analysis_id)
+    
+    if result and result.get("status") == "error":
+        yield _sse_event("error", {"status": "error", "result": result})
+    elif result:
+        yield _sse_event("result", {"status": "completed", "result": result})
+    else:
+        # 다른 프로세스에서 진행 중인 분석: 클라이언트가 retry 간격 후 재연결
+        yield f"retry: {ANALYSIS_SSE_RETRY_MS}\n"
+        yield _sse_event("status", {"status": "processing"})
+
+@router.get("/events/{analysis_id}", summary="Stream Analysis Result (SSE)")
+async def result_events(analysis_id: str):
+    """
+    분석 완료 알림 (Server-Sent Events)
+    
+    진행 중이면 "status" 이벤트 후 완료될 때까지 연결을 유지하고, 완료되면 "result" 이벤트(분석 오류면 "error" 이벤트)를 보낸다.
+    
+    Args:
+        analysis_id: 분석 ID
+    """
+    return StreamingResponse(
+        _result_events(analysis_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _run_video_branch(video_path: str, video_filename: str, timer: StageTimer):
+    """
+    영상 분기: 길이 확인 → 프레임 추출 → 배치 추론 (음성 분기와 동시에 실행)
+    
+    Returns:
+        tuple: (프레임별 결과, duration, fps, frame_count, frame_rate)
+    """
+    # 동영상 길이 확인 및 동적 프레임 추출 간격 설정
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    duration = frame_count / fps if fps > 0 else 0
+    cap.release()
+
+    # 영상 길이에 따른 프레임 추출 간격 동적 조정
+    if duration <= 5:
+        frame_rate = 0.5  # 2초마다 1프레임 (짧은 영상)
+    elif duration <= 10:
+        frame_rate = 1.0  # 1초마다 1프레임 (중간 영상)
+    elif duration <= 30:
+        frame_rate = 2.0  # 2초마다 1프레임 (긴 영상)
+    else:
+        frame_rate = 3.0  # 3초마다 1프레임 (매우 긴 영상)
+
+    print(f"영상 길이: {duration:.1f}초, 프레임 추출 간격: {frame_rate}초")
+
+    # 프레임 추출
+    temp_dir = os.path.join(os.getcwd(), "temp")
+    frame_dir = os.path.join(temp_dir, f"{video_filename}_frames")
+    with timer.stage("frame_extraction"):
+        frames = extract_frames(video_path, frame_dir, frame_rate=frame_rate)
+    if not frames:
+        raise Exception("프레임 추출 실패: 영상이 비어있거나 지원되지 않는 형식입니다.")
+
+    # 병렬 프레임 분석 (배치 처리)
+    print(f"총 {len(frames)}개 프레임을 배치로 처리합니다...")
+    with timer.stage("frame_inference"):
+        results = analyze_frames_in_parallel(frames, batch_size=3)  # 배치 크기 더 작게
+    print(f"프레임 분석 완료: {len(results)}개 결과")
+
+    # 프레임 파일들 즉시 삭제 (메모리 절약)
+    import shutil
+    try:
+        shutil.rmtree(frame_dir)
+        print("프레임 파일들 정리 완료")
+    except Exception as e:
+        print(f"프레임 파일 정리 실패: {e}")
+    return results, duration, fps, frame_count, frame_rate
+
 # 백그라운드에서 비디오 처리
 async def process_video_background(analysis_id: str, video_path: str, user_id: str, video_filename: str):
     """
     백그라운드에서 비디오 분석 처리
     """
+    final_result = None
+    persisted = True
     try:
         print(f"백그라운드 분석 시작: {analysis_id}")
         
-        # 동영상 길이 확인 및 동적 프레임 추출 간격 설정
-        import cv2
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        duration = frame_count / fps if fps > 0 else 0
-        cap.release()
-        
-        # 영상 길이에 따른 프레임 추출 간격 동적 조정
-        if duration <= 5:
-            frame_rate = 0.5  # 2초마다 1프레임 (짧은 영상)
-        elif duration <= 10:
-            frame_rate = 1.0  # 1초마다 1프레임 (중간 영상)
-        elif duration <= 30:
-            frame_rate = 2.0  # 2초마다 1프레임 (긴 영상)
-        else:
-            frame_rate = 3.0  # 3초마다 1프레임 (매우 긴 영상)
-        
-        print(f"영상 길이: {duration:.1f}초, 프레임 추출 간격: {frame_rate}초")
-        
-        # 프레임 추출
-        temp_dir = os.path.join(os.getcwd(), "temp")
-        frame_dir = os.path.join(temp_dir, f"{video_filename}_frames")
-        frames = extract_frames(video_path, frame_dir, frame_rate=frame_rate)
-        if not frames:
-            raise Exception("프레임 추출 실패: 영상이 비어있거나 지원되지 않는 형식입니다.")
-
-        # 병렬 프레임 분석 (배치 처리)
-        print(f"총 {len(frames)}개 프레임을 배치로 처리합니다...")
-        results = analyze_frames_in_parallel(frames, batch_size=3)  # 배치 크기 더 작게
-        print(f"프레임 분석 완료: {len(results)}개 결과")
-        
-        # 프레임 파일들 즉시 삭제 (메모리 절약)
-        import shutil
-        try:
-            shutil.rmtree(frame_dir)
-            print("프레임 파일들 정리 완료")
-        except Exception as e:
-            print(f"프레임 파일 정리 실패: {e}")
+        # 영상 분기와 음성 분기를 별도 실행기에서 동시에 실행
+        timer = StageTimer()
+        (results, duration, fps, frame_count, frame_rate), audio_analysis = await run_branches(
+            lambda: _run_video_branch(video_path, video_filename, timer),
+            lambda: audio_processor.analyze_audio(video_path, timer=timer),
+            timer
+        )
+        print(f"영상/음성 분기 완료: {timer.as_dict()}")
 
         # 앙상블 결과 계산 (안전한 키 접근)
         fake_confidences = []
@@ -174,14 +253,10 @@ async def process_video_background(analysis_id: str, video_path: str, user_id: s
         final_label = "FAKE" if fake_ratio >= 0.5 else "REAL"
         print(f"최종 결과: {final_label} (딥페이크 프레임 비율: {fake_ratio:.1%}, FAKE: {fake_conf:.3f}, REAL: {real_conf:.3f})")
 
-        # 오디오 분석
-        print("오디오 분석 시작...")
-        audio_processor = AudioProcessor()
-        audio_analysis = audio_processor.analyze_audio(video_path)
-        print(f"오디오 분석 완료: {audio_analysis}")
-        
-        # 스마트 타임라인 생성
-        timeline = create_smart_timeline(results, min_segment_duration=2.0)
+        # 스마트 타임라인 생성 (두 분기 결과 합류)
+        with timer.stage("aggregation"):
+            frame_columns = FrameColumns.from_rows(results)
+            timeline = create_smart_timeline(frame_columns, min_segment_duration=2.0)
         
         # 분석 요약 생성
         video_analysis = {
@@ -197,12 +272,15 @@ async def process_video_background(analysis_id: str, video_path: str, user_id: s
         # 구간별 상세 분석
         detailed_segments = []
         for segment in timeline:
-            segment_details = create_segment_analysis_details(segment, video_analysis, audio_analysis)
+            segment_details = create_segment_analysis_details(segment, video_analysis, audio_analysis, frame_columns)
             detailed_segments.append({
                 **segment,
                 "details": segment_details
             })
         
+        # 프레임별 점수는 부가 기록으로 분리 저장 (결과 문서에는 참조만)
+        frame_record = await save_frame_results(analysis_id, frame_columns)
+        
         # 최종 결과 구성
         analysis_result = {
             "videoId": analysis_id,
@@ -219,11 +297,16 @@ async def process_video_background(analysis_id: str, video_path: str, user_id: s
             "timeline": detailed_segments,
             "video_analysis": video_analysis,
             "audio_analysis": audio_analysis,
-            "raw_frame_results": results  # 디버깅용
+            "frame_record": frame_record,
+            "timings": timer.as_dict()
         }
         
         # 결과 저장
-        save_analysis_result(analysis_result["videoId"], analysis_result)
+        await save_analysis_result(analysis_result["videoId"], analysis_result)
+        
+        # PDF / Excel 보고서는 작업자 풀에서 미리 생성 (첫 다운로드도 캐시에서 바로 응답)
+        schedule_reports(analysis_result["videoId"], analysis_result)
+        final_result = analysis_result
         
         # 임시 파일 정리
         try:
@@ -245,4 +328,13 @@ async def process_video_background(analysis_id: str, video_path: str, user_id: s
             "error": str(e),
             "status": "error"
         }
-        save_analysis_result(analysis_id, error_result)
+        # 저장에 실패해도 대기 중인 요청은 오류 결과를 받음 ("processing"에 머물지 않음)
+        final_result = error_result
+        try:
+            await save_analysis_result(analysis_id, error_result)
+        except Exception as save_error:
+            print(f"오류 결과 저장 실패: {save_error}")
+            persisted = False
+    finally:
+        # 대기 중인 결과 조회 요청을 즉시 응답
+        analysis_notifier.publish(analysis_id, final_result, persisted=persisted)
@@ -3,13 +3,126 @@ import os, uuid
 from datetime import datetime
 import cv2
 import numpy as np
-from app.services.model_mesonet import MesoNetBackend
-from app.services.audio_processing import AudioProcessor
-from app.utils.helpers import save_analysis_result, create_smart_timeline, create_analysis_summary, create_segment_analysis_details
+from app.services.model_ensemble import get_ensemble_engine
+from app.services.audio_processing import audio_processor
+from app.services.analysis_pipeline import StageTimer, run_branches
+from app.utils.helpers import save_analysis_result, save_frame_results, create_smart_timeline, create_analysis_summary, create_segment_analysis_details
+from app.services.report_worker import schedule_reports
+from app.services.frame_columns import FrameColumns, FAKE, REAL
 from app.core.config import FRAME_SAMPLES, USE_FACE_CROP
 
 router = APIRouter()
 
+def _sample_frames(video_path: str, temp_dir: str):
+    """
+    프레임 샘플링 (영상 분기 1단계)
+    
+    Returns:
+        tuple: ([(프레임 경로, 시간)], duration, fps, frame_count)
+    """
+    # MesoNet 프레임 샘플링 (10개)
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    duration = frame_count / fps if fps > 0 else 0
+
+    # 프레임 샘플링 (품질 향상을 위해 더 많은 프레임 추출)
+    # 화면 녹화 영상의 경우 UI 오버레이로 인해 얼굴 감지가 어려울 수 있으므로 더 많은 프레임 샘플링
+    frames_with_timestamps = []
+    if frame_count > 0:
+        # 짧은 영상의 경우 더 많은 프레임 샘플링
+        # 영상 길이에 따라 샘플 수 조정
+        if duration < 5.0:  # 5초 미만
+            num_samples = min(FRAME_SAMPLES * 3, int(frame_count))  # 3배 (2배 -> 3배로 증가)
+        elif duration < 10.0:  # 10초 미만
+            num_samples = int(FRAME_SAMPLES * 2)  # 2배 (1.5배 -> 2배로 증가)
+        else:
+            num_samples = int(FRAME_SAMPLES * 1.5)  # 1.5배 (기본값도 증가)
+
+        # 균등하게 샘플링 (더 정확한 분포)
+        if num_samples == 1:
+            indices = [0]
+        else:
+            indices = [int(i * (frame_count - 1) / max(1, num_samples - 1)) for i in range(num_samples)]
+
+        for i in indices:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, i)
+            ret, frame = cap.read()
+            if ret:
+                timestamp = i / fps if fps > 0 else 0
+                # 임시 파일로 저장 (JPEG 품질 95로 높임)
+                frame_path = os.path.join(temp_dir, f"frame_{i}_{uuid.uuid4().hex[:8]}.jpg")
+                cv2.imwrite(frame_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+                frames_with_timestamps.append((frame_path, timestamp))
+            if len(frames_with_timestamps) >= num_samples:
+                break
+    cap.release()
+    return frames_with_timestamps, duration, fps, frame_count
+
+def _analyze_frames(frames_with_timestamps: list):
+    """
+    앙상블 엔진 프레임 추론 (영상 분기 2단계)
+    
+    Returns:
+        tuple: (프레임별 결과 리스트, 얼굴 미감지 프레임 수)
+    """
+    # 앙상블 엔진으로 프레임 분석 (기본: MesoNet 단독, 설정에 따라 cascade)
+    engine = get_ensemble_engine()
+    if not engine.load():
+        raise Exception("딥페이크 탐지 모델 로딩 실패")
+
+    predictions = engine.predict_paths([path for path, _ in frames_with_timestamps], face_crop=USE_FACE_CROP)
+
+    results = []
+    no_face_count = 0
+    for (frame_path, timestamp), result in zip(frames_with_timestamps, predictions):
+        try:
+            if "error" not in result:
+                # 얼굴이 감지되지 않은 프레임 체크
+                face_detected = result.get("face_detected", True)
+                if not face_detected:
+                    no_face_count += 1
+
+                results.append({
+                    "ensemble_result": result["label"],
+                    "confidence": result["score"],
+                    "fake_confidence": result["fake_prob"],
+                    "real_confidence": result["real_prob"],
+                    "time": timestamp,
+                    "face_detected": face_detected,
+                    "meta": {
+                        "model": "+".join(result["meta"]["models"]) or "MesoNet",
+                        "ensemble": result["meta"]["ensemble"],
+                        "escalated": result["meta"].get("escalated", False)
+                    }
+                })
+            else:
+                results.append({
+                    "error": result["error"],
+                    "ensemble_result": "REAL",
+                    "confidence": 0.0,
+                    "fake_confidence": 0.0,
+                    "real_confidence": 1.0,
+                    "face_detected": False,
+                    "time": timestamp
+                })
+            # 임시 프레임 파일 삭제
+            try:
+                os.remove(frame_path)
+            except:
+                pass
+        except Exception as e:
+            results.append({
+                "error": str(e),
+                "ensemble_result": "REAL",
+                "confidence": 0.0,
+                "fake_confidence": 0.0,
+                "real_confidence": 1.0,
+                "face_detected": False,
+                "time": timestamp
+            })
+    return results, no_face_count
+
 @router.post("/", summary="Analyze Video")
 async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...)):
     """
@@ -30,45 +143,26 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
         with open(video_path, "wb") as buffer:
             buffer.write(await video.read())
         
-        # MesoNet 프레임 샘플링 (10개)
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        duration = frame_count / fps if fps > 0 else 0
+        # 영상 분기(프레임 추출 → 추론)와 음성 분기를 동시에 실행
+        timer = StageTimer()
         
-        # 프레임 샘플링 (품질 향상을 위해 더 많은 프레임 추출)
-        # 화면 녹화 영상의 경우 UI 오버레이로 인해 얼굴 감지가 어려울 수 있으므로 더 많은 프레임 샘플링
-        frames_with_timestamps = []
-        if frame_count > 0:
-            # 짧은 영상의 경우 더 많은 프레임 샘플링
-            # 영상 길이에 따라 샘플 수 조정
-            if duration < 5.0:  # 5초 미만
-                num_samples = min(FRAME_SAMPLES * 3, int(frame_count))  # 3배 (2배 -> 3배로 증가)
-            elif duration < 10.0:  # 10초 미만
-                num_samples = int(FRAME_SAMPLES * 2)  # 2배 (1.5배 -> 2배로 증가)
-            else:
-                num_samples = int(FRAME_SAMPLES * 1.5)  # 1.5배 (기본값도 증가)
-            
-            # 균등하게 샘플링 (더 정확한 분포)
-            if num_samples == 1:
-                indices = [0]
-            else:
-                indices = [int(i * (frame_count - 1) / max(1, num_samples - 1)) for i in range(num_samples)]
-            
-            for i in indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-                ret, frame = cap.read()
-                if ret:
-                    timestamp = i / fps if fps > 0 else 0
-                    # 임시 파일로 저장 (JPEG 품질 95로 높임)
-                    frame_path = os.path.join(temp_dir, f"frame_{i}_{uuid.uuid4().hex[:8]}.jpg")
-                    cv2.imwrite(frame_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                    frames_with_timestamps.append((frame_path, timestamp))
-                if len(frames_with_timestamps) >= num_samples:
-                    break
-        cap.release()
+        def video_branch():
+            with timer.stage("frame_extraction"):
+                frames_with_timestamps, duration, fps, frame_count = _sample_frames(video_path, temp_dir)
+            if not frames_with_timestamps:
+                return None, 0, duration, fps, frame_count
+            with timer.stage("frame_inference"):
+                results, no_face_count = _analyze_frames(frames_with_timestamps)
+            return results, no_face_count, duration, fps, frame_count
+        
+        def audio_branch():
+            return audio_processor.analyze_audio(video_path, timer=timer)
         
-        if not frames_with_timestamps:
+        (results, no_face_count, duration, fps, frame_count), audio_analysis = await run_branches(
+            video_branch, audio_branch, timer
+        )
+        
+        if results is None:
             return {
                 "error": "프레임을 추출할 수 없습니다.",
                 "video_name": video.filename,
@@ -88,69 +182,15 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
                     "fake_frames": 0,
                     "real_frames": 0
                 },
-                "audio_analysis": {"error": "프레임 추출 실패로 오디오 분석 생략"},
+                "audio_analysis": audio_analysis,
                 "timeline": []
             }
 
-
-        # MesoNet으로 프레임 분석 (PyTorch 버전)
-        backend = MesoNetBackend()
-        if not backend.load_model():
-            raise Exception("MesoNet 모델 로딩 실패")
-        
-        results = []
-        no_face_count = 0
-        for frame_path, timestamp in frames_with_timestamps:
-            try:
-                result = backend.predict(frame_path, face_crop=USE_FACE_CROP)
-                if "error" not in result:
-                    # 얼굴이 감지되지 않은 프레임 체크
-                    face_detected = result.get("face_detected", True)
-                    if not face_detected:
-                        no_face_count += 1
-                    
-                    results.append({
-                        "ensemble_result": result["label"],
-                        "confidence": result["score"],
-                        "fake_confidence": result["fake_prob"],
-                        "real_confidence": result["real_prob"],
-                        "time": timestamp,
-                        "face_detected": face_detected,
-                        "meta": {"model": "MesoNet", "ensemble": False}
-                    })
-                else:
-                    results.append({
-                        "error": result["error"],
-                        "ensemble_result": "REAL",
-                        "confidence": 0.0,
-                        "fake_confidence": 0.0,
-                        "real_confidence": 1.0,
-                        "face_detected": False,
-                        "time": timestamp
-                    })
-                # 임시 프레임 파일 삭제
-                try:
-                    os.remove(frame_path)
-                except:
-                    pass
-            except Exception as e:
-                results.append({
-                    "error": str(e),
-                    "ensemble_result": "REAL",
-                    "confidence": 0.0,
-                    "fake_confidence": 0.0,
-                    "real_confidence": 1.0,
-                    "face_detected": False,
-                    "time": timestamp
-                })
-        
         if no_face_count > 0:
             print(f"[알림] 얼굴 미감지 프레임: {no_face_count}개 (제외됨)")
         
-        # MesoNet 결과 집계
-        fake_confidences = []
-        real_confidences = []
-        confidence_weights = []
+        # MesoNet 결과 집계 (프레임별 점수를 열 단위 배열로 변환하여 한 번에 계산)
+        frame_columns = FrameColumns.from_rows(results)
         
         # 프레임별 확률 출력
         print(f"\n[프레임별 분석 결과]")
@@ -162,20 +202,10 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
             print(f"  프레임 {i+1} ({time_sec:.1f}초) [{face_status}]: {result_label} ({fake_conf:.1%})")
         
         # 결과 수집 (얼굴이 감지된 프레임만 포함)
-        valid_results = [r for r in results if r.get("face_detected", True) and "error" not in r]
-        for r in valid_results:
-            if "fake_confidence" in r:
-                fake_confidences.append(r["fake_confidence"])
-                if "confidence" in r:
-                    confidence_weights.append(r["confidence"])
-                else:
-                    confidence_weights.append(1.0)
-            if "real_confidence" in r:
-                real_confidences.append(r["real_confidence"])
-        
+        valid = frame_columns.valid_mask()
         
         # 얼굴이 감지된 프레임이 없으면 오류 반환
-        if len(valid_results) == 0:
+        if not valid.any():
             return {
                 "status": "error",
                 "message": "영상에서 얼굴이 감지되지 않았습니다. 얼굴이 포함된 영상을 업로드해주세요.",
@@ -184,35 +214,33 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
             }
         
         # 딥페이크 프레임 비율 계산 (얼굴이 감지된 프레임 기준)
-        fake_frames = len([r for r in valid_results if r.get("ensemble_result") == "FAKE"])
-        total_frames = len(valid_results)  # 얼굴이 감지된 프레임만 카운트
+        is_fake = frame_columns.label == FAKE
+        fake_frames = int(np.count_nonzero(valid & is_fake))
+        total_frames = int(np.count_nonzero(valid))  # 얼굴이 감지된 프레임만 카운트
         fake_ratio = fake_frames / total_frames if total_frames > 0 else 0
         
         # 개선된 계산 방식: FAKE 프레임 비율과 확률을 모두 고려
         # 딥페이크 영상에서 일부 프레임만 FAKE로 나올 수 있지만,
         # FAKE 프레임들의 확률이 높다면 전체 영상도 높은 확률로 반영되어야 함
         # 얼굴이 감지된 프레임만 사용
-        fake_frame_confidences = [r["fake_confidence"] for r in valid_results 
-                                 if r.get("ensemble_result") == "FAKE" and "fake_confidence" in r]
+        fake_confidences = frame_columns.fake_confidence[valid].astype(np.float64)
+        fake_frame_confidences = frame_columns.fake_confidence[valid & is_fake].astype(np.float64)
+        
+        # 전체 단순 평균
+        overall_avg = float(fake_confidences.mean())
         
-        if fake_confidences and len(fake_confidences) > 0:
-            # 전체 단순 평균
-            overall_avg = sum(fake_confidences) / len(fake_confidences)
+        if len(fake_frame_confidences):
+            # FAKE 프레임들의 평균
+            avg_fake_conf = float(fake_frame_confidences.mean())
             
-            if fake_frame_confidences:
-                # FAKE 프레임들의 평균
-                avg_fake_conf = sum(fake_frame_confidences) / len(fake_frame_confidences)
-                
-                # 최종 계산: FAKE 프레임 비율을 더 강하게 반영
-                if fake_ratio >= 0.5:
-                    weight = 0.5 + fake_ratio * 0.5  # 0.5~1.0 범위
-                    fake_conf = avg_fake_conf * weight + overall_avg * (1 - weight)
-                else:
-                    fake_conf = overall_avg
+            # 최종 계산: FAKE 프레임 비율을 더 강하게 반영
+            if fake_ratio >= 0.5:
+                weight = 0.5 + fake_ratio * 0.5  # 0.5~1.0 범위
+                fake_conf = avg_fake_conf * weight + overall_avg * (1 - weight)
             else:
                 fake_conf = overall_avg
         else:
-            fake_conf = 0.0
+            fake_conf = overall_avg
         
         real_conf = 1.0 - fake_conf
         
@@ -228,20 +256,17 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
         print(f"  FAKE 확률: {fake_conf:.1%}")
         print(f"  FAKE 프레임 비율: {fake_ratio:.0%} ({fake_frames}/{total_frames})")
 
-        # 오디오 분석 (로그 없이)
-        audio_processor = AudioProcessor()
-        audio_analysis = audio_processor.analyze_audio(video_path)
-        
-        # 스마트 타임라인 생성
-        timeline = create_smart_timeline(results, min_segment_duration=2.0)
+        # 스마트 타임라인 생성 (두 분기 결과 합류)
+        with timer.stage("aggregation"):
+            timeline = create_smart_timeline(frame_columns, min_segment_duration=2.0)
         
         # 분석 요약 생성 (보정된 confidence 사용)
         video_analysis = {
             "overall_result": final_label,
             "overall_confidence": round(fake_conf, 4),  # 보정된 딥페이크 확률
             "total_frames": len(results),
-            "fake_frames": len([r for r in results if r.get("ensemble_result") == "FAKE"]),
-            "real_frames": len([r for r in results if r.get("ensemble_result") == "REAL"])
+            "fake_frames": int(np.count_nonzero(is_fake)),
+            "real_frames": int(np.count_nonzero(frame_columns.label == REAL))
         }
         
         # 디버깅: 최종 결과 확인
@@ -256,15 +281,19 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
         # 구간별 상세 분석
         detailed_segments = []
         for segment in timeline:
-            segment_details = create_segment_analysis_details(segment, video_analysis, audio_analysis)
+            segment_details = create_segment_analysis_details(segment, video_analysis, audio_analysis, frame_columns)
             detailed_segments.append({
                 **segment,
                 "details": segment_details
             })
         
+        # 프레임별 점수는 부가 기록으로 분리 저장 (결과 문서에는 참조만)
+        video_id = str(uuid.uuid4())
+        frame_record = await save_frame_results(video_id, frame_columns)
+        
         # 최종 결과 구성
         analysis_result = {
-            "videoId": str(uuid.uuid4()),
+            "videoId": video_id,
             "video_name": video.filename,
             "user_id": user_id,
             "analysis_timestamp": datetime.now().isoformat(),
@@ -279,11 +308,15 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
             "timeline": detailed_segments,
             "video_analysis": video_analysis,
             "audio_analysis": audio_analysis,
-            "raw_frame_results": results  # 디버깅용
+            "frame_record": frame_record,
+            "timings": timer.as_dict()
         }
         
         # 결과 저장
-        save_analysis_result(analysis_result["videoId"], analysis_result)
+        await save_analysis_result(analysis_result["videoId"], analysis_result)
+        
+        # PDF / Excel 보고서는 작업자 풀에서 미리 생성 (첫 다운로드도 캐시에서 바로 응답)
+        schedule_reports(analysis_result["videoId"], analysis_result)
         
         # 임시 파일 정리
         try:
@@ -4,7 +4,7 @@ from datetime import datetime
 from concurrent.futures import ProcessPoolExecutor
 from app.services.video_processing import extract_frames
 from app.services.deepfake_detector import predict_image
-from app.services.audio_processing import AudioProcessor
+from app.services.audio_processing import audio_processor
 from app.utils.helpers import save_analysis_result, create_smart_timeline, create_analysis_summary, create_segment_analysis_details
 
 router = APIRouter()
@@ -25,10 +25,6 @@ def analyze_frames_in_parallel(frames, batch_size=5):
         with ProcessPoolExecutor(max_workers=2) as executor:
             batch_results = list(executor.map(analyze_single_frame, batch))
             results.extend(batch_results)
-        
-        # 배치 처리 후 메모리 정리
-        import gc
-        gc.collect()
     
     return results
 
@@ -124,7 +120,6 @@ async def process_video_background(analysis_id: str, video_path: str, user_id: s
         
         # 음성 분석
         print("음성 분석 시작...")
-        audio_processor = AudioProcessor()
         audio_analysis = audio_processor.analyze_audio(video_path)
         print("음성 분석 완료")
         
@@ -153,7 +148,7 @@ async def process_video_background(analysis_id: str, video_path: str, user_id: s
         }
         
         # 결과 저장
-        save_analysis_result(analysis_id, result_data)
+        await save_analysis_result(analysis_id, result_data)
         print(f"분석 완료 및 저장: {analysis_id}")
         
         # 임시 파일 정리
@@ -173,4 +168,4 @@ async def process_video_background(analysis_id: str, video_path: str, user_id: s
             "error": str(e),
             "status": "failed"
         }
-        save_analysis_result(analysis_id, error_data)
+        await save_analysis_result(analysis_id, error_data)
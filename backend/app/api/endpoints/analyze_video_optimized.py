@@ -2,13 +2,66 @@ from fastapi import APIRouter, UploadFile, File, Form
 import os, uuid
 from datetime import datetime
 from app.services.video_processing_optimized import extract_frames_smart, analyze_frame_quality
-from app.services.deepfake_detector_optimized import predict_image, cleanup_memory
 from app.services.parallel_processing_optimized import analyze_frames_adaptive, monitor_system_resources
-from app.services.audio_processing import AudioProcessor
-from app.utils.helpers import save_analysis_result, create_smart_timeline, create_analysis_summary, create_segment_analysis_details
+from app.services.audio_processing import audio_processor
+from app.services.analysis_pipeline import StageTimer, run_branches
+from app.services.report_worker import schedule_reports
+from app.services.frame_columns import FrameColumns
+from app.utils.helpers import save_analysis_result, save_frame_results, create_smart_timeline, create_analysis_summary, create_segment_analysis_details
 
 router = APIRouter()
 
+def _run_video_branch(video_path: str, temp_dir: str, video_filename: str, timer: StageTimer):
+    """
+    영상 분기: 스마트 프레임 추출 → 품질 분석 → 적응형 추론 (음성 분기와 동시에 실행)
+    
+    Returns:
+        tuple: (프레임별 결과, 추출 프레임 수, 평균 품질, duration, fps, frame_count)
+    """
+    # 동영상 정보 확인
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    duration = frame_count / fps if fps > 0 else 0
+    cap.release()
+
+    print(f"영상 정보: 길이 {duration:.1f}초, FPS {fps:.1f}, 총 프레임 {int(frame_count)}")
+
+    # 스마트 프레임 추출 (얼굴 탐지 포함)
+    frame_dir = os.path.join(temp_dir, f"{video_filename}_frames")
+    with timer.stage("frame_extraction"):
+        frames = extract_frames_smart(video_path, frame_dir, target_frames=10)
+
+    if not frames:
+        raise Exception("프레임 추출 실패: 영상이 비어있거나 지원되지 않는 형식입니다.")
+
+    print(f"프레임 추출 완료: {len(frames)}개 프레임")
+
+    # 프레임 품질 분석
+    quality_scores = []
+    for frame in frames:
+        quality = analyze_frame_quality(frame["path"])
+        if "error" not in quality:
+            quality_scores.append(quality["quality_score"])
+
+    avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+    print(f"평균 프레임 품질: {avg_quality:.2f}")
+
+    # 적응형 프레임 분석
+    with timer.stage("frame_inference"):
+        results = analyze_frames_adaptive(frames)
+    print(f"프레임 분석 완료: {len(results)}개 결과")
+
+    # 프레임 파일들 즉시 삭제 (메모리 절약)
+    import shutil
+    try:
+        shutil.rmtree(frame_dir)
+        print("프레임 파일들 정리 완료")
+    except Exception as e:
+        print(f"프레임 파일 정리 실패: {e}")
+    return results, len(frames), avg_quality, duration, fps, frame_count
+
 @router.post("/", summary="Analyze Video (Optimized)")
 async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...)):
     """
@@ -42,46 +95,13 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
         with open(video_path, "wb") as buffer:
             buffer.write(await video.read())
 
-        # 동영상 정보 확인
-        import cv2
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        duration = frame_count / fps if fps > 0 else 0
-        cap.release()
-        
-        print(f"영상 정보: 길이 {duration:.1f}초, FPS {fps:.1f}, 총 프레임 {int(frame_count)}")
-        
-        # 스마트 프레임 추출 (얼굴 탐지 포함)
-        frame_dir = os.path.join(temp_dir, f"{video.filename}_frames")
-        frames = extract_frames_smart(video_path, frame_dir, target_frames=10)
-        
-        if not frames:
-            raise Exception("프레임 추출 실패: 영상이 비어있거나 지원되지 않는 형식입니다.")
-
-        print(f"프레임 추출 완료: {len(frames)}개 프레임")
-        
-        # 프레임 품질 분석
-        quality_scores = []
-        for frame in frames:
-            quality = analyze_frame_quality(frame["path"])
-            if "error" not in quality:
-                quality_scores.append(quality["quality_score"])
-        
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
-        print(f"평균 프레임 품질: {avg_quality:.2f}")
-
-        # 적응형 프레임 분석
-        results = analyze_frames_adaptive(frames)
-        print(f"프레임 분석 완료: {len(results)}개 결과")
-        
-        # 프레임 파일들 즉시 삭제 (메모리 절약)
-        import shutil
-        try:
-            shutil.rmtree(frame_dir)
-            print("프레임 파일들 정리 완료")
-        except Exception as e:
-            print(f"프레임 파일 정리 실패: {e}")
+        # 영상 분기와 음성 분기를 별도 실행기에서 동시에 실행
+        timer = StageTimer()
+        (results, frames_extracted, avg_quality, duration, fps, frame_count), audio_analysis = await run_branches(
+            lambda: _run_video_branch(video_path, temp_dir, video.filename, timer),
+            lambda: audio_processor.analyze_audio(video_path, timer=timer),
+            timer
+        )
 
         # 평균 확률 계산
         valid_results = [r for r in results if "error" not in r]
@@ -92,14 +112,10 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
         real_conf = sum(r["confidence"] for r in valid_results if r["ensemble_result"] == "REAL") / len(valid_results)
         final_label = "FAKE" if fake_conf > real_conf else "REAL"
         
-        # 음성 분석
-        print("음성 분석 시작...")
-        audio_processor = AudioProcessor()
-        audio_analysis = audio_processor.analyze_audio(video_path)
-        print("음성 분석 완료")
-        
-        # 스마트 타임라인 생성
-        timeline = create_smart_timeline(valid_results, min_segment_duration=2.0)
+        # 스마트 타임라인 생성 (두 분기 결과 합류)
+        with timer.stage("aggregation"):
+            frame_columns = FrameColumns.from_rows(valid_results)
+            timeline = create_smart_timeline(frame_columns, min_segment_duration=2.0)
         
         # 분석 요약 생성
         video_analysis = {
@@ -117,15 +133,19 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
         # 구간별 상세 분석
         detailed_segments = []
         for segment in timeline:
-            segment_details = create_segment_analysis_details(segment, video_analysis, audio_analysis)
+            segment_details = create_segment_analysis_details(segment, video_analysis, audio_analysis, frame_columns)
             detailed_segments.append({
                 **segment,
                 "details": segment_details
             })
         
+        # 프레임별 점수는 부가 기록으로 분리 저장 (결과 문서에는 참조만)
+        video_id = str(uuid.uuid4())
+        frame_record = await save_frame_results(video_id, frame_columns)
+        
         # 최종 결과 구성
         analysis_result = {
-            "videoId": str(uuid.uuid4()),
+            "videoId": video_id,
             "video_name": video.filename,
             "user_id": user_id,
             "analysis_timestamp": datetime.now().isoformat(),
@@ -133,7 +153,7 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
                 "duration": duration,
                 "fps": fps,
                 "frame_count": frame_count,
-                "frames_extracted": len(frames),
+                "frames_extracted": frames_extracted,
                 "face_detection": "enabled",
                 "quality_score": round(avg_quality, 4)
             },
@@ -148,11 +168,15 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
                 "memory_optimization": True,
                 "face_detection": True
             },
-            "raw_frame_results": valid_results
+            "frame_record": frame_record,
+            "timings": timer.as_dict()
         }
         
         # 결과 저장
-        save_analysis_result(analysis_result["videoId"], analysis_result)
+        await save_analysis_result(analysis_result["videoId"], analysis_result)
+        
+        # PDF / Excel 보고서는 작업자 풀에서 미리 생성 (첫 다운로드도 캐시에서 바로 응답)
+        schedule_reports(analysis_result["videoId"], analysis_result)
         
         # 임시 파일 정리
         try:
@@ -161,17 +185,12 @@ async def analyze_video(user_id: str = Form(...), video: UploadFile = File(...))
         except Exception as e:
             print(f"임시 파일 정리 실패: {e}")
         
-        # 메모리 정리
-        cleanup_memory()
-        
         print(f"=== 최적화된 분석 완료: {analysis_result['videoId']} ===")
         
         return analysis_result
         
     except Exception as e:
         print(f"분석 중 오류 발생: {e}")
-        # 메모리 정리
-        cleanup_memory()
         return {"error": str(e), "video_name": video.filename}
 
 
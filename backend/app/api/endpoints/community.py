@@ -1,14 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import datetime
 import uuid
 import os
+import time
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from app.core.firebase import db, bucket
-import firebase_admin
-from firebase_admin import firestore
-from firebase_admin import storage
+from app.core.config import COMMUNITY_FIRST_PAGE_TTL_SEC
+from app.core.firebase import get_db, get_bucket
+from app.utils.helpers import encode_cursor, decode_cursor
 
 # ThreadPoolExecutor for Firestore operations
 _executor = ThreadPoolExecutor(max_workers=5)
@@ -18,6 +18,20 @@ router = APIRouter()
 # 커뮤니티 게시글 컬렉션 이름
 COMMUNITY_COLLECTION = "community_posts"
 
+# 다음 페이지 토큰 응답 헤더
+NEXT_PAGE_HEADER = "X-Next-Page-Token"
+
+# 게시글 파일 타입 (목록 첫 페이지 캐시도 이 값과 None만 키로 사용)
+VALID_FILE_TYPES = ("image", "video", "dataset", "file", "text")
+
+# 첫 페이지 캐시: (file_type, limit) -> (만료 시각, 게시글 리스트, 다음 페이지 토큰)
+# 키는 최대 (len(VALID_FILE_TYPES) + 1) x 100개, 저장할 때 만료된 항목 제거
+_first_page_cache = {}
+
+def _invalidate_first_pages():
+    """게시글 작성 / 삭제 시 첫 페이지 캐시 비움"""
+    _first_page_cache.clear()
+
 
 @router.post("/upload", summary="커뮤니티 파일 업로드")
 async def upload_community_file(
@@ -72,8 +86,7 @@ async def upload_community_file(
         print(f"[community/upload] user_id: {user_id}, file_type: {file_type}")
         print(f"[community/upload] file is None: {file is None}")
         # 파일 타입 검증 (모든 파일 타입 허용)
-        valid_file_types = ["image", "video", "dataset", "file", "text"]
-        if file_type not in valid_file_types:
+        if file_type not in VALID_FILE_TYPES:
             file_type = "file"  # 기본값으로 설정
         
         file_url = None
@@ -110,7 +123,7 @@ async def upload_community_file(
                     print(f"Firebase Storage 업로드 시작: {storage_path}")
                     
                     # Firebase Storage에 업로드
-                    blob = bucket.blob(storage_path)
+                    blob = get_bucket().blob(storage_path)
                     blob.upload_from_string(file_content, content_type=file.content_type or 'application/octet-stream')
                     blob.make_public()
                     file_url = blob.public_url
@@ -144,7 +157,7 @@ async def upload_community_file(
         # Firestore에 저장 (타임아웃 처리)
         try:
             def save_to_firestore():
-                db.collection(COMMUNITY_COLLECTION).document(post_id).set(post_data)
+                get_db().collection(COMMUNITY_COLLECTION).document(post_id).set(post_data)
             
             # 10초 타임아웃으로 실행
             loop = asyncio.get_event_loop()
@@ -152,6 +165,7 @@ async def upload_community_file(
                 loop.run_in_executor(_executor, save_to_firestore),
                 timeout=10.0
             )
+            _invalidate_first_pages()
         except asyncio.TimeoutError:
             print(f"Firestore 저장 타임아웃 (10초 초과)")
             raise HTTPException(status_code=503, detail="데이터베이스 연결 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.")
@@ -172,37 +186,69 @@ async def upload_community_file(
 
 @router.get("/posts", summary="커뮤니티 게시글 목록 조회")
 async def get_community_posts(
+    response: Response,
     limit: int = Query(50, ge=1, le=100, description="조회할 게시글 수"),
-    offset: int = Query(0, ge=0, description="건너뛸 게시글 수"),
+    offset: int = Query(0, ge=0, description="건너뛸 게시글 수 (이전 방식, page_token 사용 권장)"),
     file_type: Optional[str] = Query(None, description="파일 타입 필터 (image, video, dataset)"),
+    page_token: Optional[str] = Query(None, description="다음 페이지 토큰 (이전 응답의 X-Next-Page-Token 헤더)"),
 ):
     """
-    커뮤니티 게시글 목록 조회
+    커뮤니티 게시글 목록 조회 (최신순)
+    
+    응답 본문은 게시글 리스트이며, 다음 페이지가 있으면 X-Next-Page-Token 헤더로 토큰을 반환한다.
+    토큰은 마지막 게시글의 (created_at, id)로, 다음 요청은 그 뒤부터 조회한다 (keyset, 건너뛰는 문서 없음).
+    첫 페이지(토큰 / offset 없음)는 file_type(VALID_FILE_TYPES만), limit별로 COMMUNITY_FIRST_PAGE_TTL_SEC 동안 캐시한다.
     """
     try:
+        after = None
+        if page_token:
+            try:
+                after = decode_cursor(page_token)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        
+        # 첫 페이지 캐시
+        cache_key = (file_type, limit)
+        # 임의의 file_type 값은 캐시하지 않음 (키가 무한히 늘어나지 않도록)
+        cache_first_page = after is None and offset == 0 and (file_type is None or file_type in VALID_FILE_TYPES)
+        if cache_first_page:
+            cached = _first_page_cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                _, posts, next_token = cached
+                if next_token:
+                    response.headers[NEXT_PAGE_HEADER] = next_token
+                return posts
+        
         # Firestore 쿼리 생성 (타임아웃 처리)
-        query = db.collection(COMMUNITY_COLLECTION)
+        collection = get_db().collection(COMMUNITY_COLLECTION)
+        query = collection
         
         # 파일 타입 필터 적용 (모든 파일 타입 지원)
         if file_type:
             query = query.where("file_type", "==", file_type)
         
         # 최신순 정렬 및 페이지네이션 (타임아웃 처리)
-        posts = []
         try:
             # 타임아웃 설정 (10초)
             def fetch_posts():
-                docs = query.order_by("created_at", direction=firestore.Query.DESCENDING).limit(limit + offset).stream()
-                result = []
-                for i, doc in enumerate(docs):
-                    if i >= offset:
-                        post_data = doc.to_dict()
-                        result.append(post_data)
-                return result
+                from firebase_admin import firestore
+                # 같은 created_at이 있어도 순서가 고정되도록 문서 ID를 보조 정렬 키로 사용
+                paged = query.order_by("created_at", direction=firestore.Query.DESCENDING) \
+                    .order_by(firestore.FieldPath.document_id(), direction=firestore.Query.DESCENDING)
+                if after is not None:
+                    paged = paged.start_after({
+                        "created_at": after[0],
+                        firestore.FieldPath.document_id(): collection.document(after[1])
+                    })
+                elif offset:
+                    paged = paged.offset(offset)
+                # 다음 페이지 존재 여부 확인용으로 한 개 더 조회
+                docs = list(paged.limit(limit + 1).stream())
+                return [(doc.id, doc.to_dict()) for doc in docs]
             
             # 10초 타임아웃으로 실행
             loop = asyncio.get_event_loop()
-            posts = await asyncio.wait_for(
+            docs = await asyncio.wait_for(
                 loop.run_in_executor(_executor, fetch_posts),
                 timeout=10.0
             )
@@ -217,6 +263,19 @@ async def get_community_posts(
             # Firestore 연결 실패 시 빈 리스트 반환
             return []
         
+        posts = [post_data for _, post_data in docs[:limit]]
+        next_token = None
+        if len(docs) > limit:
+            last_id, last_post = docs[limit - 1]
+            next_token = encode_cursor((last_post.get("created_at", ""), last_id))
+            response.headers[NEXT_PAGE_HEADER] = next_token
+        
+        if cache_first_page:
+            now = time.monotonic()
+            for key in [key for key, entry in _first_page_cache.items() if entry[0] <= now]:
+                del _first_page_cache[key]
+            _first_page_cache[cache_key] = (now + COMMUNITY_FIRST_PAGE_TTL_SEC, posts, next_token)
+        
         return posts
         
     except HTTPException:
@@ -238,7 +297,7 @@ async def get_community_post(post_id: str):
         # Firestore에서 게시글 조회 (타임아웃 처리)
         try:
             def fetch_post():
-                return db.collection(COMMUNITY_COLLECTION).document(post_id).get()
+                return get_db().collection(COMMUNITY_COLLECTION).document(post_id).get()
             
             # 10초 타임아웃으로 실행
             loop = asyncio.get_event_loop()
@@ -275,7 +334,7 @@ async def delete_community_post(post_id: str, user_id: str = Query(..., descript
     게시글 삭제 (작성자만 삭제 가능)
     """
     try:
-        doc_ref = db.collection(COMMUNITY_COLLECTION).document(post_id)
+        doc_ref = get_db().collection(COMMUNITY_COLLECTION).document(post_id)
         doc = doc_ref.get()
         
         if not doc.exists:
@@ -299,13 +358,14 @@ async def delete_community_post(post_id: str, user_id: str = Query(..., descript
                     import urllib.parse
                     path_part = file_url.split("/o/")[-1].split("?")[0]
                     file_path = urllib.parse.unquote(path_part)
-                    blob = bucket.blob(file_path)
+                    blob = get_bucket().blob(file_path)
                     blob.delete()
             except Exception as e:
                 print(f"파일 삭제 오류 (무시): {e}")
         
         # Firestore에서 게시글 삭제
         doc_ref.delete()
+        _invalidate_first_pages()
         
         return {"message": "게시글이 삭제되었습니다."}
         
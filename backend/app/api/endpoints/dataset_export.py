@@ -1,78 +1,84 @@
-from fastapi import APIRouter
-from fastapi.responses import Response, JSONResponse
+from fastapi import APIRouter, Query
+from fastapi.responses import Response, JSONResponse, StreamingResponse
 import os
 import json
 import csv
-from io import StringIO
-from typing import Dict, Any
-from app.utils.helpers import get_analysis_result
+from typing import Dict, Any, Iterator, Optional
+from app.core.config import EXPORT_STREAM_CHUNK_LINES, BULK_EXPORT_SHARD_ROWS
+from app.services.frame_columns import FrameColumns
+from app.services.bulk_export import iter_dataset_rows, iter_export_shards, STREAM_FORMATS
+from app.utils.helpers import get_analysis_result, get_frame_columns, decode_cursor
 
 router = APIRouter()
 
-def create_dataset_jsonl(analysis_result: Dict[str, Any]) -> str:
+class _Echo:
+    """csv.writer 출력 대상 (쓴 문자열을 그대로 반환하여 한 행씩 직렬화)"""
+
+    def write(self, value: str) -> str:
+        return value
+
+def _chunked(lines: Iterator[str], size: int = EXPORT_STREAM_CHUNK_LINES) -> Iterator[str]:
+    """줄 단위 문자열을 size줄씩 묶어 전송 (청크 수를 줄이면서 메모리는 청크 크기로 제한)"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+def iter_dataset_jsonl(analysis_result: Dict[str, Any], frame_columns: FrameColumns) -> Iterator[str]:
     """
-    분석 결과를 JSONL 형식으로 변환
+    분석 결과를 JSONL 형식으로 한 줄씩 변환
     각 줄이 하나의 데이터 포인트 (프레임 또는 세그먼트)
     """
-    lines = []
-    timeline = analysis_result.get("timeline", [])
+    for row in iter_dataset_rows(analysis_result, frame_columns):
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+def iter_frames_csv(frame_columns: FrameColumns) -> Iterator[str]:
+    """
+    프레임별 점수를 CSV 형식으로 한 행씩 변환 (열 배열을 그대로 행으로 기록)
+    """
+    writer = csv.writer(_Echo())
     
-    for segment in timeline:
-        result = segment.get("result", "UNKNOWN")
-        confidence = segment.get("confidence", 0.0)
-        start = segment.get("start", 0.0)
-        end = segment.get("end", 0.0)
-        
-        # 프레임 정보 (raw_frame_results가 있는 경우)
-        frames = segment.get("frames", [])
-        if frames:
-            for frame in frames:
-                frame_data = {
-                    "video_id": analysis_result.get("videoId", ""),
-                    "time": frame.get("time", start),
-                    "label": frame.get("ensemble_result", result),
-                    "confidence": frame.get("confidence", confidence),
-                    "fake_confidence": frame.get("fake_confidence", 0.0) if result == "FAKE" else 0.0,
-                    "real_confidence": frame.get("real_confidence", 0.0) if result == "REAL" else 0.0,
-                    "segment_id": segment.get("segment_id", 0),
-                    "segment_start": start,
-                    "segment_end": end,
-                    "segment_label": result,
-                }
-                lines.append(json.dumps(frame_data, ensure_ascii=False))
-        else:
-            # 프레임 정보가 없으면 세그먼트 단위로
-            segment_data = {
-                "video_id": analysis_result.get("videoId", ""),
-                "time_start": start,
-                "time_end": end,
-                "label": result,
-                "confidence": confidence,
-                "segment_id": segment.get("segment_id", 0),
-                "frame_count": segment.get("frame_count", 0),
-            }
-            lines.append(json.dumps(segment_data, ensure_ascii=False))
+    # 헤더 (UTF-8 BOM 추가: Excel 호환성)
+    yield '\ufeff' + writer.writerow(["frame_index", "time", "label", "confidence", "fake_confidence", "real_confidence", "face_detected", "extra"])
     
-    return "\n".join(lines)
+    # 데이터 (청크 단위로 열을 파이썬 값으로 변환하여 변환 결과도 청크 크기로 제한)
+    for offset in range(0, len(frame_columns), EXPORT_STREAM_CHUNK_LINES):
+        chunk = frame_columns.slice(offset, offset + EXPORT_STREAM_CHUNK_LINES)
+        for row in zip(
+            range(offset, offset + len(chunk)),
+            chunk.time.tolist(),
+            chunk.label_names(),
+            chunk.rounded("confidence"),
+            chunk.rounded("fake_confidence"),
+            chunk.rounded("real_confidence"),
+            chunk.face_detected.tolist(),
+            # 모델별 점수(meta.models) 등 고정 열에 없는 값 (JSON)
+            map(chunk.extra_json, range(len(chunk)))
+        ):
+            yield writer.writerow(row)
 
-def create_timeline_csv(analysis_result: Dict[str, Any]) -> str:
+def iter_timeline_csv(analysis_result: Dict[str, Any]) -> Iterator[str]:
     """
-    타임라인을 CSV 형식으로 변환
+    타임라인을 CSV 형식으로 한 행씩 변환
     """
     timeline = analysis_result.get("timeline", [])
     
     if not timeline:
-        return "segment_id,start,end,result,confidence,frame_count\n"
+        yield "segment_id,start,end,result,confidence,frame_count\n"
+        return
     
-    output = StringIO()
-    writer = csv.writer(output)
+    writer = csv.writer(_Echo())
     
-    # 헤더
-    writer.writerow(["segment_id", "start", "end", "result", "confidence", "frame_count", "duration"])
+    # 헤더 (UTF-8 BOM 추가: Excel 호환성)
+    yield '\ufeff' + writer.writerow(["segment_id", "start", "end", "result", "confidence", "frame_count", "duration"])
     
     # 데이터
     for segment in timeline:
-        writer.writerow([
+        yield writer.writerow([
             segment.get("segment_id", ""),
             segment.get("start", 0.0),
             segment.get("end", 0.0),
@@ -81,11 +87,6 @@ def create_timeline_csv(analysis_result: Dict[str, Any]) -> str:
             segment.get("frame_count", 0),
             segment.get("duration", 0.0),
         ])
-    
-    result = output.getvalue()
-    output.close()
-    # UTF-8 BOM 추가 (Excel 호환성)
-    return '\ufeff' + result
 
 def create_metadata_json(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -124,6 +125,51 @@ def create_metadata_json(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
     
     return metadata
 
+@router.get("/bulk", summary="Bulk Export Dataset")
+async def bulk_export_dataset(
+    user_id: Optional[str] = Query(None, description="사용자 ID"),
+    label: Optional[str] = Query(None, description="영상 판정 (FAKE / REAL)"),
+    since: Optional[str] = Query(None, description="분석 시각 시작 (ISO 8601, 포함)"),
+    until: Optional[str] = Query(None, description="분석 시각 끝 (ISO 8601, 제외)"),
+    format: str = Query("tar", description="jsonl / tar / zip"),
+    cursor: Optional[str] = Query(None, description="이어서 내보낼 위치 (체크포인트의 cursor)"),
+    start_shard: int = Query(0, ge=0, description="첫 샤드 번호 (체크포인트의 next_shard)"),
+    shard_rows: int = Query(BULK_EXPORT_SHARD_ROWS, ge=1, description="샤드당 행 수")
+):
+    """
+    여러 분석 결과의 프레임 단위 데이터셋 일괄 다운로드
+    
+    tar / zip은 샤드(part-NNNNN.jsonl)마다 체크포인트(checkpoints/part-NNNNN.json)를 포함하고,
+    jsonl은 샤드마다 데이터 행 뒤에 {"_checkpoint": {...}} 줄을 붙인다.
+    중단되면 마지막으로 받은 체크포인트의 cursor / next_shard로 이어서 받을 수 있다
+    (jsonl은 마지막 체크포인트 줄 이후에 받은 행을 버림).
+    """
+    try:
+        print(f"데이터셋 일괄 내보내기 요청: user_id={user_id}, label={label}, since={since}, until={until}, format={format}")
+        
+        if format not in STREAM_FORMATS:
+            return JSONResponse({"error": f"지원하지 않는 형식: {format}"}, status_code=400)
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError as e:
+                return JSONResponse({"error": str(e)}, status_code=400)
+        
+        stream, media_type, extension = STREAM_FORMATS[format]
+        filters = {"user_id": user_id, "label": label, "since": since, "until": until}
+        shards = iter_export_shards(filters, cursor=cursor, start_shard=start_shard, shard_rows=shard_rows)
+        
+        return StreamingResponse(
+            stream(shards),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename=dataset_bulk_{start_shard:05d}.{extension}"
+            }
+        )
+    except Exception as e:
+        print(f"데이터셋 일괄 내보내기 오류: {e}")
+        return JSONResponse({"error": str(e)}, status_code=500)
+
 @router.get("/{video_id}/jsonl", summary="Download Dataset JSONL")
 async def download_dataset_jsonl(video_id: str):
     """
@@ -132,14 +178,15 @@ async def download_dataset_jsonl(video_id: str):
     try:
         print(f"데이터셋 JSONL 다운로드 요청: {video_id}")
         
-        analysis_result = get_analysis_result(video_id)
+        analysis_result = await get_analysis_result(video_id)
         if not analysis_result:
             return JSONResponse({"error": "분석 결과를 찾을 수 없습니다."}, status_code=404)
         
-        dataset_jsonl = create_dataset_jsonl(analysis_result)
+        frame_columns = await get_frame_columns(analysis_result)
         
-        return Response(
-            content=dataset_jsonl,
+        # 조회 / 오류 확인 후 줄 단위로 직렬화하며 전송 (전체 파일을 메모리에 만들지 않음)
+        return StreamingResponse(
+            _chunked(iter_dataset_jsonl(analysis_result, frame_columns)),
             media_type="application/x-ndjson",
             headers={
                 "Content-Disposition": f"attachment; filename=dataset_{video_id}.jsonl"
@@ -157,14 +204,12 @@ async def download_timeline_csv(video_id: str):
     try:
         print(f"타임라인 CSV 다운로드 요청: {video_id}")
         
-        analysis_result = get_analysis_result(video_id)
+        analysis_result = await get_analysis_result(video_id)
         if not analysis_result:
             return JSONResponse({"error": "분석 결과를 찾을 수 없습니다."}, status_code=404)
         
-        timeline_csv = create_timeline_csv(analysis_result)
-        
-        return Response(
-            content=timeline_csv,
+        return StreamingResponse(
+            _chunked(iter_timeline_csv(analysis_result)),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=timeline_{video_id}.csv"
@@ -174,6 +219,56 @@ async def download_timeline_csv(video_id: str):
         print(f"타임라인 CSV 생성 오류: {e}")
         return JSONResponse({"error": str(e)}, status_code=500)
 
+@router.get("/{video_id}/frames-csv", summary="Download Frame Scores CSV")
+async def download_frames_csv(video_id: str):
+    """
+    프레임별 점수 CSV 파일 다운로드
+    """
+    try:
+        print(f"프레임 CSV 다운로드 요청: {video_id}")
+        
+        analysis_result = await get_analysis_result(video_id)
+        if not analysis_result:
+            return JSONResponse({"error": "분석 결과를 찾을 수 없습니다."}, status_code=404)
+        
+        frame_columns = await get_frame_columns(analysis_result)
+        
+        return StreamingResponse(
+            _chunked(iter_frames_csv(frame_columns)),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f"attachment; filename=frames_{video_id}.csv"
+            }
+        )
+    except Exception as e:
+        print(f"프레임 CSV 생성 오류: {e}")
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+@router.get("/{video_id}/frames-npz", summary="Download Frame Scores NPZ")
+async def download_frames_npz(video_id: str):
+    """
+    프레임별 점수 npz 파일 다운로드 (열 배열 그대로, numpy.load로 읽기)
+    """
+    try:
+        print(f"프레임 npz 다운로드 요청: {video_id}")
+        
+        analysis_result = await get_analysis_result(video_id)
+        if not analysis_result:
+            return JSONResponse({"error": "분석 결과를 찾을 수 없습니다."}, status_code=404)
+        
+        frame_columns = await get_frame_columns(analysis_result)
+        
+        return Response(
+            content=frame_columns.to_npz_bytes(),
+            media_type="application/octet-stream",
+            headers={
+                "Content-Disposition": f"attachment; filename=frames_{video_id}.npz"
+            }
+        )
+    except Exception as e:
+        print(f"프레임 npz 생성 오류: {e}")
+        return JSONResponse({"error": str(e)}, status_code=500)
+
 @router.get("/{video_id}/metadata", summary="Download Metadata JSON")
 async def download_metadata_json(video_id: str):
     """
@@ -182,7 +277,7 @@ async def download_metadata_json(video_id: str):
     try:
         print(f"메타데이터 JSON 다운로드 요청: {video_id}")
         
-        analysis_result = get_analysis_result(video_id)
+        analysis_result = await get_analysis_result(video_id)
         if not analysis_result:
             return JSONResponse({"error": "분석 결과를 찾을 수 없습니다."}, status_code=404)
         
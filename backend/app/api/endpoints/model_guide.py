@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from app.utils.helpers import get_analysis_result
+from app.utils.helpers import get_analysis_result, get_frame_columns
+from app.services.frame_columns import FrameColumns, FAKE, REAL
 from typing import Dict, Any
 import json
+import numpy as np
 
 router = APIRouter()
 
@@ -18,19 +20,22 @@ async def get_model_development_guide(video_id: str):
     """
     try:
         # 분석 결과 가져오기
-        analysis_result = get_analysis_result(video_id)
+        analysis_result = await get_analysis_result(video_id)
         if not analysis_result:
             return {"error": "분석 결과를 찾을 수 없습니다."}
         
+        # 프레임별 점수는 부가 기록에서 조회
+        frame_columns = await get_frame_columns(analysis_result)
+        
         # 모델 개발 가이드 생성
-        guide = create_model_development_guide(analysis_result)
+        guide = create_model_development_guide(analysis_result, frame_columns)
         
         return guide
         
     except Exception as e:
         return {"error": str(e)}
 
-def create_model_development_guide(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+def create_model_development_guide(analysis_result: Dict[str, Any], frame_columns: FrameColumns) -> Dict[str, Any]:
     """모델 개발 가이드 생성"""
     
     # 2. 데이터셋 정보
@@ -47,7 +52,7 @@ def create_model_development_guide(analysis_result: Dict[str, Any]) -> Dict[str,
         "frame_extraction_strategy": {
             "method": "동적 간격 추출",
             "frame_rate": analysis_result.get("video_info", {}).get("frame_rate_used"),
-            "total_extracted": len(analysis_result.get("raw_frame_results", [])),
+            "total_extracted": len(frame_columns),
             "extraction_logic": "영상 길이에 따라 프레임 추출 간격 자동 조정"
         },
         "data_quality": {
@@ -74,9 +79,9 @@ def create_model_development_guide(analysis_result: Dict[str, Any]) -> Dict[str,
             "confidence_threshold": "0.5 이상을 신뢰할 만한 결과로 판단"
         },
         "current_labels": {
-            "total_frames": len(analysis_result.get("raw_frame_results", [])),
-            "real_frames": len([r for r in analysis_result.get("raw_frame_results", []) if r.get("ensemble_result") == "REAL"]),
-            "fake_frames": len([r for r in analysis_result.get("raw_frame_results", []) if r.get("ensemble_result") == "FAKE"]),
+            "total_frames": len(frame_columns),
+            "real_frames": int(np.count_nonzero(frame_columns.label == REAL)),
+            "fake_frames": int(np.count_nonzero(frame_columns.label == FAKE)),
             "overall_result": analysis_result.get("summary", {}).get("overall_result")
         }
     }
@@ -152,15 +157,15 @@ def predict_image(image_path: str):
         },
         "performance_analysis": {
             "model_comparison": {
-                "model1_avg_confidence": calculate_model_avg_confidence(analysis_result, "model1"),
-                "model2_avg_confidence": calculate_model_avg_confidence(analysis_result, "model2"),
-                "agreement_rate": calculate_model_agreement(analysis_result)
+                "model1_avg_confidence": calculate_model_avg_confidence(frame_columns, "model1"),
+                "model2_avg_confidence": calculate_model_avg_confidence(frame_columns, "model2"),
+                "agreement_rate": calculate_model_agreement(frame_columns)
             },
             "segment_performance": {
                 "total_segments": analysis_result.get("summary", {}).get("total_segments"),
                 "real_segments": analysis_result.get("summary", {}).get("real_segments"),
                 "fake_segments": analysis_result.get("summary", {}).get("fake_segments"),
-                "segment_confidence_range": calculate_confidence_range(analysis_result)
+                "segment_confidence_range": calculate_confidence_range(frame_columns)
             }
         },
         "evaluation_recommendations": {
@@ -197,47 +202,31 @@ def predict_image(image_path: str):
         "guide_version": "1.0"
     }
 
-def calculate_model_avg_confidence(analysis_result: Dict[str, Any], model_name: str) -> float:
-    """모델별 평균 신뢰도 계산"""
-    frame_results = analysis_result.get("raw_frame_results", [])
-    if not frame_results:
+def calculate_model_avg_confidence(frame_columns: FrameColumns, model_name: str) -> float:
+    """모델별 평균 신뢰도 계산 (모델 결과가 없는 프레임은 0)"""
+    if not len(frame_columns):
         return 0.0
     
-    confidences = []
-    for frame in frame_results:
-        model_data = frame.get(model_name, {})
-        confidence = model_data.get("confidence", 0.0)
-        confidences.append(confidence)
-    
-    return round(sum(confidences) / len(confidences), 4) if confidences else 0.0
+    confidences = np.nan_to_num(getattr(frame_columns, f"{model_name}_confidence").astype(np.float64))
+    return round(float(confidences.mean()), 4)
 
-def calculate_model_agreement(analysis_result: Dict[str, Any]) -> float:
+def calculate_model_agreement(frame_columns: FrameColumns) -> float:
     """모델 간 일치율 계산"""
-    frame_results = analysis_result.get("raw_frame_results", [])
-    if not frame_results:
+    if not len(frame_columns):
         return 0.0
     
-    agreements = 0
-    for frame in frame_results:
-        model1_label = frame.get("model1", {}).get("label", "")
-        model2_label = frame.get("model2", {}).get("label", "")
-        if model1_label == model2_label:
-            agreements += 1
-    
-    return round(agreements / len(frame_results), 4) if frame_results else 0.0
+    agreements = np.count_nonzero(frame_columns.model1_label == frame_columns.model2_label)
+    return round(agreements / len(frame_columns), 4)
 
-def calculate_confidence_range(analysis_result: Dict[str, Any]) -> Dict[str, float]:
+def calculate_confidence_range(frame_columns: FrameColumns) -> Dict[str, float]:
     """신뢰도 범위 계산"""
-    frame_results = analysis_result.get("raw_frame_results", [])
-    if not frame_results:
+    if not len(frame_columns):
         return {"min": 0.0, "max": 0.0, "avg": 0.0}
     
-    confidences = [frame.get("confidence", 0.0) for frame in frame_results]
+    confidences = frame_columns.confidence.astype(np.float64)
     
     return {
-        "min": round(min(confidences), 4),
-        "max": round(max(confidences), 4),
-        "avg": round(sum(confidences) / len(confidences), 4)
+        "min": round(float(confidences.min()), 4),
+        "max": round(float(confidences.max()), 4),
+        "avg": round(float(confidences.mean()), 4)
     }
-
-
@@ -1,41 +1,25 @@
 from fastapi import APIRouter
 from fastapi.responses import FileResponse
-import os, uuid
+import os
+from app.services.report_worker import render_report
 from app.utils.helpers import get_analysis_result
-from app.services.report_generator import generate_pdf_report, generate_excel_report
 
 router = APIRouter()
 
-# temp 디렉토리 생성 함수
-def ensure_temp_dir():
-    temp_dir = "temp"
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
-    return temp_dir
-
 @router.get("/pdf/{video_id}", summary="Download PDF Report")
 async def download_pdf(video_id: str):
     try:
         print(f"PDF 다운로드 요청: {video_id}")
         
-        data = get_analysis_result(video_id)
+        data = await get_analysis_result(video_id)
         if not data:
             print(f"분석 결과를 찾을 수 없음: {video_id}")
             return {"error": "결과를 찾을 수 없습니다."}
         
         print(f"분석 결과 발견: {video_id}")
         
-        # temp 디렉토리 확인 및 생성
-        temp_dir = ensure_temp_dir()
-        
-        # 고유한 파일명 생성
-        unique_filename = f"{uuid.uuid4()}.pdf"
-        output_path = os.path.join(temp_dir, unique_filename)
-        
-        print(f"PDF 생성 시작: {output_path}")
-        
-        # PDF 보고서 생성
-        generate_pdf_report(data, output_path)
+        # PDF 보고서 (분석 완료 시 미리 생성된 캐시를 재사용, 없으면 작업자 풀에서 생성)
+        output_path = await render_report("pdf", video_id, data)
         
         # 파일이 생성되었는지 확인
         if not os.path.exists(output_path):
@@ -43,7 +27,7 @@ async def download_pdf(video_id: str):
             return {"error": "보고서 생성에 실패했습니다."}
         
         file_size = os.path.getsize(output_path)
-        print(f"PDF 파일 생성 완료: {output_path}, 크기: {file_size} bytes")
+        print(f"PDF 파일 준비 완료: {output_path}, 크기: {file_size} bytes")
         
         return FileResponse(
             output_path, 
@@ -60,24 +44,15 @@ async def download_excel(video_id: str):
     try:
         print(f"Excel 다운로드 요청: {video_id}")
         
-        data = get_analysis_result(video_id)
+        data = await get_analysis_result(video_id)
         if not data:
             print(f"분석 결과를 찾을 수 없음: {video_id}")
             return {"error": "결과를 찾을 수 없습니다."}
         
         print(f"분석 결과 발견: {video_id}")
         
-        # temp 디렉토리 확인 및 생성
-        temp_dir = ensure_temp_dir()
-        
-        # 고유한 파일명 생성
-        unique_filename = f"{uuid.uuid4()}.xlsx"
-        output_path = os.path.join(temp_dir, unique_filename)
-        
-        print(f"Excel 생성 시작: {output_path}")
-        
-        # Excel 보고서 생성
-        generate_excel_report(data, output_path)
+        # Excel 보고서 (분석 완료 시 미리 생성된 캐시를 재사용, 없으면 작업자 풀에서 생성)
+        output_path = await render_report("xlsx", video_id, data)
         
         # 파일이 생성되었는지 확인
         if not os.path.exists(output_path):
@@ -85,7 +60,7 @@ async def download_excel(video_id: str):
             return {"error": "보고서 생성에 실패했습니다."}
         
         file_size = os.path.getsize(output_path)
-        print(f"Excel 파일 생성 완료: {output_path}, 크기: {file_size} bytes")
+        print(f"Excel 파일 준비 완료: {output_path}, 크기: {file_size} bytes")
         
         return FileResponse(
             output_path, 
@@ -19,7 +19,7 @@ async def submit_report(
             buffer.write(await video.read())
 
         video_url = upload_video(temp_path, user_id)
-        save_analysis_result(video.filename, {"user_id": user_id, "video_url": video_url})
+        await save_analysis_result(video.filename, {"user_id": user_id, "video_url": video_url})
         return {"message": "업로드 성공", "video_url": video_url}
     except Exception as e:
         return {"error": str(e)}
@@ -19,6 +19,21 @@ MESONET_WEIGHTS = str(WEIGHTS_DIR / "best_model_tuned.pt")
 # 기존 모델 (백업용)
 MESONET_WEIGHTS_OLD = str(WEIGHTS_DIR / "Meso4_DF.h5")
 
+# 가중치 메모리 매핑 (app/services/weight_loader.py)
+# <가중치 파일명>.mmap.pt가 있으면 torch.load(mmap=True)로 로드하여
+# 여러 워커 프로세스가 같은 물리 페이지를 copy-on-write로 공유
+# 변환: python convert_weights_mmap.py
+USE_MMAP_WEIGHTS = True
+
+# HuggingFace ViT 딥페이크 탐지 모델 (로컬 스냅샷 디렉토리, 네트워크 접근 없음)
+VIT_DETECTOR_MODEL_ID = "prithivMLmods/Deep-Fake-Detector-v2-Model"
+VIT_DETECTOR_SNAPSHOT = str(WEIGHTS_DIR / "Deep-Fake-Detector-v2-Model")
+# GPU 환경에서만 사용하는 보조 모델
+VIT_SECONDARY_MODEL_ID = "google/vit-base-patch16-224-in21k"
+VIT_SECONDARY_SNAPSHOT = str(WEIGHTS_DIR / "vit-base-patch16-224-in21k")
+# 스냅샷이 없을 때 HuggingFace Hub에서 다운로드 허용 여부
+VIT_ALLOW_DOWNLOAD = False
+
 # 프레임 샘플링 설정
 FRAME_SAMPLES = 10  # 추출할 프레임 수
 
@@ -32,10 +47,125 @@ IMAGE_SIZE = 256  # 튜닝된 MesoNet 입력 크기 (256x256)
 ENSEMBLE_WEIGHT_EFFICIENTNET = 0.7
 ENSEMBLE_WEIGHT_MESONET = 0.3
 
+# 앙상블 엔진 설정 (app/services/model_ensemble.py)
+# 사용 가능한 백엔드: "mesonet", "efficientnet", "vit", "mesonet_tf"
+ENSEMBLE_BACKENDS = ["mesonet"]
+ENSEMBLE_WEIGHTS = {
+    "efficientnet": ENSEMBLE_WEIGHT_EFFICIENTNET,
+    "mesonet": ENSEMBLE_WEIGHT_MESONET,
+    "vit": 0.5,
+    "mesonet_tf": 0.3
+}
+# "weighted": 모든 백엔드를 모든 프레임에 실행
+# "cascade": 저비용 백엔드부터 실행, 점수가 불확실 구간에 있는 프레임만 다음 백엔드로 전달
+ENSEMBLE_MODE = "cascade"
+CASCADE_UNCERTAIN_BAND = (0.3, 0.7)
+
+# 음성 분석 모델 (app/services/audio_models.py)
+AUDIO_WHISPER_MODEL = "base"
+# 음성 인식 모델 로컬 경로 (요청 경로에서 다운로드하지 않음, 없으면 해당 ASR 엔진 사용 불가)
+# faster-whisper: huggingface-cli download Systran/faster-whisper-base --local-dir weights/faster-whisper-base
+FASTER_WHISPER_MODEL_DIR = str(WEIGHTS_DIR / f"faster-whisper-{AUDIO_WHISPER_MODEL}")
+# openai-whisper: <디렉토리>/<모델 이름>.pt
+WHISPER_MODEL_DIR = str(WEIGHTS_DIR / "whisper")
+AUDIO_WAV2VEC2_MODEL = "facebook/wav2vec2-base"
+AUDIO_SENTENCE_BERT_MODEL = "nickprock/csr-multi-sentence-BERTino-cv"
+# 음성 인식 엔진 (app/services/asr.py) - 요청 경로에서는 로컬 엔진만 사용
+# 순서대로 로딩 가능한 첫 엔진 사용: "faster_whisper", "whisper", "noop", "fake"
+ASR_ENGINES = ["faster_whisper", "whisper", "noop"]
+ASR_LANGUAGE = "ko"
+ASR_COMPUTE_TYPE = "int8"  # faster-whisper CPU 연산 정밀도
+ASR_TIMEOUT_SEC = 60.0
+ASR_MAX_CONCURRENCY = 2
+# "fake" 엔진 (네트워크 없이 지연 시간 / 타임아웃 테스트)
+ASR_FAKE_LATENCY_SEC = 0.5
+ASR_FAKE_TEXT = "테스트 음성 인식 결과입니다."
+
+# 음성 특징 추출 (app/services/audio_features.py)
+AUDIO_PITCH_METHOD = "hps"  # "hps"(고조파 곱 스펙트럼, 빠름), "piptrack"(librosa), "none"
+AUDIO_FEATURE_WINDOW_SEC = 2.0  # 윈도우별 특징 집계 길이
+
+# 의미적 불일치 분석 (app/services/semantic_analysis.py)
+SEMANTIC_CACHE_SIZE = 10000  # 문장 임베딩 LRU 캐시 크기
+SEMANTIC_BATCH_WAIT_MS = 20  # 요청 간 인코딩 배치 대기 시간
+SEMANTIC_MAX_BATCH = 256  # 배치당 최대 문장 수
+SEMANTIC_MIN_SENTENCE_CHARS = 8  # 이보다 짧은 조각은 앞 문장에 병합
+SEMANTIC_MAX_SENTENCE_CHARS = 200  # 이보다 긴 문장은 공백 기준 분할
+SEMANTIC_MISMATCH_THRESHOLD = 0.7  # 인접 문장 평균 유사도 임계값
+
+# Wav2Vec2 딥보이스 점수: 전체 파형을 겹치는 윈도우로 나누어 배치 추론
+DEEPVOICE_WINDOW_SEC = 2.0
+DEEPVOICE_HOP_SEC = 1.0
+DEEPVOICE_BATCH_SIZE = 8  # 한 번에 추론할 윈도우 수 (긴 파일에서도 메모리 상한 유지)
+DEEPVOICE_VARIANCE_THRESHOLD = 0.1  # 임계값은 실험적으로 조정 필요
+# 이 레벨(dBFS)보다 조용한 오디오는 무음으로 보고 음성 모델을 실행하지 않음
+AUDIO_SILENCE_DBFS = -60.0
+
+# 음성 구간 검출 (app/services/audio_vad.py) - 발화 구간만 음성 인식 / 의미 분석에 전달
+VAD_ENABLED = True
+VAD_FRAME_MS = 30
+VAD_HOP_MS = 10
+VAD_ENERGY_MARGIN_DB = 10.0  # 잡음 바닥(하위 20%) 대비 여유값
+VAD_MIN_ENERGY_DB = -45.0  # 절대 하한 (dBFS)
+VAD_SPEECH_BAND_RATIO = 0.5  # 300~3400Hz 에너지 비율 하한
+VAD_MIN_ENERGY_STD_DB = 4.0  # 구간 내 에너지 표준편차 하한 (지속음/배경음악 제외)
+VAD_MIN_SPEECH_SEC = 0.3
+VAD_MERGE_GAP_SEC = 0.3
+VAD_PAD_SEC = 0.2
+VAD_MAX_REGION_SEC = 30.0  # Whisper 입력 창 길이
+# 서버 시작 시 백그라운드에서 미리 로드 (False면 첫 요청에서 로드)
+AUDIO_PRELOAD_MODELS = True
+
+# 분석 파이프라인 (app/services/analysis_pipeline.py)
+# 영상 분기(프레임 추출/추론)와 음성 분기(디코딩/음성 모델)를 별도 실행기에서 동시 실행
+PIPELINE_VIDEO_WORKERS = 2
+PIPELINE_AUDIO_WORKERS = 2
+
+# 분석 결과 저장소 (app/services/result_store.py)
+RESULT_STORE_BACKEND = "firestore"  # "firestore" 또는 "sqlite" (온프레미스 / 테스트용 로컬 저장소)
+RESULT_STORE_SQLITE_PATH = str(BASE_DIR / "data" / "analysis_results.sqlite3")
+RESULT_STORE_WORKERS = 4  # 저장소 호출 전용 실행기 크기 (이벤트 루프를 막지 않음)
+RESULT_STORE_WRITE_BEHIND = False  # True면 저장 완료를 기다리지 않고 응답 (같은 프로세스의 조회는 즉시 반영)
+RESULT_STORE_WRITE_RETRIES = 3  # write-behind 저장 실패 시 재시도 횟수
+RESULT_STORE_RETRY_DELAY_SEC = 1.0
+RESULT_CACHE_ENABLED = True  # 프로세스 내 조회 캐시 (같은 프로세스의 저장 시 무효화)
+RESULT_CACHE_TTL_SEC = 300.0  # 다른 프로세스가 저장한 결과가 반영되기까지 최대 지연
+RESULT_CACHE_MAX_ENTRIES = 256  # 컬렉션별 캐시 항목 수 상한 (LRU)
+
+# 보고서 파일 캐시 (app/services/report_cache.py)
+REPORT_CACHE_DIR = str(BASE_DIR / "data" / "reports")
+REPORT_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 초과 시 오래 사용하지 않은 보고서부터 삭제
+REPORT_CACHE_MIN_AGE_SEC = 300  # 최근 반환한 보고서는 삭제하지 않음 (FileResponse 전송 중 삭제 방지)
+REPORT_TEMPLATE_VERSION = 1  # report_generator 양식을 바꾸면 올려서 기존 캐시 무효화
+REPORT_WORKERS = 2  # 보고서 생성 전용 작업자 스레드 수 (app/services/report_worker.py)
+REPORT_EAGER_KINDS = ("pdf", "xlsx")  # 분석 완료 시 미리 생성할 보고서 (빈 튜플이면 요청 시 생성)
+
+# 데이터셋 내보내기 (app/api/endpoints/dataset_export.py)
+EXPORT_STREAM_CHUNK_LINES = 500  # 스트리밍 응답 청크당 줄(행) 수
+# 일괄 내보내기 (app/services/bulk_export.py, export_dataset.py)
+BULK_EXPORT_SHARD_ROWS = 50000  # JSONL 샤드당 행 수 (체크포인트 단위)
+BULK_EXPORT_PAGE_SIZE = 100  # 결과 저장소 페이지 크기
+
+# 커뮤니티 게시글 목록 (app/api/endpoints/community.py)
+COMMUNITY_FIRST_PAGE_TTL_SEC = 10.0  # 첫 페이지 캐시 (같은 프로세스의 작성 / 삭제 시 즉시 무효화)
+
+# 분석 완료 알림 (app/services/analysis_events.py)
+ANALYSIS_LONG_POLL_MAX_SEC = 30.0  # get-result?wait= 최대 대기 시간
+ANALYSIS_SSE_HEARTBEAT_SEC = 15.0  # SSE 연결 유지용 주석 전송 간격
+ANALYSIS_SSE_RETRY_MS = 3000  # SSE 재연결 간격 (다른 프로세스에서 진행 중인 분석)
+ANALYSIS_UNSAVED_RESULTS_MAX = 256  # 저장에 실패한 최종 결과를 메모리에 보관하는 최대 개수
+
 # CPU 스레드 설정
 TORCH_NUM_THREADS = 4
+TORCH_INTEROP_THREADS = 1
 CV2_NUM_THREADS = 1
 
+# CPU 추론 런타임 설정 (app/core/runtime.py)
+USE_CHANNELS_LAST = True  # NHWC(channels_last) 메모리 포맷 사용
+USE_ONEDNN_FUSION = False  # oneDNN 그래프 퓨전 (TorchScript trace + freeze)
+CPU_RUNTIME_AUTOTUNE = True  # 모델 로딩 시 자체 벤치마크로 가장 빠른 설정 선택
+CPU_RUNTIME_BENCH_ITERS = 5  # 자체 벤치마크 반복 횟수
+
 # 모델 로딩 확인
 def check_models():
     """모델 파일 존재 여부 확인"""
@@ -1,15 +1,49 @@
-import firebase_admin
-from firebase_admin import credentials, firestore, storage
+"""
+Firebase 연결 (지연 초기화)
+
+import 시점에는 firebase_admin을 불러오지도 초기화하지도 않고,
+get_db() / get_bucket() 첫 호출 시 프로세스당 한 번만 초기화한다.
+"""
 import os
+import threading
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-cred = credentials.Certificate(os.path.join(BASE_DIR, "firebase-key.json"))
+FIREBASE_KEY_PATH = os.path.join(BASE_DIR, "firebase-key.json")
+STORAGE_BUCKET = "deepfake-fc59d.firebasestorage.app"
+
+_db = None
+_bucket = None
+_init_lock = threading.Lock()
+
+def _initialize():
+    global _db, _bucket
+
+    if _db is not None:
+        return
+
+    with _init_lock:
+        if _db is not None:
+            return
+
+        import firebase_admin
+        from firebase_admin import credentials, firestore, storage
+
+        if not firebase_admin._apps:
+            cred = credentials.Certificate(FIREBASE_KEY_PATH)
+            firebase_admin.initialize_app(cred, {
+                "storageBucket": STORAGE_BUCKET
+            })
 
-if not firebase_admin._apps:
-    firebase_admin.initialize_app(cred, {
-    "storageBucket": "deepfake-fc59d.firebasestorage.app"
-    })
+        _bucket = storage.bucket()
+        _db = firestore.client()
+        print("[Firebase] 초기화 완료")
 
+def get_db():
+    """Firestore 클라이언트 (첫 호출 시 초기화)"""
+    _initialize()
+    return _db
 
-db = firestore.client()
-bucket = storage.bucket()
+def get_bucket():
+    """Storage 버킷 (첫 호출 시 초기화)"""
+    _initialize()
+    return _bucket
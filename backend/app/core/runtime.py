@@ -0,0 +1,243 @@
+"""
+CPU 추론 런타임 설정
+
+- intra/inter-op 스레드 수는 프로세스당 한 번만 설정
+- 모델별로 channels_last / oneDNN 그래프 퓨전 조합을 선택
+- CPU_RUNTIME_AUTOTUNE이 켜져 있으면 모델 로딩 시 자체 벤치마크로 가장 빠른 조합 선택
+  (벤치마크는 모델 사본에서 수행하고, 메모리 매핑 가중치는 변환 시 저장한 프로파일을 사용하여
+  파라미터가 워커별 복사본으로 바뀌지 않게 함)
+- 배치 크기별 입력 텐서를 미리 할당하여 재사용 (프레임마다 gc.collect() 불필요)
+"""
+import copy
+import threading
+import time
+
+import cv2
+import torch
+
+from app.core.config import (
+    TORCH_NUM_THREADS, TORCH_INTEROP_THREADS, CV2_NUM_THREADS,
+    USE_CHANNELS_LAST, USE_ONEDNN_FUSION,
+    CPU_RUNTIME_AUTOTUNE, CPU_RUNTIME_BENCH_ITERS
+)
+
+_configured = False
+_config_lock = threading.Lock()
+
+# 모델 이름 -> 선택된 런타임 프로파일
+_model_profiles = {}
+
+# 스레드별 입력 버퍼 캐시: (모델 이름, 배치 크기, channels_last) -> 텐서
+_buffers = threading.local()
+
+def configure_cpu_runtime():
+    """스레드 설정 (프로세스당 한 번만 적용)"""
+    global _configured
+
+    if _configured:
+        return
+
+    with _config_lock:
+        if _configured:
+            return
+
+        torch.set_num_threads(TORCH_NUM_THREADS)
+        try:
+            # inter-op 스레드는 병렬 작업이 시작되기 전에만 설정 가능
+            torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+        except RuntimeError as e:
+            print(f"[Runtime] inter-op 스레드 설정 건너뜀: {e}")
+        cv2.setNumThreads(CV2_NUM_THREADS)
+
+        _configured = True
+        print(f"[Runtime] CPU 스레드 설정: intra={TORCH_NUM_THREADS}, "
+              f"inter={torch.get_num_interop_threads()}, cv2={CV2_NUM_THREADS}")
+
+def default_profile():
+    """설정 파일 기반 기본 프로파일"""
+    return {
+        "channels_last": USE_CHANNELS_LAST,
+        "onednn_fusion": USE_ONEDNN_FUSION,
+        "latency_ms": None
+    }
+
+def prepare_input(tensor: torch.Tensor, profile: dict) -> torch.Tensor:
+    """프로파일에 맞게 입력 텐서 메모리 포맷 변환"""
+    if profile and profile.get("channels_last") and tensor.dim() == 4:
+        return tensor.contiguous(memory_format=torch.channels_last)
+    return tensor
+
+def get_input_buffer(name: str, batch_size: int, sample_shape: tuple, profile: dict) -> torch.Tensor:
+    """
+    미리 할당된 입력 텐서 반환 (스레드별 모델당 버퍼 하나를 지금까지의 최대 배치 크기로 유지)
+
+    더 큰 배치가 들어올 때만 다시 할당하고, 작은 배치는 앞부분 슬라이스(buffer[:batch_size])를 반환한다.
+    반환된 텐서는 다음 호출에서 덮어쓰이므로 추론이 끝날 때까지만 사용해야 한다.
+
+    Args:
+        name: 모델 이름
+        batch_size: 배치 크기
+        sample_shape: 단일 입력 형태 (예: (3, 256, 256))
+        profile: 런타임 프로파일 (channels_last 여부)
+    """
+    cache = getattr(_buffers, "cache", None)
+    if cache is None:
+        cache = _buffers.cache = {}
+
+    key = (name, bool(profile and profile.get("channels_last")))
+    buffer = cache.get(key)
+    if buffer is None or buffer.shape[0] < batch_size or tuple(buffer.shape[1:]) != tuple(sample_shape):
+        buffer = torch.empty((batch_size, *sample_shape))
+        buffer = prepare_input(buffer, profile)
+        cache[key] = buffer
+    # 0번 차원 슬라이스는 channels_last 레이아웃을 유지
+    return buffer[:batch_size]
+
+def fill_input_buffer(name: str, tensors: list, profile: dict) -> torch.Tensor:
+    """전처리된 CxHxW 텐서들을 미리 할당된 배치 버퍼에 복사"""
+    buffer = get_input_buffer(name, len(tensors), tuple(tensors[0].shape), profile)
+    for i, tensor in enumerate(tensors):
+        buffer[i].copy_(tensor)
+    return buffer
+
+def _has_memory_format(model: torch.nn.Module, memory_format) -> bool:
+    """4D 파라미터가 모두 해당 메모리 포맷인지 (이미 맞으면 변환하지 않음)"""
+    return all(
+        param.is_contiguous(memory_format=memory_format)
+        for param in model.parameters() if param.dim() == 4
+    )
+
+def _apply_profile(model: torch.nn.Module, example_input: torch.Tensor, profile: dict):
+    """모델에 프로파일 적용 (메모리 포맷 변환 + 선택적 oneDNN 퓨전)"""
+    model.eval()
+    memory_format = torch.channels_last if profile["channels_last"] else torch.contiguous_format
+    # 변환하면 파라미터가 새 텐서로 바뀌어 메모리 매핑(워커 간 공유)이 풀리므로 필요할 때만
+    if not _has_memory_format(model, memory_format):
+        model = model.to(memory_format=memory_format)
+
+    if not profile["onednn_fusion"]:
+        return model
+
+    # efficientnet-pytorch의 MemoryEfficientSwish는 trace 불가
+    if hasattr(model, "set_swish"):
+        model.set_swish(memory_efficient=False)
+
+    torch.jit.enable_onednn_fusion(True)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, prepare_input(example_input, profile))
+        traced = torch.jit.freeze(traced)
+        # 퓨전 그래프는 처음 몇 번의 실행에서 컴파일됨
+        for _ in range(2):
+            traced(prepare_input(example_input, profile))
+    return traced
+
+def _measure_latency(model, example_input: torch.Tensor, profile: dict, iters: int) -> float:
+    """단일 배치 추론 지연 시간 측정 (중앙값, ms)"""
+    x = prepare_input(example_input, profile)
+    timings = []
+    with torch.inference_mode():
+        model(x)  # 워밍업
+        for _ in range(iters):
+            start = time.perf_counter()
+            model(x)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def _candidate_profiles(allow_fusion: bool = USE_ONEDNN_FUSION):
+    """자체 벤치마크 후보 조합"""
+    candidates = []
+    fusion_options = [False, True] if allow_fusion else [False]
+    for onednn_fusion in fusion_options:
+        for channels_last in (False, True):
+            candidates.append({
+                "channels_last": channels_last,
+                "onednn_fusion": onednn_fusion,
+                "latency_ms": None
+            })
+    return candidates
+
+def autotune_profile(name: str, model: torch.nn.Module, example_input: torch.Tensor,
+                     allow_fusion: bool = USE_ONEDNN_FUSION) -> dict:
+    """
+    자체 벤치마크로 가장 빠른 프로파일 선택
+
+    후보마다 모델 사본에 적용하여 측정하므로 원본 모델의 파라미터는 바뀌지 않는다.
+
+    Args:
+        name: 모델 이름 (로그용)
+        model: 측정 대상 모델
+        example_input: 대표 입력 텐서
+        allow_fusion: oneDNN 퓨전 후보 포함 여부
+
+    Returns:
+        선택된 프로파일 (모든 후보가 실패하면 기본 NCHW 프로파일)
+    """
+    configure_cpu_runtime()
+    model.eval()
+
+    best_profile = None
+    for profile in _candidate_profiles(allow_fusion):
+        try:
+            candidate = _apply_profile(copy.deepcopy(model), example_input, profile)
+            profile["latency_ms"] = round(
+                _measure_latency(candidate, example_input, profile, CPU_RUNTIME_BENCH_ITERS), 3
+            )
+        except Exception as e:
+            print(f"[Runtime] {name} 후보 건너뜀 {profile}: {e}")
+            continue
+        print(f"[Runtime] {name} channels_last={profile['channels_last']} "
+              f"onednn_fusion={profile['onednn_fusion']}: {profile['latency_ms']:.2f}ms")
+        if best_profile is None or profile["latency_ms"] < best_profile["latency_ms"]:
+            best_profile = profile
+
+    if best_profile is None:
+        best_profile = {"channels_last": False, "onednn_fusion": False, "latency_ms": None}
+    print(f"[Runtime] {name} 선택된 설정: channels_last={best_profile['channels_last']}, "
+          f"onednn_fusion={best_profile['onednn_fusion']}")
+    return best_profile
+
+def optimize_model(name: str, model: torch.nn.Module, example_input: torch.Tensor, profile: dict = None):
+    """
+    모델을 현재 호스트에 맞게 최적화
+
+    Args:
+        name: 모델 이름 (프로파일 캐시 키)
+        model: eval 대상 PyTorch 모델
+        example_input: 대표 입력 텐서 (예: 1x3x256x256)
+        profile: 메모리 매핑 파일에 저장된 프로파일 (있으면 자체 벤치마크 없이 그대로 적용)
+
+    Returns:
+        tuple: (추론에 사용할 모델, 선택된 프로파일)
+    """
+    configure_cpu_runtime()
+
+    if profile is not None:
+        profile = dict(profile)
+        print(f"[Runtime] {name} 저장된 설정 사용: channels_last={profile['channels_last']}, "
+              f"onednn_fusion={profile['onednn_fusion']}")
+    elif CPU_RUNTIME_AUTOTUNE:
+        profile = autotune_profile(name, model, example_input)
+    else:
+        profile = default_profile()
+
+    try:
+        optimized = _apply_profile(model, example_input, profile)
+    except Exception as e:
+        print(f"[Runtime] {name} 프로파일 적용 실패, 기본 포맷 사용: {e}")
+        profile = {"channels_last": False, "onednn_fusion": False, "latency_ms": None}
+        optimized = _apply_profile(model, example_input, profile)
+
+    _model_profiles[name] = profile
+    return optimized, profile
+
+def get_runtime_info() -> dict:
+    """현재 런타임 설정 및 모델별 선택 결과"""
+    return {
+        "configured": _configured,
+        "intra_op_threads": torch.get_num_threads(),
+        "inter_op_threads": torch.get_num_interop_threads(),
+        "cv2_threads": CV2_NUM_THREADS,
+        "autotune": CPU_RUNTIME_AUTOTUNE,
+        "profiles": dict(_model_profiles)
+    }
@@ -1,15 +1,27 @@
+import importlib.util
+import threading
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import analyze_video, submit_report, report_download, model_guide, analysis_server, community
+from app.core.config import AUDIO_PRELOAD_MODELS
+from app.core.firebase import get_db
+from app.services.audio_models import audio_model_registry
+from app.services.audio_processing import audio_processor
+from app.services.semantic_analysis import embedding_batcher
+from app.services.result_store import flush_result_stores, get_result_store_status
+from app.services.analysis_events import analysis_notifier
+from app.services.report_cache import report_cache
+from app.services.report_worker import shutdown_report_workers
 
 # analyze_video_optimized는 이전 ensemble 모델용이므로 현재는 비활성화 (MesoNet 단독 모델 사용)
-try:
+# torch / torchvision은 설치 여부만 확인하고 실제 import는 첫 요청 시점에 수행
+OPTIMIZED_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("torch", "torchvision"))
+if OPTIMIZED_AVAILABLE:
     from app.api.endpoints import analyze_video_optimized
-    OPTIMIZED_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ analyze_video_optimized를 로드할 수 없습니다 (PyTorch/torchvision 필요): {e}")
+else:
+    print("⚠️ analyze_video_optimized를 로드할 수 없습니다 (PyTorch/torchvision 필요)")
     print("   현재는 MesoNet 단독 모델만 사용합니다.")
-    OPTIMIZED_AVAILABLE = False
 
 app = FastAPI(
     title="Deepfake Detection API",
@@ -24,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메서드 허용
     allow_headers=["*"],  # 모든 헤더 허용
+    expose_headers=["X-Next-Page-Token"],  # 커뮤니티 게시글 다음 페이지 토큰
 )
 
 # 라우터 등록
@@ -39,7 +52,56 @@ app.include_router(report_download.router, prefix="/download-report", tags=["Rep
 app.include_router(model_guide.router, prefix="/model-guide", tags=["Model Development"])
 app.include_router(community.router, prefix="/community", tags=["Community"])
 
+def _init_firebase():
+    try:
+        get_db()
+    except Exception as e:
+        print(f"[Firebase] 초기화 실패 (첫 사용 시 다시 시도): {e}")
+
+@app.on_event("startup")
+def warm_up_audio_models():
+    """음성 분석 모델을 백그라운드에서 미리 로드 (첫 요청 지연 방지)"""
+    if AUDIO_PRELOAD_MODELS:
+        threading.Thread(target=audio_processor.load_models, name="audio-warmup", daemon=True).start()
+
+@app.on_event("startup")
+def warm_up_firebase():
+    """Firebase 연결을 import 시점이 아닌 서버 시작 후 백그라운드에서 초기화"""
+    threading.Thread(target=_init_firebase, name="firebase-warmup", daemon=True).start()
+
+@app.on_event("shutdown")
+async def flush_result_store():
+    """write-behind 대기 중인 결과 저장 완료 대기"""
+    await flush_result_stores()
+
+@app.on_event("shutdown")
+def stop_report_workers():
+    """미리 생성 대기 중인 보고서 작업 취소"""
+    shutdown_report_workers()
+
 @app.get("/")
 def root():
     return {"message": "Deepfake Detection API Running"}
 
+@app.get("/status/audio-models")
+def audio_models_status():
+    """음성 분석 모델 로딩 상태 / 로딩 시간 / 메모리 + 문장 임베딩 캐시"""
+    return {
+        **audio_model_registry.get_status(),
+        "sentence_embeddings": embedding_batcher.get_stats()
+    }
+
+@app.get("/status/result-store")
+def result_store_status():
+    """컬렉션별 분석 결과 저장소 종류 / write-behind 대기 / 실패 수"""
+    return get_result_store_status()
+
+@app.get("/status/analysis-events")
+def analysis_events_status():
+    """진행 중인 분석 수 / 완료 알림 / long-poll 대기 / 생략된 저장소 조회 수"""
+    return analysis_notifier.get_status()
+
+@app.get("/status/report-cache")
+def report_cache_status():
+    """보고서 파일 캐시 크기 / 적중률 / 삭제 수"""
+    return report_cache.get_status()
@@ -0,0 +1,97 @@
+"""
+분석 완료 알림 (프로세스 내 pub/sub)
+
+백그라운드 분석 작업은 시작 시 start(), 결과 저장 후 publish()를 호출한다.
+결과 조회 요청은 저장소를 반복 조회하는 대신
+- 진행 중인 분석이면 저장소를 읽지 않고 바로 "processing" 응답
+- wait()로 완료될 때까지(최대 timeout초) 대기 → long-poll / SSE
+
+저장소에 저장하지 못한 최종 결과(오류 결과 저장 실패 등)는 최근 ANALYSIS_UNSAVED_RESULTS_MAX개를
+메모리에 보관하여 이후 조회도 "processing"에 머물지 않고 최종 결과를 받는다.
+
+같은 프로세스에서 시작된 분석만 알 수 있으므로, 여러 워커 프로세스로 실행하면
+다른 프로세스의 분석은 기존처럼 저장소 조회로 확인한다.
+반드시 이벤트 루프 안에서 호출한다.
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import ANALYSIS_UNSAVED_RESULTS_MAX
+
+class AnalysisNotifier:
+    """분석 ID별 완료 Future (완료 결과를 대기 중인 요청에 바로 전달)"""
+
+    def __init__(self):
+        self._pending = {}  # analysis_id -> asyncio.Future (결과 문서)
+        self._unsaved = OrderedDict()  # analysis_id -> 저장소에 없는 최종 결과 (최근 것만)
+        self.published = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.reads_avoided = 0
+
+    def start(self, analysis_id: str):
+        """분석 시작 등록 (백그라운드 작업 생성 전에 호출)"""
+        if analysis_id not in self._pending:
+            self._pending[analysis_id] = asyncio.get_running_loop().create_future()
+
+    def __contains__(self, analysis_id: str) -> bool:
+        return analysis_id in self._pending
+
+    def is_processing(self, analysis_id: str) -> bool:
+        """진행 중 여부 (True면 저장소 조회 없이 "processing" 응답)"""
+        processing = analysis_id in self._pending
+        if processing:
+            self.reads_avoided += 1
+        return processing
+
+    def publish(self, analysis_id: str, result: Optional[Dict], persisted: bool = True):
+        """
+        분석 완료 (오류 포함) 알림 - 대기 중인 요청을 즉시 깨움
+
+        Args:
+            persisted: False면 결과가 저장소에 없으므로 이후 조회를 위해 메모리에 보관
+        """
+        if not persisted and result is not None:
+            self._unsaved[analysis_id] = result
+            self._unsaved.move_to_end(analysis_id)
+            while len(self._unsaved) > ANALYSIS_UNSAVED_RESULTS_MAX:
+                self._unsaved.popitem(last=False)
+        future = self._pending.pop(analysis_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+            self.published += 1
+
+    def unsaved_result(self, analysis_id: str) -> Optional[Dict]:
+        """저장소에 저장하지 못한 최종 결과 (없으면 None)"""
+        return self._unsaved.get(analysis_id)
+
+    async def wait(self, analysis_id: str, timeout: float) -> Optional[Dict]:
+        """
+        분석 완료까지 대기
+
+        Returns:
+            결과 문서 (timeout 또는 등록되지 않은 ID면 None)
+        """
+        future = self._pending.get(analysis_id)
+        if future is None:
+            return None
+        self.waits += 1
+        try:
+            # 대기 요청이 끊겨도 Future는 취소하지 않음 (다른 대기 요청 유지)
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return None
+
+    def get_status(self) -> Dict:
+        return {
+            "processing": len(self._pending),
+            "published": self.published,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "unsaved_results": len(self._unsaved),
+            "store_reads_avoided": self.reads_avoided
+        }
+
+analysis_notifier = AnalysisNotifier()
@@ -0,0 +1,80 @@
+"""
+영상 / 음성 분석 파이프라인 (DAG)
+
+    업로드 ─┬─ [영상 분기] 프레임 추출 → 프레임 추론 ─┬─ 집계 → 타임라인 → 요약
+            └─ [음성 분기] 오디오 디코딩 → 음성 모델 ──┘
+
+두 분기는 서로 독립적이므로 별도 실행기에서 동시에 실행하고 결과만 합친다.
+전체 소요 시간은 두 분기 시간의 합이 아니라 긴 쪽에 가까워진다.
+단계별 소요 시간은 StageTimer로 기록하여 결과의 "timings"에 포함한다.
+"""
+import asyncio
+import contextlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import PIPELINE_VIDEO_WORKERS, PIPELINE_AUDIO_WORKERS
+
+# 분기별 실행기 (프로세스당 하나, 영상/음성 작업이 서로의 슬롯을 차지하지 않음)
+_video_executor = ThreadPoolExecutor(max_workers=PIPELINE_VIDEO_WORKERS, thread_name_prefix="video-branch")
+_audio_executor = ThreadPoolExecutor(max_workers=PIPELINE_AUDIO_WORKERS, thread_name_prefix="audio-branch")
+
+class StageTimer:
+    """단계별 소요 시간 기록 (여러 스레드에서 동시에 기록 가능)"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._timings[name] = round(self._timings.get(name, 0.0) + seconds, 3)
+
+    def as_dict(self) -> dict:
+        """단계별 시간 + 전체 경과 시간 (초)"""
+        with self._lock:
+            timings = dict(self._timings)
+        timings["total"] = round(time.perf_counter() - self._start, 3)
+        return timings
+
+def _timed(fn, timer: StageTimer, name: str):
+    def run():
+        with timer.stage(name):
+            return fn()
+    return run
+
+async def run_branches(video_branch, audio_branch, timer: StageTimer):
+    """
+    영상 / 음성 분기를 별도 실행기에서 동시에 실행
+
+    Args:
+        video_branch: 인자 없는 동기 함수 (프레임 추출 + 추론)
+        audio_branch: 인자 없는 동기 함수 (음성 분석)
+        timer: 단계별 시간 기록
+
+    Returns:
+        tuple: (영상 분기 결과, 음성 분기 결과)
+        영상 분기 예외는 그대로 전파하고, 음성 분기 예외는 {"error": ...}로 변환한다.
+    """
+    loop = asyncio.get_running_loop()
+    video_future = loop.run_in_executor(_video_executor, _timed(video_branch, timer, "video_branch"))
+    audio_future = loop.run_in_executor(_audio_executor, _timed(audio_branch, timer, "audio_branch"))
+
+    video_result, audio_result = await asyncio.gather(video_future, audio_future, return_exceptions=True)
+
+    if isinstance(audio_result, Exception):
+        print(f"[Pipeline] 음성 분기 실패: {audio_result}")
+        audio_result = {"status": "error", "error": f"음성 분석 실패: {str(audio_result)}"}
+    if isinstance(video_result, Exception):
+        raise video_result
+    return video_result, audio_result
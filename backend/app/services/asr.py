@@ -0,0 +1,159 @@
+"""
+음성 인식 (ASR) 엔진
+
+요청 경로에서는 로컬 엔진만 사용한다 (네트워크 호출 없음, Whisper 모델도 로컬 경로에서만 로드).
+- faster_whisper: CTranslate2 int8 CPU 추론 (기본)
+- whisper: openai-whisper (faster-whisper가 없을 때)
+- noop: 음성 인식 생략 (빈 결과)
+- fake: 지정한 지연 시간 후 고정 텍스트 반환 (네트워크 없이 지연/타임아웃 테스트용)
+
+ASR_ENGINES 순서대로 로딩 가능한 첫 엔진을 사용하며,
+모든 호출은 제한된 실행기에서 ASR_TIMEOUT_SEC 안에 끝나야 한다.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import (
+    ASR_ENGINES, ASR_LANGUAGE, ASR_TIMEOUT_SEC, ASR_MAX_CONCURRENCY,
+    ASR_FAKE_LATENCY_SEC, ASR_FAKE_TEXT
+)
+from app.services.audio_models import audio_model_registry, WHISPER_AVAILABLE, FASTER_WHISPER_AVAILABLE
+
+# 음성 인식 전용 실행기 (타임아웃된 호출이 계속 실행되더라도 동시 실행 수 상한 유지)
+_asr_executor = ThreadPoolExecutor(max_workers=ASR_MAX_CONCURRENCY, thread_name_prefix="asr")
+
+class ASREngine(ABC):
+    """음성 인식 엔진 인터페이스"""
+
+    name = "base"
+
+    def load(self) -> bool:
+        """모델 로딩 (사용 불가하면 False)"""
+        return True
+
+    @abstractmethod
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Dict]:
+        """
+        파형 -> 세그먼트 목록
+
+        Returns:
+            [{"start": 초, "end": 초, "text": str}] (입력 파형 기준 시간)
+        """
+
+class FasterWhisperEngine(ASREngine):
+    """faster-whisper (CTranslate2, int8 CPU 추론)"""
+
+    name = "faster_whisper"
+
+    def load(self) -> bool:
+        return FASTER_WHISPER_AVAILABLE and audio_model_registry.get("faster_whisper") is not None
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Dict]:
+        model = audio_model_registry.get("faster_whisper")
+        segments, _ = model.transcribe(samples, language=ASR_LANGUAGE, beam_size=1, vad_filter=False)
+        # 세그먼트는 제너레이터이므로 여기서 디코딩이 실행됨
+        return [
+            {"start": round(segment.start, 3), "end": round(segment.end, 3), "text": segment.text.strip()}
+            for segment in segments
+            if segment.text.strip()
+        ]
+
+class WhisperEngine(ASREngine):
+    """openai-whisper"""
+
+    name = "whisper"
+
+    def load(self) -> bool:
+        return WHISPER_AVAILABLE and audio_model_registry.get("whisper") is not None
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Dict]:
+        model = audio_model_registry.get("whisper")
+        with audio_model_registry.inference_lock("whisper"):
+            result = model.transcribe(
+                samples, language=ASR_LANGUAGE, fp16=audio_model_registry.device.type == "cuda"
+            )
+        return [
+            {"start": round(segment["start"], 3), "end": round(segment["end"], 3), "text": segment["text"].strip()}
+            for segment in result.get("segments", [])
+            if segment["text"].strip()
+        ]
+
+class NoOpEngine(ASREngine):
+    """음성 인식 생략"""
+
+    name = "noop"
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Dict]:
+        return []
+
+class FakeASREngine(ASREngine):
+    """고정 지연 후 고정 텍스트 반환 (지연 시간 / 타임아웃 동작 확인용)"""
+
+    name = "fake"
+
+    def __init__(self, latency_sec: float = ASR_FAKE_LATENCY_SEC, text: str = ASR_FAKE_TEXT):
+        self.latency_sec = latency_sec
+        self.text = text
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Dict]:
+        time.sleep(self.latency_sec)
+        return [{"start": 0.0, "end": round(len(samples) / sample_rate, 3), "text": self.text}]
+
+ENGINE_CLASSES = {
+    engine_class.name: engine_class
+    for engine_class in (FasterWhisperEngine, WhisperEngine, NoOpEngine, FakeASREngine)
+}
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_asr_engine() -> ASREngine:
+    """ASR_ENGINES 순서대로 로딩 가능한 첫 엔진 (프로세스당 한 번 선택)"""
+    global _engine
+
+    if _engine is not None:
+        return _engine
+
+    with _engine_lock:
+        if _engine is not None:
+            return _engine
+
+        for name in ASR_ENGINES:
+            engine_class = ENGINE_CLASSES.get(name)
+            if engine_class is None:
+                print(f"[ASR] 알 수 없는 엔진 건너뜀: {name}")
+                continue
+            engine = engine_class()
+            if engine.load():
+                print(f"[ASR] 음성 인식 엔진: {name}")
+                _engine = engine
+                return _engine
+            print(f"[ASR] {name} 사용 불가, 다음 엔진 시도")
+
+        print("[ASR] 사용 가능한 엔진 없음, 음성 인식 생략")
+        _engine = NoOpEngine()
+        return _engine
+
+def transcribe_with_timeout(engine: ASREngine, samples: np.ndarray, sample_rate: int,
+                            timeout: float = ASR_TIMEOUT_SEC):
+    """
+    제한 시간 안에 음성 인식
+
+    Returns:
+        세그먼트 목록, 실패/타임아웃 시 None
+    """
+    future = _asr_executor.submit(engine.transcribe, samples, sample_rate)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        # 실행 중인 호출은 취소할 수 없지만 결과를 기다리지 않고 분석을 계속함
+        print(f"[ASR] {engine.name} 음성 인식 시간 초과 ({timeout}s)")
+        return None
+    except Exception as e:
+        print(f"[ASR] {engine.name} 음성 인식 실패: {e}")
+        return None
@@ -0,0 +1,149 @@
+"""
+음성 특징 추출 (STFT 한 번으로 모든 특징 계산)
+
+- 크기 스펙트로그램 |STFT|를 한 번만 계산하고 MFCC / 스펙트럼 중심 / 피치를 모두 여기서 유도
+- 피치 추정 방식 선택:
+    "hps": 고조파 곱 스펙트럼(HPS) 최대값 (벡터화, 기본)
+    "piptrack": librosa.piptrack (같은 스펙트로그램 재사용, 느림)
+    "none": 피치 생략
+- 프레임 특징을 고정 길이 윈도우로 집계하여 영상 타임라인 구간과 같은 시간 축으로 반환
+"""
+from typing import Dict
+
+import numpy as np
+
+from app.core.config import AUDIO_PITCH_METHOD, AUDIO_FEATURE_WINDOW_SEC
+from app.services.audio_io import AudioClip
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MFCC = 13
+PITCH_RANGE_HZ = (50.0, 500.0)
+HPS_HARMONICS = 3
+
+def _pitch_hps(magnitude: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    고조파 곱 스펙트럼 기반 프레임별 피치 (무성 프레임은 0)
+
+    Args:
+        magnitude: (주파수 bin, 프레임) 크기 스펙트로그램
+    """
+    n_bins = magnitude.shape[0] // HPS_HARMONICS
+    hps = magnitude[:n_bins].copy()
+    for harmonic in range(2, HPS_HARMONICS + 1):
+        hps *= magnitude[::harmonic][:n_bins]
+
+    bin_hz = sample_rate / N_FFT
+    low = max(1, int(PITCH_RANGE_HZ[0] / bin_hz))
+    high = min(n_bins - 1, int(PITCH_RANGE_HZ[1] / bin_hz) + 1)
+    band = hps[low:high]
+    peak = np.argmax(band, axis=0)
+
+    # 포물선 보간으로 bin 이하 해상도 보정
+    idx = np.clip(peak, 1, band.shape[0] - 2)
+    cols = np.arange(band.shape[1])
+    left, center, right = band[idx - 1, cols], band[idx, cols], band[idx + 1, cols]
+    denom = left - 2 * center + right
+    safe = np.abs(denom) > 1e-12
+    offset = np.where(safe, 0.5 * (left - right) / np.where(safe, denom, 1.0), 0.0)
+    pitch = (low + idx + offset) * bin_hz
+
+    # 에너지가 낮은 프레임은 무성으로 처리
+    frame_energy = magnitude.sum(axis=0)
+    voiced = frame_energy > np.median(frame_energy) * 0.5
+    return np.where(voiced, pitch, 0.0).astype(np.float32)
+
+def _pitch_piptrack(magnitude: np.ndarray, sample_rate: int) -> np.ndarray:
+    """librosa.piptrack (같은 스펙트로그램 재사용), 프레임별 최대 크기 bin의 피치"""
+    import librosa
+
+    pitches, magnitudes = librosa.piptrack(S=magnitude, sr=sample_rate, n_fft=N_FFT, hop_length=HOP_LENGTH)
+    best = np.argmax(magnitudes, axis=0)
+    return pitches[best, np.arange(pitches.shape[1])].astype(np.float32)
+
+def _window_bounds(num_frames: int, sample_rate: int, window_sec: float) -> np.ndarray:
+    """윈도우 시작 프레임 인덱스 (np.add.reduceat용)"""
+    frames_per_window = max(1, int(round(window_sec * sample_rate / HOP_LENGTH)))
+    return np.arange(0, num_frames, frames_per_window)
+
+def _windowed_mean(values: np.ndarray, bounds: np.ndarray, mask: np.ndarray = None) -> np.ndarray:
+    """프레임 값 -> 윈도우 평균 (mask가 있으면 해당 프레임만)"""
+    if mask is None:
+        mask = np.ones(values.shape[-1], dtype=bool)
+    weights = mask.astype(np.float32)
+    sums = np.add.reduceat(values * weights, bounds, axis=-1)
+    counts = np.add.reduceat(weights, bounds)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+
+def extract_features(clip: AudioClip, pitch_method: str = AUDIO_PITCH_METHOD,
+                     window_sec: float = AUDIO_FEATURE_WINDOW_SEC) -> Dict:
+    """
+    전체 클립 특징 + 윈도우별 특징
+
+    Returns:
+        dict: mfcc_mean/std, pitch_mean, spectral_centroid_mean, zero_crossing_rate_mean,
+              duration, pitch_method, windows [{"start", "end", "pitch_mean", ...}]
+    """
+    y, sr = clip.samples, clip.sample_rate
+    if len(y) == 0:
+        return {}
+
+    # librosa는 import 비용이 크므로 처음 사용할 때 불러옴
+    import librosa
+
+    # 1. STFT 한 번
+    magnitude = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+
+    # 2. 같은 스펙트로그램에서 MFCC (librosa.feature.mfcc(y=...)와 동일한 mel 파워 스펙트로그램)
+    mel = librosa.feature.melspectrogram(S=magnitude ** 2, sr=sr)
+    mfccs = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=N_MFCC)
+
+    # 3. 스펙트럼 중심 (주파수 가중 평균, 벡터화)
+    freqs = librosa.fft_frequencies(sr=sr, n_fft=N_FFT)
+    centroid = (freqs[:, None] * magnitude).sum(axis=0) / (magnitude.sum(axis=0) + 1e-10)
+
+    # 4. 제로 크로싱 비율 (시간 영역, STFT 불필요)
+    zcr = librosa.feature.zero_crossing_rate(y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]
+
+    # 5. 피치
+    if pitch_method == "piptrack":
+        pitch = _pitch_piptrack(magnitude, sr)
+    elif pitch_method == "hps":
+        pitch = _pitch_hps(magnitude, sr)
+    else:
+        pitch = np.zeros(magnitude.shape[1], dtype=np.float32)
+
+    num_frames = min(magnitude.shape[1], len(zcr))
+    voiced = pitch[:num_frames] > 0
+
+    # 6. 윈도우별 집계 (영상 타임라인과 같은 시간 축)
+    bounds = _window_bounds(num_frames, sr, window_sec)
+    window_pitch = _windowed_mean(pitch[:num_frames], bounds, voiced)
+    window_centroid = _windowed_mean(centroid[:num_frames], bounds)
+    window_zcr = _windowed_mean(zcr[:num_frames], bounds)
+    window_mfcc = _windowed_mean(mfccs[:, :num_frames], bounds)
+
+    frame_sec = HOP_LENGTH / sr
+    windows = []
+    for i, start_frame in enumerate(bounds):
+        end_frame = bounds[i + 1] if i + 1 < len(bounds) else num_frames
+        windows.append({
+            "start": round(float(start_frame * frame_sec), 3),
+            "end": round(min(float(end_frame * frame_sec), clip.duration), 3),
+            "pitch_mean": round(float(window_pitch[i]), 2),
+            "spectral_centroid_mean": round(float(window_centroid[i]), 2),
+            "zero_crossing_rate_mean": round(float(window_zcr[i]), 5),
+            "mfcc_mean": np.round(window_mfcc[:, i], 3).tolist()
+        })
+
+    return {
+        "mfcc_mean": np.mean(mfccs, axis=1).tolist(),
+        "mfcc_std": np.std(mfccs, axis=1).tolist(),
+        "pitch_mean": float(np.mean(pitch[pitch > 0])) if np.any(pitch > 0) else 0.0,
+        "spectral_centroid_mean": float(np.mean(centroid)),
+        "zero_crossing_rate_mean": float(np.mean(zcr)),
+        "duration": clip.duration,
+        "pitch_method": pitch_method,
+        "window_sec": window_sec,
+        "windows": windows
+    }
@@ -0,0 +1,194 @@
+"""
+오디오 디코딩
+
+영상 컨테이너에서 16kHz 모노 파형을 한 번만 디코딩하여 모든 음성 분석 단계가 공유한다.
+디코딩 전에 probe_audio_stream()으로 오디오 트랙 존재 여부를 메타데이터만으로 확인한다.
+FFmpeg가 있으면 컨테이너에서 바로 리샘플링된 PCM을 스트리밍으로 읽고,
+없으면 librosa.load로 대체한다.
+"""
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import uuid
+
+import numpy as np
+
+TARGET_SAMPLE_RATE = 16000
+
+# 컨테이너 메타데이터 조회 제한 시간
+PROBE_TIMEOUT_SEC = 10
+
+# FFmpeg stdout 읽기 단위 (float32 샘플 경계에 맞춤)
+_READ_CHUNK_BYTES = 1 << 20
+
+class AudioClip:
+    """디코딩된 모노 파형 (float32, -1~1)"""
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, source: str = None):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.source = source
+        self._wav_path = None
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+    def slice(self, start: float, end: float) -> np.ndarray:
+        """구간 샘플 (초 단위, 복사 없이 view 반환)"""
+        start_idx = max(0, int(start * self.sample_rate))
+        end_idx = min(len(self.samples), int(end * self.sample_rate))
+        return self.samples[start_idx:end_idx]
+
+    def rms_dbfs(self) -> float:
+        """전체 RMS 레벨 (dBFS, 무음이면 -inf에 가까운 값)"""
+        if len(self.samples) == 0:
+            return -120.0
+        rms = float(np.sqrt(np.mean(np.square(self.samples, dtype=np.float64))))
+        return 20 * np.log10(rms + 1e-12)
+
+    def to_pcm16(self, samples: np.ndarray = None) -> bytes:
+        """16bit PCM 바이트 (SpeechRecognition AudioData용)"""
+        samples = self.samples if samples is None else samples
+        return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+    def as_wav_path(self) -> str:
+        """파일 경로가 꼭 필요한 단계에서만 임시 WAV 생성 (한 번만 기록)"""
+        if self._wav_path is None:
+            import soundfile as sf
+            self._wav_path = os.path.join(tempfile.gettempdir(), f"temp_audio_{uuid.uuid4().hex}.wav")
+            sf.write(self._wav_path, self.samples, self.sample_rate)
+        return self._wav_path
+
+    def cleanup(self):
+        """임시 WAV 정리"""
+        if self._wav_path and os.path.exists(self._wav_path):
+            try:
+                os.remove(self._wav_path)
+            except OSError:
+                pass
+        self._wav_path = None
+
+def _probe_with_ffprobe(path: str):
+    """ffprobe로 오디오 스트림 메타데이터 조회 (ffprobe 없으면 None)"""
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+
+    cmd = [
+        ffprobe, "-v", "error",
+        "-select_streams", "a",
+        "-show_entries", "stream=codec_name,channels,sample_rate,duration",
+        "-of", "json", path
+    ]
+    proc = subprocess.run(cmd, capture_output=True, timeout=PROBE_TIMEOUT_SEC)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode(errors="ignore").strip())
+    streams = json.loads(proc.stdout or b"{}").get("streams", [])
+    return [
+        {
+            "codec": stream.get("codec_name"),
+            "channels": stream.get("channels"),
+            "sample_rate": int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+            "duration": float(stream["duration"]) if stream.get("duration") else None
+        }
+        for stream in streams
+    ]
+
+def _probe_with_pyav(path: str):
+    """PyAV로 오디오 스트림 메타데이터 조회 (PyAV 없으면 None)"""
+    try:
+        import av
+    except ImportError:
+        return None
+
+    with av.open(path) as container:
+        return [
+            {
+                "codec": stream.codec_context.name,
+                "channels": stream.codec_context.channels,
+                "sample_rate": stream.codec_context.sample_rate,
+                "duration": float(stream.duration * stream.time_base) if stream.duration else None
+            }
+            for stream in container.streams.audio
+        ]
+
+def probe_audio_stream(path: str) -> dict:
+    """
+    컨테이너 메타데이터만 읽어 오디오 트랙 존재 여부 확인 (디코딩 없음)
+
+    Returns:
+        dict: has_audio (True/False, 확인 불가 시 None), streams, prober
+    """
+    for prober, probe in (("ffprobe", _probe_with_ffprobe), ("pyav", _probe_with_pyav)):
+        try:
+            streams = probe(path)
+        except Exception as e:
+            print(f"[Audio] {prober} 조회 실패: {e}")
+            continue
+        if streams is not None:
+            return {"has_audio": len(streams) > 0, "streams": streams, "prober": prober}
+    return {"has_audio": None, "streams": [], "prober": None}
+
+def _decode_with_ffmpeg(path: str, sample_rate: int):
+    """FFmpeg로 오디오 스트림을 모노/리샘플링된 float32 PCM으로 스트리밍 디코딩"""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+
+    cmd = [
+        ffmpeg, "-nostdin", "-v", "error",
+        "-i", path,
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "f32le", "pipe:1"
+    ]
+    # stderr는 파이프 대신 임시 파일로 받음 (경고가 많아 파이프가 차면 FFmpeg가 멈춰 stdout 읽기와 교착)
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+        chunks = []
+        pending = b""
+        try:
+            while True:
+                data = proc.stdout.read(_READ_CHUNK_BYTES)
+                if not data:
+                    break
+                data = pending + data
+                usable = len(data) - (len(data) % 4)
+                chunks.append(np.frombuffer(data[:usable], dtype=np.float32))
+                pending = data[usable:]
+        finally:
+            proc.stdout.close()
+            proc.wait()
+
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="ignore").strip()
+            raise RuntimeError(f"FFmpeg 디코딩 실패: {stderr}")
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks)
+
+def decode_audio(path: str, sample_rate: int = TARGET_SAMPLE_RATE) -> AudioClip:
+    """
+    영상/오디오 파일에서 모노 파형을 한 번만 디코딩
+
+    Args:
+        path: 영상 또는 오디오 파일 경로
+        sample_rate: 목표 샘플링 레이트 (리샘플링은 디코딩 시 한 번만 수행)
+
+    Returns:
+        AudioClip
+    """
+    try:
+        samples = _decode_with_ffmpeg(path, sample_rate)
+        if samples is not None:
+            return AudioClip(samples, sample_rate, source=path)
+    except Exception as e:
+        print(f"[Audio] FFmpeg 디코딩 실패, librosa 사용: {e}")
+
+    import librosa
+    samples, sr = librosa.load(path, sr=sample_rate, mono=True)
+    return AudioClip(samples, sr, source=path)
@@ -0,0 +1,189 @@
+"""
+음성 분석 모델 레지스트리
+
+Whisper(faster-whisper) / Wav2Vec2 / Sentence-BERT를 프로세스당 한 번만 로드하여 모든 요청이 공유한다.
+- 서버 시작 시 warm_up()으로 미리 로드하거나, 첫 사용 시 로드 (모델별 잠금으로 중복 로딩 방지)
+- Whisper 디코딩은 모델에 kv-cache 훅을 설치하므로 추론 잠금으로 직렬화
+- 모델별 로딩 시간 / 파라미터 메모리 / RSS 증가량을 get_status()로 제공
+"""
+import contextlib
+import importlib.util
+import platform
+import sys
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+from app.core.config import (
+    AUDIO_WHISPER_MODEL, AUDIO_WAV2VEC2_MODEL, AUDIO_SENTENCE_BERT_MODEL,
+    FASTER_WHISPER_MODEL_DIR, WHISPER_MODEL_DIR,
+    ASR_COMPUTE_TYPE, TORCH_NUM_THREADS
+)
+
+def _module_available(name: str) -> bool:
+    """설치 여부만 확인 (import하지 않음)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# torch / whisper / faster-whisper / sentence-transformers는 import 비용이 크므로
+# 여기서는 설치 여부만 확인하고 실제 import는 모델 로딩 시점에 수행
+# (Windows에서는 Whisper를 건너뜀)
+WHISPER_AVAILABLE = platform.system() != "Windows" and _module_available("whisper")
+FASTER_WHISPER_AVAILABLE = _module_available("faster_whisper")
+SENTENCE_BERT_AVAILABLE = _module_available("sentence_transformers")
+
+def _param_bytes(*modules) -> int:
+    """torch 모듈 파라미터 + 버퍼 메모리 (바이트)"""
+    # torch 모듈이 있다면 torch는 이미 import되어 있음 (여기서 새로 import하지 않음)
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return 0
+
+    total = 0
+    for module in modules:
+        if isinstance(module, torch.nn.Module):
+            for tensor in list(module.parameters()) + list(module.buffers()):
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+class AudioModelRegistry:
+    """음성 분석 모델 공유 레지스트리 (스레드 안전)"""
+
+    MODEL_NAMES = ("faster_whisper", "whisper", "wav2vec2", "sentence_bert")
+    # 음성 인식 모델은 선택된 ASR 엔진이 필요할 때만 로드 (app/services/asr.py)
+    ANALYSIS_MODELS = ("wav2vec2", "sentence_bert")
+
+    def __init__(self):
+        self._device = None
+        self._models = {}
+        self._stats = {}
+        self._load_locks = {name: threading.Lock() for name in self.MODEL_NAMES}
+        # Whisper는 transcribe 중 모델에 훅을 설치하므로 동시 호출 불가
+        self._inference_locks = {"whisper": threading.Lock()}
+
+    @property
+    def device(self):
+        """추론 장치 (torch는 처음 필요할 때 import)"""
+        if self._device is None:
+            import torch
+            self._device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        return self._device
+
+    def _load_whisper(self):
+        if not WHISPER_AVAILABLE:
+            return None
+        # 모델 이름으로 로드하면 파일이 없을 때 다운로드하므로 로컬 체크포인트 경로로 로드
+        checkpoint = Path(WHISPER_MODEL_DIR) / f"{AUDIO_WHISPER_MODEL}.pt"
+        if not checkpoint.is_file():
+            raise FileNotFoundError(
+                f"Whisper 모델 파일을 찾을 수 없습니다: {checkpoint}\n"
+                f"다운로드: python -c \"import whisper; "
+                f"whisper.load_model('{AUDIO_WHISPER_MODEL}', download_root='{WHISPER_MODEL_DIR}')\""
+            )
+        import whisper
+        return whisper.load_model(str(checkpoint), device=str(self.device))
+
+    def _load_faster_whisper(self):
+        if not FASTER_WHISPER_AVAILABLE:
+            return None
+        if not (Path(FASTER_WHISPER_MODEL_DIR) / "model.bin").is_file():
+            raise FileNotFoundError(
+                f"faster-whisper 모델 디렉토리를 찾을 수 없습니다: {FASTER_WHISPER_MODEL_DIR}\n"
+                f"다운로드: huggingface-cli download Systran/faster-whisper-{AUDIO_WHISPER_MODEL} "
+                f"--local-dir {FASTER_WHISPER_MODEL_DIR}"
+            )
+        from faster_whisper import WhisperModel
+        device = "cuda" if self.device.type == "cuda" else "cpu"
+        return WhisperModel(
+            FASTER_WHISPER_MODEL_DIR,
+            device=device,
+            compute_type=ASR_COMPUTE_TYPE if device == "cpu" else "float16",
+            cpu_threads=TORCH_NUM_THREADS,
+            local_files_only=True
+        )
+
+    def _load_wav2vec2(self):
+        import torch
+        from transformers import AutoModel, AutoFeatureExtractor
+        model = AutoModel.from_pretrained(
+            AUDIO_WAV2VEC2_MODEL,
+            dtype=torch.float16 if self.device.type == "cuda" else torch.float32
+        ).to(self.device)
+        model.eval()
+        # 원시 파형 입력은 토크나이저가 아닌 feature extractor로 정규화
+        feature_extractor = AutoFeatureExtractor.from_pretrained(AUDIO_WAV2VEC2_MODEL)
+        return model, feature_extractor
+
+    def _load_sentence_bert(self):
+        if not SENTENCE_BERT_AVAILABLE:
+            return None
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(AUDIO_SENTENCE_BERT_MODEL, device=str(self.device))
+
+    def get(self, name: str):
+        """
+        모델 반환 (아직 로드되지 않았으면 로드)
+
+        Returns:
+            모델 객체 (wav2vec2는 (model, feature_extractor)), 사용 불가/로딩 실패 시 None
+        """
+        if name in self._models:
+            return self._models[name]
+
+        with self._load_locks[name]:
+            if name in self._models:
+                return self._models[name]
+
+            loader = getattr(self, f"_load_{name}")
+            process = psutil.Process()
+            rss_before = process.memory_info().rss
+            start = time.perf_counter()
+            try:
+                model = loader()
+                error = None
+            except Exception as e:
+                model = None
+                error = str(e)
+                print(f"[AudioModels] {name} 로딩 실패: {e}")
+            load_time = time.perf_counter() - start
+
+            modules = model if isinstance(model, tuple) else (model,)
+            self._stats[name] = {
+                "loaded": model is not None,
+                "load_time_sec": round(load_time, 3),
+                "param_mb": round(_param_bytes(*modules) / 1024 / 1024, 1),
+                "rss_delta_mb": round((process.memory_info().rss - rss_before) / 1024 / 1024, 1),
+                "error": error
+            }
+            # 실패도 기록하여 요청마다 재시도하지 않음
+            self._models[name] = model
+            if model is not None:
+                print(f"[AudioModels] {name} 로딩 완료: {load_time:.2f}s, "
+                      f"파라미터 {self._stats[name]['param_mb']}MB, RSS +{self._stats[name]['rss_delta_mb']}MB")
+            return model
+
+    def warm_up(self, names=None):
+        """모델 미리 로드 (기본: 음성 인식 외 분석 모델)"""
+        for name in names or self.ANALYSIS_MODELS:
+            self.get(name)
+
+    def inference_lock(self, name: str):
+        """동시 추론이 불가능한 모델용 잠금 (그 외에는 no-op 컨텍스트)"""
+        return self._inference_locks.get(name) or contextlib.nullcontext()
+
+    def get_status(self) -> dict:
+        """모델별 로딩 상태 / 시간 / 메모리"""
+        return {
+            "device": str(self.device),
+            "models": {
+                name: self._stats.get(name, {"loaded": False})
+                for name in self.MODEL_NAMES
+            }
+        }
+
+# 전역 레지스트리 (프로세스당 하나)
+audio_model_registry = AudioModelRegistry()
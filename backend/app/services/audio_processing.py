@@ -1,202 +1,135 @@
-import librosa
-import numpy as np
-import torch
-from transformers import AutoModel, AutoTokenizer
-import os
-import tempfile
-from typing import Dict, List, Tuple
-
-# 음성 인식 라이브러리들을 안전하게 처리
-WHISPER_AVAILABLE = False
-SPEECH_RECOGNITION_AVAILABLE = False
-
-# Whisper 시도 (더 안전한 방법)
-try:
-    import platform
-    if platform.system() == "Windows":
-        # Windows에서는 Whisper를 완전히 건너뛰기
-        print("Windows 환경: Whisper 대신 SpeechRecognition을 사용합니다.")
-        WHISPER_AVAILABLE = False
-    else:
-        # Linux/Mac에서는 Whisper 사용
-        import whisper
-        WHISPER_AVAILABLE = True
-        print("Whisper 라이브러리가 사용 가능합니다.")
-except Exception as e:
-    print(f"Whisper 라이브러리 로딩 실패: {e}")
-    WHISPER_AVAILABLE = False
+import contextlib
 
-# SpeechRecognition 라이브러리 시도 (모든 OS에서 사용 가능)
-try:
-    import speech_recognition as sr
-    SPEECH_RECOGNITION_AVAILABLE = True
-    print("SpeechRecognition 라이브러리가 사용 가능합니다.")
-except Exception as e:
-    print(f"SpeechRecognition 라이브러리 로딩 실패: {e}")
-    SPEECH_RECOGNITION_AVAILABLE = False
+from typing import Dict, List, Tuple
 
-# Sentence-BERT 임포트를 더 안전하게 처리
-SENTENCE_BERT_AVAILABLE = False
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_BERT_AVAILABLE = True
-    print("Sentence-BERT 라이브러리가 사용 가능합니다.")
-except Exception as e:
-    print(f"Sentence-BERT 라이브러리 로딩 실패: {e}")
-    SENTENCE_BERT_AVAILABLE = False
+from app.services.audio_io import AudioClip, decode_audio, probe_audio_stream, TARGET_SAMPLE_RATE
+from app.core.config import VAD_ENABLED, AUDIO_SILENCE_DBFS
+from app.services.audio_features import extract_features
+from app.services.semantic_analysis import analyze_semantic_mismatch
+from app.services.audio_vad import detect_speech_regions, RegionMap, speech_ratio
+from app.services.deepvoice_scorer import Wav2Vec2WindowScorer
+from app.services.asr import get_asr_engine, transcribe_with_timeout
+from app.services.audio_models import audio_model_registry, SENTENCE_BERT_AVAILABLE
 
 class AudioProcessor:
-    def __init__(self):
-        """음성 분석을 위한 모델들 초기화"""
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        
-        # 모델들을 None으로 초기화
-        self.whisper_model = None
-        self.wav2vec2_model = None
-        self.wav2vec2_tokenizer = None
-        self.sentence_bert = None
+    def __init__(self, registry=None):
+        """음성 분석 (모델은 프로세스 전역 레지스트리에서 공유)"""
+        self.registry = registry or audio_model_registry
+        self.asr = None
     
     def load_models(self):
-        """메모리 효율적인 모델 로딩"""
-        try:
-            if self.whisper_model is None and WHISPER_AVAILABLE:
-                self.whisper_model = whisper.load_model("base")
-            
-            if self.wav2vec2_model is None:
-                self.wav2vec2_model = AutoModel.from_pretrained(
-                    "facebook/wav2vec2-base",
-                    dtype=torch.float16 if self.device.type == "cuda" else torch.float32
-                ).to(self.device)
-                self.wav2vec2_tokenizer = AutoTokenizer.from_pretrained("facebook/wav2vec2-base")
-            
-            if self.sentence_bert is None and SENTENCE_BERT_AVAILABLE:
-                self.sentence_bert = SentenceTransformer("nickprock/csr-multi-sentence-BERTino-cv")
-        except Exception:
-            pass
+        """레지스트리 모델 로딩 (이미 로드된 모델은 재사용)"""
+        self.registry.warm_up()
+        self.asr = get_asr_engine()
 
-    def extract_audio_from_video(self, video_path: str) -> str:
-        """비디오에서 오디오 추출"""
-        try:
-            # librosa로 비디오에서 오디오 추출
-            audio_data, sample_rate = librosa.load(video_path, sr=16000)
-            
-            # 임시 오디오 파일로 저장 (soundfile 사용)
-            temp_audio_path = os.path.join(tempfile.gettempdir(), f"temp_audio_{os.path.basename(video_path)}.wav")
-            
-            # soundfile을 사용하여 저장
-            import soundfile as sf
-            sf.write(temp_audio_path, audio_data, sample_rate)
-            
-            return temp_audio_path
-        except Exception:
-            # librosa.output.write_wav 대신 다른 방법 시도
-            try:
-                import soundfile as sf
-                audio_data, sample_rate = librosa.load(video_path, sr=16000)
-                temp_audio_path = os.path.join(tempfile.gettempdir(), f"temp_audio_{os.path.basename(video_path)}.wav")
-                sf.write(temp_audio_path, audio_data, sample_rate)
-                return temp_audio_path
-            except Exception:
-                return None
+    @property
+    def device(self):
+        return self.registry.device
 
-    def transcribe_audio(self, audio_path: str) -> str:
-        """음성을 텍스트로 변환 (다중 백업 시스템)"""
-        # 1. Whisper 사용 시도 (Linux/Mac에서만)
-        if WHISPER_AVAILABLE and self.whisper_model is not None:
-            try:
-                result = self.whisper_model.transcribe(audio_path)
-                return result["text"].strip()
-            except Exception as e:
-                print(f"Whisper 음성 인식 실패: {e}")
-        
-        # 2. SpeechRecognition 사용 시도
-        if SPEECH_RECOGNITION_AVAILABLE:
-            try:
-                import speech_recognition as sr
-                r = sr.Recognizer()
-                
-                # 오디오 파일을 WAV 형식으로 변환
-                with sr.AudioFile(audio_path) as source:
-                    audio = r.record(source)
-                
-                # Google 음성 인식 사용 (한국어)
-                text = r.recognize_google(audio, language='ko-KR')
-                return text
-            except Exception as e:
-                print(f"SpeechRecognition 음성 인식 실패: {e}")
-        
-        # 3. 기본 텍스트 반환 (음성 인식 실패 시)
-        return "음성 인식이 완료되었습니다. (텍스트 추출 실패)"
+    @property
+    def wav2vec2_model(self):
+        pair = self.registry.get("wav2vec2")
+        return pair[0] if pair else None
+
+    @property
+    def wav2vec2_feature_extractor(self):
+        pair = self.registry.get("wav2vec2")
+        return pair[1] if pair else None
+
+    @property
+    def sentence_bert(self):
+        return self.registry.get("sentence_bert")
 
-    def extract_audio_features(self, audio_path: str) -> Dict:
-        """librosa로 음성 특징 추출"""
+    def extract_audio_from_video(self, video_path: str) -> AudioClip:
+        """비디오에서 오디오를 한 번만 디코딩 (16kHz 모노, 메모리상 파형)"""
         try:
-            # 오디오 로드
-            y, sr = librosa.load(audio_path, sr=16000)
-            
-            # MFCC 특징 추출
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            
-            # 피치 추출
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_mean = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
-            
-            # 스펙트럼 중심
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)
-            spectral_centroid_mean = np.mean(spectral_centroids)
-            
-            # 제로 크로싱 비율
-            zcr = librosa.feature.zero_crossing_rate(y)
-            zcr_mean = np.mean(zcr)
-            
-            return {
-                "mfcc_mean": np.mean(mfccs, axis=1).tolist(),
-                "mfcc_std": np.std(mfccs, axis=1).tolist(),
-                "pitch_mean": float(pitch_mean),
-                "spectral_centroid_mean": float(spectral_centroid_mean),
-                "zero_crossing_rate_mean": float(zcr_mean),
-                "duration": len(y) / sr
+            return decode_audio(video_path, sample_rate=TARGET_SAMPLE_RATE)
+        except Exception as e:
+            print(f"오디오 추출 실패: {e}")
+            return None
+
+    def _as_clip(self, audio) -> AudioClip:
+        """AudioClip 또는 파일 경로를 AudioClip으로 변환"""
+        if isinstance(audio, AudioClip):
+            return audio
+        return decode_audio(audio, sample_rate=TARGET_SAMPLE_RATE)
+
+    def detect_speech(self, audio) -> List[Dict]:
+        """발화 구간 검출 (VAD 비활성화 시 전체 구간)"""
+        clip = self._as_clip(audio)
+        if not VAD_ENABLED:
+            return [{"start": 0.0, "end": round(clip.duration, 3)}] if clip.duration > 0 else []
+        return detect_speech_regions(clip)
+
+    def transcribe_segments(self, audio, regions: List[Dict] = None):
+        """
+        발화 구간만 음성 인식 (타임스탬프는 원본 시간축 유지)
+
+        Args:
+            audio: AudioClip 또는 파일 경로
+            regions: 발화 구간 (없으면 VAD로 검출)
+
+        Returns:
+            [{"start", "end", "text"}], 음성 인식 실패/시간 초과 시 None
+        """
+        clip = self._as_clip(audio)
+        regions = self.detect_speech(clip) if regions is None else regions
+        if not regions:
+            return []
+
+        # 발화 구간만 이어 붙인 파형에 로컬 ASR 엔진을 한 번 실행하고 세그먼트 시간을 원본으로 변환
+        asr = self.asr or get_asr_engine()
+        region_map = RegionMap(clip, regions)
+        segments = transcribe_with_timeout(asr, region_map.samples, clip.sample_rate)
+        if segments is None:
+            return None
+        return [
+            {
+                "start": region_map.to_original(segment["start"]),
+                "end": region_map.to_original(segment["end"]),
+                "text": segment["text"]
             }
-        except Exception:
+            for segment in segments
+        ]
+
+    def transcribe_audio(self, audio) -> str:
+        """음성을 텍스트로 변환 (로컬 ASR 엔진, 발화 구간만 인식)"""
+        segments = self.transcribe_segments(audio)
+        if segments is None:
+            # 기본 텍스트 반환 (음성 인식 실패 시)
+            return "음성 인식이 완료되었습니다. (텍스트 추출 실패)"
+        return " ".join(segment["text"] for segment in segments)
+
+    def extract_audio_features(self, audio) -> Dict:
+        """음성 특징 추출 (STFT 한 번으로 MFCC / 피치 / 스펙트럼 중심 / ZCR + 윈도우별 특징)"""
+        try:
+            return extract_features(self._as_clip(audio))
+        except Exception as e:
+            print(f"음성 특징 추출 실패: {e}")
             return {}
 
-    def detect_deepvoice_wav2vec2(self, audio_path: str) -> Dict:
+    def detect_deepvoice_wav2vec2(self, audio) -> Dict:
         """Wav2Vec2로 딥보이스 탐지"""
         if self.wav2vec2_model is None:
             return {"is_deepvoice": False, "confidence": 0.0, "feature_variance": 0.0, "error": "Wav2Vec2 모델이 로드되지 않았습니다."}
         
         try:
-            # 오디오 로드 및 전처리
-            y, sr = librosa.load(audio_path, sr=16000)
-            
-            # Wav2Vec2 입력 형태로 변환
-            inputs = self.wav2vec2_tokenizer(y, return_tensors="pt", padding=True, truncation=True, max_length=16000)
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # 모델 추론
-            with torch.no_grad():
-                outputs = self.wav2vec2_model(**inputs)
-                # 간단한 분류를 위한 특징 추출
-                features = outputs.last_hidden_state.mean(dim=1)
-                
-                # 더미 분류기 (실제로는 별도 훈련된 분류기가 필요)
-                # 여기서는 특징의 분산을 기반으로 간단한 판단
-                feature_variance = torch.var(features, dim=1).item()
-                
-                # 임계값 기반 판단 (실제로는 훈련된 모델 필요)
-                is_deepvoice = feature_variance > 0.1  # 임계값은 실험적으로 조정 필요
-                confidence = min(abs(feature_variance - 0.1) * 10, 1.0)
-                
-                return {
-                    "is_deepvoice": bool(is_deepvoice),
-                    "confidence": float(confidence),
-                    "feature_variance": float(feature_variance)
-                }
-        except Exception:
-            return {"is_deepvoice": False, "confidence": 0.0, "feature_variance": 0.0}
+            clip = self._as_clip(audio)
+            # 전체 파형을 겹치는 윈도우로 나누어 배치 추론 (윈도우별 점수 타임라인 포함)
+            scorer = Wav2Vec2WindowScorer(self.wav2vec2_model, self.wav2vec2_feature_extractor, self.device)
+            return scorer.score(clip)
+        except Exception as e:
+            print(f"Wav2Vec2 딥보이스 탐지 실패: {e}")
+            return {"is_deepvoice": False, "confidence": 0.0, "feature_variance": 0.0, "windows": []}
 
-    def analyze_speech_text_semantic_mismatch(self, audio_path: str, transcribed_text: str) -> Dict:
-        """음성과 텍스트 간 의미적 불일치 분석"""
+    def analyze_speech_text_semantic_mismatch(self, audio, transcribed_text: str,
+                                              segments: List[Dict] = None) -> Dict:
+        """
+        음성과 텍스트 간 의미적 불일치 분석
+
+        segments(발화 구간별 인식 결과)가 있으면 문장마다 원본 시간을 유지하여
+        문장 전환별 유사도(transitions)를 함께 반환한다.
+        """
         if not SENTENCE_BERT_AVAILABLE or self.sentence_bert is None:
             return {"semantic_mismatch": False, "confidence": 0.0, "similarity": 0.0, "error": "Sentence-BERT 모델이 사용할 수 없습니다."}
         
@@ -204,61 +137,79 @@ class AudioProcessor:
             if not transcribed_text:
                 return {"semantic_mismatch": False, "confidence": 0.0, "similarity": 0.0}
             
-            # 텍스트를 여러 구간으로 나누어 분석
-            sentences = transcribed_text.split('.')
-            sentences = [s.strip() for s in sentences if s.strip()]
-            
-            if len(sentences) < 2:
-                return {"semantic_mismatch": False, "confidence": 0.0, "similarity": 1.0}
-            
-            # 각 문장의 임베딩 생성
-            embeddings = self.sentence_bert.encode(sentences)
-            
-            # 문장 간 유사도 계산
-            similarities = []
-            for i in range(len(embeddings) - 1):
-                sim = np.dot(embeddings[i], embeddings[i + 1]) / (
-                    np.linalg.norm(embeddings[i]) * np.linalg.norm(embeddings[i + 1])
-                )
-                similarities.append(sim)
-            
-            avg_similarity = np.mean(similarities) if similarities else 1.0
-            
-            # 유사도가 낮으면 의미적 불일치 가능성
-            semantic_mismatch = avg_similarity < 0.7  # 임계값 조정 가능
-            confidence = abs(avg_similarity - 0.7) * 2  # 신뢰도 계산
-            
-            return {
-                "semantic_mismatch": bool(semantic_mismatch),
-                "confidence": float(min(confidence, 1.0)),
-                "similarity": float(avg_similarity),
-                "sentence_count": len(sentences)
-            }
-        except Exception:
+            # 문장 분리 / 임베딩 캐시 / 요청 간 배치 인코딩 / 벡터화 유사도
+            return analyze_semantic_mismatch(self.sentence_bert, transcribed_text, segments)
+        except Exception as e:
+            print(f"의미적 불일치 분석 실패: {e}")
             return {"semantic_mismatch": False, "confidence": 0.0, "similarity": 0.0}
 
-    def analyze_audio(self, video_path: str) -> Dict:
-        """전체 음성 분석 수행"""
+    def analyze_audio(self, video_path: str, timer=None) -> Dict:
+        """
+        전체 음성 분석 수행
+
+        Args:
+            video_path: 영상 파일 경로
+            timer: 단계별 소요 시간 기록 (analysis_pipeline.StageTimer, 선택)
+        """
+        stage = timer.stage if timer else (lambda name: contextlib.nullcontext())
         try:
-            # 모델들을 먼저 로드
-            self.load_models()
-            
-            # 1. 비디오에서 오디오 추출
-            audio_path = self.extract_audio_from_video(video_path)
-            if not audio_path:
-                return {"error": "오디오 추출 실패"}
-            
-            # 2. 음성을 텍스트로 변환
-            transcribed_text = self.transcribe_audio(audio_path)
-            
-            # 3. 음성 특징 추출
-            audio_features = self.extract_audio_features(audio_path)
+            # 0. 컨테이너 메타데이터로 오디오 트랙 확인 (모델 로딩 / 디코딩 전)
+            with stage("audio_probe"):
+                probe = probe_audio_stream(video_path)
+            if probe["has_audio"] is False:
+                print("오디오 트랙 없음: 음성 분석 생략")
+                return {"status": "no_audio", "message": "오디오 트랙이 없는 영상입니다.", "probe": probe}
+            
+            # 1. 비디오에서 오디오 추출 (한 번만 디코딩, 이후 단계는 같은 파형 공유)
+            with stage("audio_decode"):
+                clip = self.extract_audio_from_video(video_path)
+            if clip is None:
+                return {"status": "error", "error": "오디오 추출 실패", "probe": probe}
+            
+            # 거의 무음이면 모델 작업 없이 종료 (마이크 없는 화면 녹화 등)
+            level_dbfs = clip.rms_dbfs()
+            if clip.duration == 0 or level_dbfs < AUDIO_SILENCE_DBFS:
+                print(f"무음 오디오 ({level_dbfs:.1f} dBFS): 음성 분석 생략")
+                return {
+                    "status": "silent",
+                    "message": "오디오가 거의 무음입니다.",
+                    "rms_dbfs": round(level_dbfs, 2),
+                    "duration": clip.duration,
+                    "probe": probe
+                }
             
-            # 4. Wav2Vec2 딥보이스 탐지
-            deepvoice_result = self.detect_deepvoice_wav2vec2(audio_path)
+            # 모델 로드 (레지스트리에 이미 로드되어 있으면 즉시 반환)
+            with stage("audio_model_load"):
+                self.load_models()
             
-            # 5. 음성-텍스트 의미적 불일치 분석
-            semantic_result = self.analyze_speech_text_semantic_mismatch(audio_path, transcribed_text)
+            try:
+                # 2. 발화 구간 검출 후 해당 구간만 텍스트로 변환 (무음/배경음악 구간 제외)
+                with stage("audio_vad"):
+                    speech_regions = self.detect_speech(clip)
+                with stage("audio_transcribe"):
+                    transcript_segments = self.transcribe_segments(clip, speech_regions)
+                if transcript_segments is None:
+                    transcribed_text = "음성 인식이 완료되었습니다. (텍스트 추출 실패)"
+                    transcript_segments = []
+                else:
+                    transcribed_text = " ".join(segment["text"] for segment in transcript_segments)
+                
+                # 3. 음성 특징 추출
+                with stage("audio_features"):
+                    audio_features = self.extract_audio_features(clip)
+                
+                # 4. Wav2Vec2 딥보이스 탐지
+                with stage("audio_deepvoice"):
+                    deepvoice_result = self.detect_deepvoice_wav2vec2(clip)
+                
+                # 5. 음성-텍스트 의미적 불일치 분석
+                with stage("audio_semantic"):
+                    semantic_result = self.analyze_speech_text_semantic_mismatch(
+                        clip, transcribed_text, segments=transcript_segments or None
+                    )
+            finally:
+                # 파일이 필요했던 단계가 있으면 임시 WAV 정리
+                clip.cleanup()
             
             # 6. 최종 결과 종합
             # 두 방식 모두에서 위조 탐지되면 최종적으로 위조로 판단
@@ -268,7 +219,12 @@ class AudioProcessor:
             avg_confidence = (deepvoice_result.get("confidence", 0.0) + semantic_result.get("confidence", 0.0)) / 2
             
             result = {
+                "status": "completed",
+                "rms_dbfs": round(level_dbfs, 2),
                 "transcribed_text": transcribed_text,
+                "transcript_segments": transcript_segments,
+                "speech_regions": speech_regions,
+                "speech_ratio": speech_ratio(speech_regions, clip.duration),
                 "audio_features": audio_features,
                 "deepvoice_detection": deepvoice_result,
                 "semantic_analysis": semantic_result,
@@ -279,18 +235,14 @@ class AudioProcessor:
                 }
             }
             
-            # 임시 파일 정리
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-            
             print(f"음성 분석 완료: {result['final_result']['label']} (신뢰도: {avg_confidence:.3f})")
             return result
             
         except Exception as e:
             print(f"음성 분석 실패: {e}")
-            return {"error": f"음성 분석 실패: {str(e)}"}
+            return {"status": "error", "error": f"음성 분석 실패: {str(e)}"}
 
-# 전역 인스턴스
+# 전역 인스턴스 (엔드포인트가 공유, 요청마다 생성하지 않음)
 audio_processor = AudioProcessor()
 
 def analyze_audio_from_video(video_path: str) -> Dict:
@@ -0,0 +1,143 @@
+"""
+음성 구간 검출 (VAD)
+
+에너지 기반 VAD로 발화 구간만 찾아 음성 인식 / 의미 분석에 전달한다.
+- 프레임 에너지가 잡음 바닥(하위 백분위) + 여유값보다 크고
+- 에너지의 대부분이 음성 대역(300~3400Hz)에 있으며
+- 구간 내 에너지 변화(음절 단위 강약)가 충분한 경우만 발화로 판단 (지속음/배경음악 제외)
+
+검출된 구간은 원본 시간축(초)으로 반환하고, 음성 인식은 구간들을 이어 붙인 파형에
+한 번만 실행한 뒤 타임스탬프를 원본 시간축으로 되돌린다 (RegionMap).
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.core.config import (
+    VAD_FRAME_MS, VAD_HOP_MS, VAD_ENERGY_MARGIN_DB, VAD_MIN_ENERGY_DB,
+    VAD_SPEECH_BAND_RATIO, VAD_MIN_ENERGY_STD_DB,
+    VAD_MIN_SPEECH_SEC, VAD_MERGE_GAP_SEC, VAD_PAD_SEC, VAD_MAX_REGION_SEC
+)
+from app.services.audio_io import AudioClip
+
+# 한 번에 FFT할 프레임 수 (긴 파일에서도 메모리 상한 유지)
+_FFT_CHUNK_FRAMES = 4096
+
+def _frame_features(samples: np.ndarray, sample_rate: int, frame: int, hop: int):
+    """프레임별 에너지(dB)와 음성 대역 에너지 비율"""
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame)[::hop]
+    window = np.hanning(frame).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame, d=1.0 / sample_rate)
+    band = (freqs >= 300) & (freqs <= 3400)
+
+    energy_db = np.empty(len(frames), dtype=np.float32)
+    band_ratio = np.empty(len(frames), dtype=np.float32)
+    for begin in range(0, len(frames), _FFT_CHUNK_FRAMES):
+        chunk = frames[begin:begin + _FFT_CHUNK_FRAMES]
+        power = np.abs(np.fft.rfft(chunk * window, axis=1)) ** 2
+        total = power.sum(axis=1) + 1e-10
+        band_ratio[begin:begin + len(chunk)] = power[:, band].sum(axis=1) / total
+        rms = np.sqrt(np.mean(chunk.astype(np.float32) ** 2, axis=1))
+        energy_db[begin:begin + len(chunk)] = 20 * np.log10(rms + 1e-10)
+    return energy_db, band_ratio
+
+def _mask_to_runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """불리언 프레임 마스크 -> 연속 구간 [(시작 프레임, 끝 프레임)]"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[::2], edges[1::2]))
+
+def detect_speech_regions(clip: AudioClip) -> List[Dict]:
+    """
+    발화 구간 검출
+
+    Returns:
+        [{"start": 초, "end": 초}] (원본 시간축, 시간순)
+    """
+    sample_rate = clip.sample_rate
+    frame = int(sample_rate * VAD_FRAME_MS / 1000)
+    hop = int(sample_rate * VAD_HOP_MS / 1000)
+    if len(clip.samples) < frame:
+        return []
+
+    energy_db, band_ratio = _frame_features(clip.samples, sample_rate, frame, hop)
+
+    # 잡음 바닥 기준 적응형 임계값 (완전 무음 파일은 절대 하한으로 걸러짐)
+    noise_floor = float(np.percentile(energy_db, 20))
+    threshold = max(noise_floor + VAD_ENERGY_MARGIN_DB, VAD_MIN_ENERGY_DB)
+    mask = (energy_db > threshold) & (band_ratio > VAD_SPEECH_BAND_RATIO)
+
+    hop_sec = hop / sample_rate
+    frame_sec = frame / sample_rate
+    merge_gap = int(VAD_MERGE_GAP_SEC / hop_sec)
+
+    # 짧은 공백 병합 (프레임 인덱스 단위)
+    runs = []
+    for start, end in _mask_to_runs(mask):
+        if runs and start - runs[-1][1] <= merge_gap:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+
+    speech = []
+    for start, end in runs:
+        start_sec, end_sec = float(start * hop_sec), float((end - 1) * hop_sec + frame_sec)
+        if end_sec - start_sec < VAD_MIN_SPEECH_SEC:
+            continue
+        # 음절 단위 강약이 없는 지속음(배경음악 등) 제외
+        if float(np.std(energy_db[start:end])) < VAD_MIN_ENERGY_STD_DB:
+            continue
+
+        start_sec = max(0.0, start_sec - VAD_PAD_SEC)
+        end_sec = min(clip.duration, end_sec + VAD_PAD_SEC)
+        # 음성 인식 입력 길이 제한을 넘는 구간은 분할
+        while end_sec - start_sec > VAD_MAX_REGION_SEC:
+            speech.append({"start": round(start_sec, 3), "end": round(start_sec + VAD_MAX_REGION_SEC, 3)})
+            start_sec += VAD_MAX_REGION_SEC
+        speech.append({"start": round(start_sec, 3), "end": round(end_sec, 3)})
+
+    # 패딩으로 겹친 구간 정리
+    merged = []
+    for region in speech:
+        if merged and region["start"] < merged[-1]["end"]:
+            region = {"start": merged[-1]["end"], "end": region["end"]}
+            if region["end"] <= region["start"]:
+                continue
+        merged.append(region)
+    return merged
+
+class RegionMap:
+    """발화 구간만 이어 붙인 파형과 원본 시간축 사이의 변환"""
+
+    def __init__(self, clip: AudioClip, regions: List[Dict], gap_sec: float = 0.1):
+        self.sample_rate = clip.sample_rate
+        self.regions = regions
+        gap = np.zeros(int(gap_sec * clip.sample_rate), dtype=np.float32)
+
+        pieces = []
+        self._offsets = []  # (이어 붙인 파형에서의 시작 초, 원본 시작 초, 길이 초)
+        position = 0.0
+        for region in regions:
+            samples = clip.slice(region["start"], region["end"])
+            length = len(samples) / clip.sample_rate
+            self._offsets.append((position, region["start"], length))
+            pieces.extend([samples, gap])
+            position += length + gap_sec
+        self.samples = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def to_original(self, t: float) -> float:
+        """이어 붙인 파형의 시간 -> 원본 시간"""
+        for compact_start, original_start, length in reversed(self._offsets):
+            if t >= compact_start:
+                return round(original_start + min(t - compact_start, length), 3)
+        return self._offsets[0][1] if self._offsets else 0.0
+
+def speech_ratio(regions: List[Dict], duration: float) -> float:
+    """전체 길이 대비 발화 구간 비율"""
+    if duration <= 0:
+        return 0.0
+    return round(sum(r["end"] - r["start"] for r in regions) / duration, 4)
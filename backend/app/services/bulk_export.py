@@ -0,0 +1,228 @@
+"""
+여러 분석 결과의 데이터셋 일괄 내보내기
+
+- 필터(사용자 / 기간 / 판정)에 맞는 분석 결과를 결과 저장소에서 커서(keyset)로 페이지 조회
+- 페이지마다 프레임별 점수 부가 기록을 get_many로 한 번에 읽어 프레임 단위 JSONL 행 생성
+- 행은 샤드(part-00000.jsonl ...)로 나누며, 샤드는 분석 단위 경계에서 닫혀
+  샤드마다 "이 샤드까지 내보낸 마지막 분석" 커서가 체크포인트가 된다
+- 샤드를 이어 붙인 JSONL(샤드마다 체크포인트 줄), 또는 tar / zip 스트림(샤드 + 체크포인트 파일)으로 전송
+
+엔드포인트(/dataset/bulk)와 CLI(export_dataset.py)가 같은 함수를 사용한다.
+"""
+import io
+import json
+import tarfile
+import time
+import zipfile
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import BULK_EXPORT_SHARD_ROWS, BULK_EXPORT_PAGE_SIZE
+from app.services.frame_columns import FrameColumns
+from app.services.result_store import get_result_store, ANALYSIS_COLLECTION, FRAME_COLLECTION, QUERY_ORDER_FIELD
+from app.utils.helpers import get_segment_frames, encode_cursor, decode_cursor
+
+def iter_dataset_rows(analysis_result: Dict[str, Any], frame_columns: FrameColumns) -> Iterator[Dict[str, Any]]:
+    """
+    분석 결과 하나의 데이터셋 행 (프레임 단위, 프레임 정보가 없는 구간은 구간 단위)
+    """
+    video_id = analysis_result.get("videoId", "")
+    timeline = analysis_result.get("timeline", [])
+
+    for segment in timeline:
+        result = segment.get("result", "UNKNOWN")
+        confidence = segment.get("confidence", 0.0)
+        start = segment.get("start", 0.0)
+        end = segment.get("end", 0.0)
+
+        # 프레임 정보 (구간의 프레임 인덱스 범위로 부가 기록에서 참조)
+        frames = get_segment_frames(segment, frame_columns)
+        if len(frames):
+            # 열 단위로 한 번에 변환 (구간 판정과 다른 쪽 확률은 0)
+            zeros = [0.0] * len(frames)
+            fake_confidence = frames.rounded("fake_confidence") if result == "FAKE" else zeros
+            real_confidence = frames.rounded("real_confidence") if result == "REAL" else zeros
+            for i, (time_sec, label, frame_confidence, fake, real) in enumerate(zip(
+                frames.time.tolist(),
+                frames.label_names(),
+                frames.rounded("confidence"),
+                fake_confidence,
+                real_confidence
+            )):
+                row = {
+                    "video_id": video_id,
+                    "time": time_sec,
+                    "label": label,
+                    "confidence": frame_confidence,
+                    "fake_confidence": fake,
+                    "real_confidence": real,
+                    "segment_id": segment.get("segment_id", 0),
+                    "segment_start": start,
+                    "segment_end": end,
+                    "segment_label": result,
+                }
+                # 모델별 점수 (앙상블 프레임의 meta.models)
+                models = frames.extras.get(i, {}).get("meta", {}).get("models")
+                if models:
+                    row["models"] = models
+                yield row
+        else:
+            # 프레임 정보가 없으면 세그먼트 단위로
+            yield {
+                "video_id": video_id,
+                "time_start": start,
+                "time_end": end,
+                "label": result,
+                "confidence": confidence,
+                "segment_id": segment.get("segment_id", 0),
+                "frame_count": segment.get("frame_count", 0),
+            }
+
+async def _load_frame_columns(page: List[Tuple[str, Dict]]) -> Dict[str, FrameColumns]:
+    """페이지에 속한 분석들의 프레임별 점수 (부가 기록은 한 번에 조회)"""
+    references = {result_id: result.get("frame_record") for result_id, result in page}
+    record_ids = [reference["id"] for reference in references.values() if reference]
+    records = await get_result_store(FRAME_COLLECTION).get_many(record_ids) if record_ids else {}
+
+    columns = {}
+    for result_id, result in page:
+        reference = references[result_id]
+        if reference:
+            record = records.get(reference["id"])
+            columns[result_id] = FrameColumns.from_record(record) if record else FrameColumns.empty()
+        else:
+            columns[result_id] = FrameColumns.from_rows(result.get("raw_frame_results", []))
+    return columns
+
+async def iter_export_shards(filters: Dict[str, Optional[str]], cursor: Optional[str] = None,
+                             start_shard: int = 0, shard_rows: int = BULK_EXPORT_SHARD_ROWS,
+                             page_size: int = BULK_EXPORT_PAGE_SIZE) -> AsyncIterator[Dict]:
+    """
+    필터에 맞는 분석 결과를 JSONL 샤드로 변환
+
+    Args:
+        filters: {"user_id", "label", "since", "until"} (None이면 필터 없음)
+        cursor: 이어서 내보낼 위치 (이전 체크포인트의 cursor)
+        start_shard: 첫 샤드 번호 (이전 체크포인트의 next_shard)
+        shard_rows: 샤드당 행 수 (분석 단위로 닫히므로 약간 넘을 수 있음)
+        page_size: 결과 저장소 페이지 크기
+
+    Yields:
+        {"name", "data"(bytes), "rows", "analyses", "checkpoint"}
+    """
+    store = get_result_store(ANALYSIS_COLLECTION)
+    after = decode_cursor(cursor) if cursor else None
+    shard_index = start_shard
+    lines = []
+    analyses = 0
+
+    def make_shard():
+        checkpoint = {
+            "cursor": encode_cursor(after),
+            "next_shard": shard_index + 1,
+            "filters": filters,
+            "rows": len(lines),
+            "analyses": analyses,
+            "created_at": time.time()
+        }
+        return {
+            "name": f"part-{shard_index:05d}.jsonl",
+            "data": "".join(lines).encode("utf-8"),
+            "rows": len(lines),
+            "analyses": analyses,
+            "checkpoint": checkpoint
+        }
+
+    while True:
+        page = await store.query(**filters, after=after, limit=page_size)
+        if not page:
+            break
+        frame_columns = await _load_frame_columns(page)
+
+        for result_id, result in page:
+            after = (result.get(QUERY_ORDER_FIELD) or "", result_id)
+            # 완료된 분석만 (오류 / 신고 문서는 타임라인이 없음)
+            if not result.get("timeline"):
+                continue
+            lines.extend(
+                json.dumps(row, ensure_ascii=False) + "\n"
+                for row in iter_dataset_rows(result, frame_columns[result_id])
+            )
+            analyses += 1
+            if len(lines) >= shard_rows:
+                yield make_shard()
+                shard_index += 1
+                lines = []
+                analyses = 0
+
+        if len(page) < page_size:
+            break
+
+    if lines:
+        yield make_shard()
+
+class _StreamBuffer:
+    """tarfile / zipfile 스트림 출력 대상 (쓴 바이트를 모아 두었다가 take()로 꺼냄)"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _checkpoint_bytes(shard: Dict) -> bytes:
+    return json.dumps(shard["checkpoint"], ensure_ascii=False, indent=2).encode("utf-8")
+
+# JSONL 스트림의 체크포인트 줄 키 (데이터 행에는 없는 키)
+JSONL_CHECKPOINT_KEY = "_checkpoint"
+
+async def iter_jsonl_stream(shards: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """
+    샤드를 이어 붙인 JSONL 스트림
+
+    샤드마다 데이터 행 뒤에 {"_checkpoint": {...}} 한 줄을 붙인다.
+    중단되면 마지막으로 받은 체크포인트 줄 이후의 행은 버리고 그 cursor / next_shard로 이어서 받는다.
+    """
+    async for shard in shards:
+        checkpoint = json.dumps({JSONL_CHECKPOINT_KEY: shard["checkpoint"]}, ensure_ascii=False)
+        yield shard["data"] + checkpoint.encode("utf-8") + b"\n"
+
+async def iter_tar_stream(shards: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """샤드마다 part-NNNNN.jsonl + checkpoints/part-NNNNN.json을 담은 tar 스트림"""
+    buffer = _StreamBuffer()
+    archive = tarfile.open(fileobj=buffer, mode="w|")
+    async for shard in shards:
+        for name, data in ((shard["name"], shard["data"]),
+                           (f"checkpoints/{shard['name'][:-len('.jsonl')]}.json", _checkpoint_bytes(shard))):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            archive.addfile(info, io.BytesIO(data))
+        yield buffer.take()
+    archive.close()
+    yield buffer.take()
+
+async def iter_zip_stream(shards: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """tar 스트림과 같은 구성의 zip 스트림 (JSONL은 deflate 압축)"""
+    buffer = _StreamBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+    async for shard in shards:
+        archive.writestr(shard["name"], shard["data"])
+        archive.writestr(f"checkpoints/{shard['name'][:-len('.jsonl')]}.json", _checkpoint_bytes(shard))
+        yield buffer.take()
+    archive.close()
+    yield buffer.take()
+
+STREAM_FORMATS = {
+    "jsonl": (iter_jsonl_stream, "application/x-ndjson", "jsonl"),
+    "tar": (iter_tar_stream, "application/x-tar", "tar"),
+    "zip": (iter_zip_stream, "application/zip", "zip")
+}
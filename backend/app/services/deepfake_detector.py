@@ -1,50 +1,25 @@
-from transformers import AutoImageProcessor, AutoModelForImageClassification
-from PIL import Image
-import torch
+"""
+HuggingFace ViT 딥페이크 탐지 백엔드
 
-# GPU 사용 여부 확인
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+- 모델은 첫 예측 시점에 로컬 스냅샷 디렉토리에서 로딩 (네트워크 접근 없음)
+- CPU 환경에서는 model2가 model1과 같은 객체이므로 forward를 한 번만 수행
+- processor(images=[...])로 여러 이미지를 한 번에 추론
+"""
+from pathlib import Path
+from typing import Dict, List
+import threading
+import time
+import random
 
-# 모델 로딩을 지연시키기 위해 None으로 초기화
-processor1 = None
-model1 = None
-processor2 = None
-model2 = None
+from PIL import Image
+import torch
 
-def load_models():
-    """모델들을 필요할 때만 로딩 (메모리 효율적)"""
-    global processor1, model1, processor2, model2
-    
-    if processor1 is None:
-        print("딥페이크 탐지 모델들을 로딩 중...")
-        try:
-            # 메모리 효율적인 로딩
-            processor1 = AutoImageProcessor.from_pretrained("prithivMLmods/Deep-Fake-Detector-v2-Model")
-            model1 = AutoModelForImageClassification.from_pretrained(
-                "prithivMLmods/Deep-Fake-Detector-v2-Model",
-                torch_dtype=torch.float16 if device.type == "cuda" else torch.float32,
-                low_cpu_mem_usage=True  # CPU 메모리 사용량 최적화
-            ).to(device)
-            
-            # CPU에서는 하나의 모델만 사용 (메모리 절약)
-            if device.type == "cpu":
-                print("CPU 환경: 하나의 모델만 사용하여 메모리 절약")
-                processor2 = processor1
-                model2 = model1
-            else:
-                processor2 = AutoImageProcessor.from_pretrained("google/vit-base-patch16-224-in21k")
-                model2 = AutoModelForImageClassification.from_pretrained(
-                    "google/vit-base-patch16-224-in21k",
-                    torch_dtype=torch.float16,
-                    low_cpu_mem_usage=True
-                ).to(device)
-            
-            print("모델 로딩 완료!")
-        except Exception as e:
-            print(f"모델 로딩 실패: {e}")
-            # 기본값 설정
-            processor1 = processor2 = None
-            model1 = model2 = None
+from app.core.config import (
+    VIT_DETECTOR_MODEL_ID, VIT_DETECTOR_SNAPSHOT,
+    VIT_SECONDARY_MODEL_ID, VIT_SECONDARY_SNAPSHOT,
+    VIT_ALLOW_DOWNLOAD
+)
+from app.services.weight_loader import attach_hf_mmap_weights
 
 def map_label(label: str):
     lower = label.lower()
@@ -54,93 +29,222 @@ def map_label(label: str):
     elif label in ["1", "LABEL_1"]: return "FAKE"
     return "REAL"
 
+class ViTDetectorBackend:
+    """HuggingFace ViT 딥페이크 탐지 백엔드 (지연 로딩)"""
+
+    name = "vit"
+    # 프레임당 예상 추론 비용 (ms, 앙상블 엔진 스케줄링용 초기값)
+    cost_per_frame_ms = 150.0
+
+    def __init__(self, device: torch.device = None):
+        self.device = device or torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.processor1 = None
+        self.model1 = None
+        self.processor2 = None
+        self.model2 = None
+        self.loading_lock = threading.Lock()
+        self.model_loaded = False
+
+    def _resolve_source(self, model_id: str, snapshot_dir: str) -> str:
+        """로컬 스냅샷 경로 결정 (없으면 다운로드 허용 시에만 모델 ID 사용)"""
+        if Path(snapshot_dir).is_dir():
+            return snapshot_dir
+        if VIT_ALLOW_DOWNLOAD:
+            print(f"[ViT] 로컬 스냅샷 없음, HuggingFace Hub에서 다운로드: {model_id}")
+            return model_id
+        raise FileNotFoundError(
+            f"ViT 모델 스냅샷을 찾을 수 없습니다: {snapshot_dir}\n"
+            f"다운로드: huggingface-cli download {model_id} --local-dir {snapshot_dir}"
+        )
+
+    def _load_pair(self, model_id: str, snapshot_dir: str, dtype: torch.dtype):
+        """processor + model 한 쌍 로드"""
+        from transformers import AutoImageProcessor, AutoModelForImageClassification
+
+        source = self._resolve_source(model_id, snapshot_dir)
+        local_only = source == snapshot_dir
+        processor = AutoImageProcessor.from_pretrained(source, local_files_only=local_only)
+        model = AutoModelForImageClassification.from_pretrained(
+            source,
+            torch_dtype=dtype,
+            low_cpu_mem_usage=True,  # CPU 메모리 사용량 최적화
+            local_files_only=local_only
+        ).to(self.device)
+        # CPU에서는 메모리 매핑 가중치로 교체하여 워커 프로세스 간 공유
+        if local_only and self.device.type == "cpu" and attach_hf_mmap_weights(model, snapshot_dir):
+            print(f"[ViT] 메모리 매핑 가중치 사용: {snapshot_dir}")
+        model.eval()
+        return processor, model
+
+    def load_model(self):
+        """모델 로드 (스레드 안전, 한 번만 로드)"""
+        if self.model_loaded:
+            return True
+
+        with self.loading_lock:
+            if self.model_loaded:
+                return True
+
+            try:
+                print("[ViT] 딥페이크 탐지 모델 로딩 중...")
+                start_time = time.time()
+                dtype = torch.float16 if self.device.type == "cuda" else torch.float32
+
+                self.processor1, self.model1 = self._load_pair(
+                    VIT_DETECTOR_MODEL_ID, VIT_DETECTOR_SNAPSHOT, dtype
+                )
+
+                # CPU에서는 하나의 모델만 사용 (메모리 절약)
+                if self.device.type == "cpu":
+                    print("[ViT] CPU 환경: 하나의 모델만 사용하여 메모리 절약")
+                    self.processor2 = self.processor1
+                    self.model2 = self.model1
+                else:
+                    self.processor2, self.model2 = self._load_pair(
+                        VIT_SECONDARY_MODEL_ID, VIT_SECONDARY_SNAPSHOT, dtype
+                    )
+
+                print(f"[ViT] 모델 로딩 완료! (소요시간: {time.time() - start_time:.2f}초)")
+                self.model_loaded = True
+                return True
+            except Exception as e:
+                print(f"[ViT] 모델 로딩 실패: {e}")
+                self.processor1 = self.processor2 = None
+                self.model1 = self.model2 = None
+                self.model_loaded = False
+                return False
+
+    def _forward(self, processor, model, images: List[Image.Image]) -> torch.Tensor:
+        """배치 forward (softmax 확률 반환)"""
+        inputs = processor(images=images, return_tensors="pt").to(self.device)
+        with torch.inference_mode():
+            outputs = model(**inputs)
+            return torch.nn.functional.softmax(outputs.logits.float(), dim=-1)
+
+    @staticmethod
+    def _summarize(probs_row: torch.Tensor, id2label: Dict) -> Dict:
+        """단일 이미지 확률 -> 라벨 / confidence / FAKE·REAL 확률"""
+        conf, pred = torch.max(probs_row, dim=0)
+        fake_prob = 0.0
+        real_prob = 0.0
+        for idx, class_label in id2label.items():
+            mapped = map_label(class_label)
+            prob = probs_row[idx].item()
+            if mapped == "FAKE":
+                fake_prob += prob
+            elif mapped == "REAL":
+                real_prob += prob
+        return {
+            "label": map_label(id2label[pred.item()]),
+            "confidence": conf.item(),
+            "fake_prob": fake_prob,
+            "real_prob": real_prob
+        }
+
+    @staticmethod
+    def _combine(m1: Dict, m2: Dict) -> Dict:
+        """두 모델 결과 앙상블 (confidence 가중 평균)"""
+        label1, label2 = m1["label"], m2["label"]
+
+        # 디버깅: 각 모델의 확률 확인 (10% 확률로만 출력, 너무 많은 로그 방지)
+        if random.random() < 0.1:
+            print(f"[predict_image] 모델1 - fake_prob1: {m1['fake_prob']:.4f}, real_prob1: {m1['real_prob']:.4f}, label1: {label1}")
+            print(f"[predict_image] 모델2 - fake_prob2: {m2['fake_prob']:.4f}, real_prob2: {m2['real_prob']:.4f}, label2: {label2}")
+
+        # 각 모델의 confidence를 가중치로 사용하여 더 정확한 모델에 더 높은 가중치 부여
+        weight1 = m1["confidence"]
+        weight2 = m2["confidence"]
+        total_weight = weight1 + weight2
+
+        if total_weight > 0:
+            fake_confidence = (m1["fake_prob"] * weight1 + m2["fake_prob"] * weight2) / total_weight
+            real_confidence = (m1["real_prob"] * weight1 + m2["real_prob"] * weight2) / total_weight
+        else:
+            fake_confidence = (m1["fake_prob"] + m2["fake_prob"]) / 2.0
+            real_confidence = (m1["real_prob"] + m2["real_prob"]) / 2.0
+
+        # 앙상블 로직: 더 공격적인 FAKE 탐지 (fake_confidence가 0.3 이상이면 FAKE)
+        if fake_confidence >= 0.3 or (label1 == "FAKE" and label2 == "FAKE"):
+            final_label = "FAKE"
+        elif fake_confidence >= 0.25 and (label1 == "FAKE" or label2 == "FAKE"):
+            final_label = "FAKE"
+        elif fake_confidence >= 0.2 and (label1 == "FAKE" or label2 == "FAKE"):
+            final_label = "FAKE"
+        else:
+            final_label = "REAL"
+
+        return {
+            "model1": {"label": label1, "confidence": round(m1["confidence"], 4)},
+            "model2": {"label": label2, "confidence": round(m2["confidence"], 4)},
+            "ensemble_result": final_label,
+            "confidence": round((m1["confidence"] + m2["confidence"]) / 2, 4),
+            "fake_confidence": round(fake_confidence, 4),
+            "real_confidence": round(real_confidence, 4)
+        }
+
+    def _infer_models(self, images: List[Image.Image]) -> List[tuple]:
+        """이미지별 (모델1 요약, 모델2 요약) 리스트"""
+        probs1 = self._forward(self.processor1, self.model1, images)
+        # CPU 환경에서는 model2가 model1과 같은 객체이므로 중복 forward 생략
+        if self.model2 is self.model1 and self.processor2 is self.processor1:
+            probs2 = probs1
+        else:
+            probs2 = self._forward(self.processor2, self.model2, images)
+
+        summaries = []
+        for i in range(len(images)):
+            m1 = self._summarize(probs1[i], self.model1.config.id2label)
+            m2 = m1 if probs2 is probs1 else self._summarize(probs2[i], self.model2.config.id2label)
+            summaries.append((m1, m2))
+        return summaries
+
+    def load(self):
+        """앙상블 엔진 인터페이스: 모델 로드"""
+        return self.load_model()
+
+    def estimate_cost(self, batch_size: int) -> float:
+        """앙상블 엔진 인터페이스: 배치 추론 예상 비용 (ms)"""
+        return self.cost_per_frame_ms * batch_size
+
+    def preprocess_batch(self, images: list, face_crop: bool = True):
+        """앙상블 엔진 인터페이스: RGB 배열 -> PIL 이미지 (전처리는 processor가 수행)"""
+        return [Image.fromarray(image) for image in images], None
+
+    def infer_batch(self, batch: List[Image.Image]) -> List[float]:
+        """앙상블 엔진 인터페이스: 배치 추론 (프레임별 FAKE 확률 리스트)"""
+        return [self._combine(m1, m2)["fake_confidence"] for m1, m2 in self._infer_models(batch)]
+
+    def predict_batch(self, image_paths: List[str]) -> List[Dict]:
+        """
+        여러 이미지 배치 예측
+
+        Args:
+            image_paths: 이미지 파일 경로 리스트
+
+        Returns:
+            이미지별 예측 결과 리스트 (입력 순서 유지)
+        """
+        if not image_paths:
+            return []
+        if not self.load_model():
+            return [{"error": "모델 로딩 실패"} for _ in image_paths]
+
+        images = [Image.open(path).convert("RGB") for path in image_paths]
+        return [self._combine(m1, m2) for m1, m2 in self._infer_models(images)]
+
+    def predict(self, image_path: str) -> Dict:
+        """단일 이미지 예측"""
+        return self.predict_batch([image_path])[0]
+
+# 전역 인스턴스 (첫 예측 시점에 모델 로딩)
+vit_backend = ViTDetectorBackend()
+
+def load_models():
+    """모델들을 필요할 때만 로딩 (기존 함수와의 호환성 유지)"""
+    return vit_backend.load_model()
+
 def predict_image(image_path: str):
-    # 모델이 로드되지 않았다면 먼저 로드
-    load_models()
-    
-    image = Image.open(image_path).convert("RGB")
-
-    # 모델1
-    inputs1 = processor1(images=image, return_tensors="pt").to(device)
-    with torch.no_grad():
-        outputs1 = model1(**inputs1)
-        probs1 = torch.nn.functional.softmax(outputs1.logits, dim=-1)
-        conf1, pred1 = torch.max(probs1, dim=1)
-    label1 = map_label(model1.config.id2label[pred1.item()])
-
-    # 모델1의 FAKE/REAL 확률 추출
-    fake_prob1 = 0.0
-    real_prob1 = 0.0
-    for idx, class_label in model1.config.id2label.items():
-        mapped = map_label(class_label)
-        prob = probs1[0][idx].item()
-        if mapped == "FAKE":
-            fake_prob1 += prob
-        elif mapped == "REAL":
-            real_prob1 += prob
-
-    # 모델2
-    inputs2 = processor2(images=image, return_tensors="pt").to(device)
-    with torch.no_grad():
-        outputs2 = model2(**inputs2)
-        probs2 = torch.nn.functional.softmax(outputs2.logits, dim=-1)
-        conf2, pred2 = torch.max(probs2, dim=1)
-    label2 = map_label(model2.config.id2label[pred2.item()])
-
-    # 모델2의 FAKE/REAL 확률 추출
-    fake_prob2 = 0.0
-    real_prob2 = 0.0
-    for idx, class_label in model2.config.id2label.items():
-        mapped = map_label(class_label)
-        prob = probs2[0][idx].item()
-        if mapped == "FAKE":
-            fake_prob2 += prob
-        elif mapped == "REAL":
-            real_prob2 += prob
-
-    # 디버깅: 각 모델의 확률 확인 (처음 몇 번만 출력)
-    import random
-    if random.random() < 0.1:  # 10% 확률로만 출력 (너무 많은 로그 방지)
-        print(f"[predict_image] 모델1 - fake_prob1: {fake_prob1:.4f}, real_prob1: {real_prob1:.4f}, label1: {label1}")
-        print(f"[predict_image] 모델2 - fake_prob2: {fake_prob2:.4f}, real_prob2: {real_prob2:.4f}, label2: {label2}")
-    
-    # 앙상블: 두 모델의 FAKE/REAL 확률 가중 평균 (confidence 기반)
-    # 각 모델의 confidence를 가중치로 사용하여 더 정확한 모델에 더 높은 가중치 부여
-    weight1 = conf1.item()
-    weight2 = conf2.item()
-    total_weight = weight1 + weight2
-    
-    if total_weight > 0:
-        fake_confidence = (fake_prob1 * weight1 + fake_prob2 * weight2) / total_weight
-        real_confidence = (real_prob1 * weight1 + real_prob2 * weight2) / total_weight
-    else:
-        fake_confidence = (fake_prob1 + fake_prob2) / 2.0
-        real_confidence = (real_prob1 + real_prob2) / 2.0
-    
-    # 디버깅: 계산된 fake_confidence 확인
-    if random.random() < 0.1:  # 10% 확률로만 출력
-        print(f"[predict_image] 계산된 fake_confidence: {fake_confidence:.4f}, real_confidence: {real_confidence:.4f}")
-
-    # 앙상블 로직 개선: 더 공격적인 FAKE 탐지 (실제 딥페이크를 더 잘 탐지)
-    # fake_confidence가 0.3 이상이면 FAKE로 판정 (더 낮은 임계값)
-    if fake_confidence >= 0.3 or (label1 == "FAKE" and label2 == "FAKE"):
-        final_label = "FAKE"
-    elif fake_confidence >= 0.25 and (label1 == "FAKE" or label2 == "FAKE"):  # 한 모델만 FAKE이지만 confidence가 어느 정도 있으면 FAKE
-        final_label = "FAKE"
-    elif fake_confidence >= 0.2 and label1 == "FAKE":  # 한 모델만 FAKE이지만 낮은 confidence도 허용
-        final_label = "FAKE"
-    elif fake_confidence >= 0.2 and label2 == "FAKE":
-        final_label = "FAKE"
-    else:
-        final_label = "REAL"
-    
-    avg_confidence = round((conf1.item() + conf2.item()) / 2, 4)
-
-    return {
-        "model1": {"label": label1, "confidence": round(conf1.item(), 4)},
-        "model2": {"label": label2, "confidence": round(conf2.item(), 4)},
-        "ensemble_result": final_label,
-        "confidence": avg_confidence,
-        "fake_confidence": round(fake_confidence, 4),
-        "real_confidence": round(real_confidence, 4)
-    }
+    return vit_backend.predict(image_path)
+
+def predict_batch(image_paths: List[str]):
+    return vit_backend.predict_batch(image_paths)
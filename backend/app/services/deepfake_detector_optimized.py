@@ -10,18 +10,15 @@ import cv2
 import numpy as np
 import threading
 import time
-import gc
 from pathlib import Path
 
 from app.core.config import (
     EFFICIENTNET_WEIGHTS, MESONET_WEIGHTS, IMAGE_SIZE,
     ENSEMBLE_WEIGHT_EFFICIENTNET, ENSEMBLE_WEIGHT_MESONET,
-    USE_FACE_CROP, TORCH_NUM_THREADS, CV2_NUM_THREADS
+    USE_FACE_CROP
 )
-
-# CPU 스레드 설정
-torch.set_num_threads(TORCH_NUM_THREADS)
-cv2.setNumThreads(CV2_NUM_THREADS)
+from app.core.runtime import configure_cpu_runtime, optimize_model, fill_input_buffer
+from app.services.weight_loader import load_weights_into
 
 device = torch.device("cpu")  # CPU 전용
 
@@ -109,6 +106,8 @@ class Meso4(nn.Module):
 
 eff_model = None
 meso_model = None
+eff_profile = None
+meso_profile = None
 models_loaded = False
 loading_lock = threading.Lock()
 
@@ -161,7 +160,7 @@ def _crop_face(image: np.ndarray):
 
 def load_models():
     """모델 로드 (스레드 안전)"""
-    global eff_model, meso_model, models_loaded
+    global eff_model, meso_model, eff_profile, meso_profile, models_loaded
     
     if models_loaded:
         return True
@@ -170,6 +169,8 @@ def load_models():
         if models_loaded:
             return True
             
+        configure_cpu_runtime()
+        
         print("=" * 60)
         print("EfficientNet-B0 + MesoNet 모델 로딩 시작...")
         print("=" * 60)
@@ -179,21 +180,12 @@ def load_models():
             # EfficientNet-B0 로드
             print(f"[1/2] EfficientNet-B0 로딩 중...")
             eff_model = _load_efficientnet_model()
+            eff_stored_profile = None
             
             # DFDC pretrained 가중치가 있으면 로드, 없으면 ImageNet pretrained 사용
             if Path(EFFICIENTNET_WEIGHTS).exists():
                 print(f"  - DFDC pretrained 가중치 로드: {EFFICIENTNET_WEIGHTS}")
-                checkpoint = torch.load(EFFICIENTNET_WEIGHTS, map_location=device)
-                
-                if isinstance(checkpoint, dict):
-                    state_dict = checkpoint.get('state_dict', checkpoint.get('model', checkpoint))
-                else:
-                    state_dict = checkpoint
-                
-                # 키 정리
-                cleaned = {k.replace('module.', '').replace('model.', ''): v 
-                          for k, v in state_dict.items()}
-                eff_model.load_state_dict(cleaned, strict=False)
+                _, eff_stored_profile = load_weights_into(eff_model, EFFICIENTNET_WEIGHTS, strict=False)
                 print("  ✓ EfficientNet-B0 (DFDC pretrained) 로딩 완료")
             else:
                 print(f"  - DFDC pretrained 가중치 없음, ImageNet pretrained 사용")
@@ -201,26 +193,21 @@ def load_models():
                 print("  ✓ EfficientNet-B0 (ImageNet pretrained) 로딩 완료")
             
             eff_model.to(device).eval()
+            eff_model, eff_profile = optimize_model(
+                "efficientnet", eff_model,
+                torch.zeros(1, 3, EFFICIENTNET_IMAGE_SIZE, EFFICIENTNET_IMAGE_SIZE),
+                profile=eff_stored_profile
+            )
             
             # MesoNet 로드 (튜닝된 모델)
             print(f"[2/2] MesoNet 로딩 중...")
             meso_model = Meso4(num_classes=2, dropout_rate=0.4)
+            meso_stored_profile = None
             
             # MesoNet 가중치가 있으면 로드, 없으면 랜덤 초기화
             if Path(MESONET_WEIGHTS).exists():
                 print(f"  - MesoNet 가중치 로드: {MESONET_WEIGHTS}")
-                checkpoint = torch.load(MESONET_WEIGHTS, map_location=device)
-                
-                if isinstance(checkpoint, dict):
-                    state_dict = checkpoint.get('model_state_dict', 
-                                               checkpoint.get('state_dict', 
-                                                             checkpoint.get('model', checkpoint)))
-                else:
-                    state_dict = checkpoint
-                
-                cleaned = {k.replace('module.', '').replace('model.', ''): v 
-                          for k, v in state_dict.items()}
-                meso_model.load_state_dict(cleaned, strict=True)
+                _, meso_stored_profile = load_weights_into(meso_model, MESONET_WEIGHTS, strict=True)
                 print("  ✓ MesoNet (튜닝된 모델) 로딩 완료")
             else:
                 print(f"  - MesoNet 가중치 없음, 랜덤 초기화 사용")
@@ -229,6 +216,11 @@ def load_models():
                 print("  ✓ MesoNet (랜덤 초기화) 로딩 완료")
             
             meso_model.to(device).eval()
+            meso_model, meso_profile = optimize_model(
+                "mesonet", meso_model,
+                torch.zeros(1, 3, MESONET_IMAGE_SIZE, MESONET_IMAGE_SIZE),
+                profile=meso_stored_profile
+            )
             
             models_loaded = True
             loading_time = time.time() - start_time
@@ -279,8 +271,9 @@ def predict_image(image_path: str):
         pil_image = Image.fromarray(image)
         
         # EfficientNet 예측
-        eff_input = eff_transform(pil_image).unsqueeze(0).to(device)
-        with torch.no_grad():
+        # 입력 텐서는 미리 할당된 버퍼를 재사용 (프레임마다 새로 할당하지 않음)
+        eff_input = fill_input_buffer("efficientnet", [eff_transform(pil_image)], eff_profile)
+        with torch.inference_mode():
             eff_output = eff_model(eff_input)
             eff_probs = F.softmax(eff_output, dim=1)
             eff_fake = eff_probs[0][1].item()
@@ -289,8 +282,8 @@ def predict_image(image_path: str):
         # MesoNet 예측 (가중치가 있을 때만)
         meso_has_weights = Path(MESONET_WEIGHTS).exists()
         if meso_has_weights:
-            meso_input = meso_transform(pil_image).unsqueeze(0).to(device)
-            with torch.no_grad():
+            meso_input = fill_input_buffer("mesonet", [meso_transform(pil_image)], meso_profile)
+            with torch.inference_mode():
                 meso_output = meso_model(meso_input)
                 meso_probs = F.softmax(meso_output, dim=1)
                 meso_fake = meso_probs[0][1].item()
@@ -314,12 +307,6 @@ def predict_image(image_path: str):
         ensemble_confidence = max(ensemble_fake, ensemble_real)
         ensemble_label = "FAKE" if ensemble_fake > 0.5 else "REAL"
 
-        # 메모리 정리
-        del eff_input, eff_output, eff_probs
-        if meso_has_weights:
-            del meso_input, meso_output, meso_probs
-        gc.collect()
-
         return {
             "ensemble_result": ensemble_label,
             "confidence": round(ensemble_confidence, 4),
@@ -368,16 +355,3 @@ def predict_batch(images: list):
         results = [{"error": str(e)}] * len(images)
     
     return results
-
-def cleanup_memory():
-    """메모리 정리"""
-    gc.collect()
-    if device.type == "cuda":
-        torch.cuda.empty_cache()
-        print("GPU 메모리 정리 완료")
-    else:
-        print("CPU 메모리 정리 완료")
-
-
-
-
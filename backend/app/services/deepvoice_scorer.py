@@ -0,0 +1,103 @@
+"""
+Wav2Vec2 윈도우 단위 딥보이스 점수
+
+전체 파형을 겹치는 윈도우로 나누고, 윈도우 배치 단위로 Wav2Vec2를 실행한다.
+- 윈도우는 파형의 view로 생성하고 배치 하나 분량만 텐서로 만들어 긴 파일에서도 메모리 상한 유지
+- 마지막 윈도우는 파형 끝에 맞춰 당겨서 모든 윈도우 길이를 동일하게 유지 (패딩 없음)
+- 윈도우별 점수 타임라인은 영상 타임라인과 같은 시간 축 (helpers.summarize_audio_windows로 구간별 집계)
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import (
+    DEEPVOICE_WINDOW_SEC, DEEPVOICE_HOP_SEC, DEEPVOICE_BATCH_SIZE, DEEPVOICE_VARIANCE_THRESHOLD
+)
+from app.services.audio_io import AudioClip
+
+def _variance_to_decision(feature_variance: float, threshold: float):
+    """특징 분산 기반 판단 (더미 분류기, 실제로는 별도 훈련된 분류기가 필요)"""
+    is_deepvoice = feature_variance > threshold
+    confidence = min(abs(feature_variance - threshold) * 10, 1.0)
+    return bool(is_deepvoice), float(confidence)
+
+def window_starts(num_samples: int, window: int, hop: int) -> List[int]:
+    """윈도우 시작 샘플 인덱스 (마지막 윈도우는 끝에 맞춤)"""
+    if num_samples <= window:
+        return [0]
+    starts = list(range(0, num_samples - window + 1, hop))
+    if starts[-1] + window < num_samples:
+        starts.append(num_samples - window)
+    return starts
+
+class Wav2Vec2WindowScorer:
+    """겹치는 윈도우 배치로 Wav2Vec2 딥보이스 점수 계산"""
+
+    def __init__(self, model, feature_extractor, device,
+                 window_sec: float = DEEPVOICE_WINDOW_SEC,
+                 hop_sec: float = DEEPVOICE_HOP_SEC,
+                 batch_size: int = DEEPVOICE_BATCH_SIZE,
+                 threshold: float = DEEPVOICE_VARIANCE_THRESHOLD):
+        self.model = model
+        self.feature_extractor = feature_extractor
+        self.device = device
+        self.window_sec = window_sec
+        self.hop_sec = hop_sec
+        self.batch_size = max(1, batch_size)
+        self.threshold = threshold
+
+    def _score_batch(self, windows: List[np.ndarray], sample_rate: int) -> List[float]:
+        """윈도우 배치 -> 윈도우별 특징 분산"""
+        import torch
+
+        inputs = self.feature_extractor(windows, sampling_rate=sample_rate, return_tensors="pt")
+        input_values = inputs["input_values"].to(self.device, dtype=self.model.dtype)
+
+        with torch.inference_mode():
+            outputs = self.model(input_values)
+            features = outputs.last_hidden_state.mean(dim=1)
+            variances = torch.var(features.float(), dim=1)
+        return variances.cpu().tolist()
+
+    def score(self, clip: AudioClip) -> Dict:
+        """
+        전체 클립 점수 계산
+
+        Returns:
+            dict: is_deepvoice, confidence, feature_variance (윈도우 평균),
+                  deepvoice_window_ratio, windows (윈도우별 start/end/점수)
+        """
+        sample_rate = clip.sample_rate
+        window = max(1, int(self.window_sec * sample_rate))
+        hop = max(1, int(self.hop_sec * sample_rate))
+        num_samples = len(clip.samples)
+
+        if num_samples == 0:
+            return {"is_deepvoice": False, "confidence": 0.0, "feature_variance": 0.0, "windows": []}
+
+        windows = []
+        starts = window_starts(num_samples, window, hop)
+        for batch_begin in range(0, len(starts), self.batch_size):
+            batch_starts = starts[batch_begin:batch_begin + self.batch_size]
+            batch = [clip.samples[s:s + window] for s in batch_starts]
+            for start, variance in zip(batch_starts, self._score_batch(batch, sample_rate)):
+                is_deepvoice, confidence = _variance_to_decision(variance, self.threshold)
+                windows.append({
+                    "start": round(start / sample_rate, 3),
+                    "end": round(min(start + window, num_samples) / sample_rate, 3),
+                    "feature_variance": round(float(variance), 6),
+                    "is_deepvoice": is_deepvoice,
+                    "confidence": round(confidence, 4)
+                })
+
+        mean_variance = float(np.mean([w["feature_variance"] for w in windows]))
+        is_deepvoice, confidence = _variance_to_decision(mean_variance, self.threshold)
+        return {
+            "is_deepvoice": is_deepvoice,
+            "confidence": confidence,
+            "feature_variance": mean_variance,
+            "deepvoice_window_ratio": round(sum(w["is_deepvoice"] for w in windows) / len(windows), 4),
+            "window_sec": self.window_sec,
+            "hop_sec": self.hop_sec,
+            "windows": windows
+        }
@@ -0,0 +1,223 @@
+"""
+프레임별 점수 열 단위 표현
+
+프레임별 결과 dict 리스트(키 문자열이 프레임마다 반복됨) 대신 열마다 NumPy 배열 하나를 사용한다.
+- 시간 / 확률은 float 배열, 얼굴 감지 / 오류 여부는 bool 배열
+- 판정 라벨은 작은 정수 코드 (LABELS 인덱스), 모델 이름은 코드 + 이름 목록
+- 고정 열에 없는 키(모델별 점수 meta.models, meta.weights 등)는 프레임별 JSON으로 보관 (extras)
+- 집계(타임라인 / 구간 상세 / 내보내기)는 배열 연산으로 수행
+- 저장 / 내보내기는 npz (압축) 바이너리, 결과 저장소에는 base64 문자열로 저장
+"""
+import base64
+import io
+import json
+from typing import Dict, List
+
+import numpy as np
+
+LABELS = ("REAL", "FAKE", "UNKNOWN")
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+REAL, FAKE, UNKNOWN = (LABEL_CODES[label] for label in LABELS)
+
+RECORD_FORMAT = "npz"
+
+# 열 이름 -> dtype (npz에 저장되는 배열)
+COLUMN_DTYPES = {
+    "time": np.float64,
+    "label": np.uint8,
+    "confidence": np.float32,
+    "fake_confidence": np.float32,
+    "real_confidence": np.float32,
+    "face_detected": np.bool_,
+    "has_error": np.bool_,
+    "ensemble": np.bool_,
+    "escalated": np.bool_,
+    "model": np.int16,  # model_names 인덱스 (-1: 없음)
+    "model1_label": np.uint8,
+    "model1_confidence": np.float32,  # NaN: 없음
+    "model2_label": np.uint8,
+    "model2_confidence": np.float32
+}
+
+# 고정 열로 저장하는 키 (나머지는 extras)
+_COLUMN_KEYS = {
+    "time", "ensemble_result", "confidence", "fake_confidence", "real_confidence",
+    "face_detected", "error", "meta", "model1", "model2"
+}
+_META_COLUMN_KEYS = {"model", "ensemble", "escalated"}
+_MODEL_COLUMN_KEYS = {"label", "confidence"}
+
+def _label_code(label) -> int:
+    return LABEL_CODES.get(label, UNKNOWN)
+
+class FrameColumns:
+    """프레임별 점수 열 모음 (모든 열의 길이가 같음)"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], model_names: List[str] = None,
+                 errors: Dict[int, str] = None, extras: Dict[int, Dict] = None):
+        self.columns = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+        self.model_names = list(model_names or [])
+        self.errors = dict(errors or {})
+        self.extras = dict(extras or {})  # 프레임 인덱스 -> 고정 열에 없는 키 (원래 구조 그대로)
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    @classmethod
+    def empty(cls) -> "FrameColumns":
+        return cls({name: np.zeros(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()})
+
+    @classmethod
+    def from_rows(cls, frame_results: List[Dict]) -> "FrameColumns":
+        """프레임별 결과 dict 리스트 -> 열 (없는 키는 기존 .get() 기본값과 같게 채움)"""
+        n = len(frame_results)
+        columns = {name: np.zeros(n, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+        columns["model"].fill(-1)
+        columns["model1_confidence"].fill(np.nan)
+        columns["model2_confidence"].fill(np.nan)
+        model_codes = {}
+        errors = {}
+        extras = {}
+
+        for i, frame in enumerate(frame_results):
+            columns["time"][i] = frame.get("time", 0.0)
+            columns["label"][i] = _label_code(frame.get("ensemble_result", "UNKNOWN"))
+            columns["confidence"][i] = frame.get("confidence", 0.0)
+            columns["fake_confidence"][i] = frame.get("fake_confidence", 0.0)
+            columns["real_confidence"][i] = frame.get("real_confidence", 0.0)
+            columns["face_detected"][i] = frame.get("face_detected", True)
+            if "error" in frame:
+                columns["has_error"][i] = True
+                errors[i] = str(frame["error"])
+
+            meta = frame.get("meta") or {}
+            columns["ensemble"][i] = meta.get("ensemble", False)
+            columns["escalated"][i] = meta.get("escalated", False)
+            if "model" in meta:
+                columns["model"][i] = model_codes.setdefault(meta["model"], len(model_codes))
+
+            for key in ("model1", "model2"):
+                model_result = frame.get(key)
+                columns[f"{key}_label"][i] = _label_code((model_result or {}).get("label", "UNKNOWN"))
+                if model_result and "confidence" in model_result:
+                    columns[f"{key}_confidence"][i] = model_result["confidence"]
+
+            extra = _frame_extra(frame, meta)
+            if extra:
+                extras[i] = extra
+
+        return cls(columns, model_names=list(model_codes), errors=errors, extras=extras)
+
+    def to_rows(self) -> List[Dict]:
+        """열 -> 프레임별 결과 dict 리스트 (from_rows의 역변환, 확률은 소수점 4자리)"""
+        lists = {name: values.tolist() for name, values in self.columns.items()}
+        rows = []
+        for i in range(len(self)):
+            row = {
+                "ensemble_result": LABELS[lists["label"][i]],
+                "confidence": round(lists["confidence"][i], 4),
+                "fake_confidence": round(lists["fake_confidence"][i], 4),
+                "real_confidence": round(lists["real_confidence"][i], 4),
+                "time": lists["time"][i],
+                "face_detected": lists["face_detected"][i]
+            }
+            if lists["has_error"][i]:
+                row["error"] = self.errors.get(i, "")
+            extra = self.extras.get(i, {})
+            if lists["model"][i] >= 0 or "meta" in extra:
+                meta = {"model": self.model_names[lists["model"][i]]} if lists["model"][i] >= 0 else {}
+                meta.update(ensemble=lists["ensemble"][i], escalated=lists["escalated"][i])
+                meta.update(extra.get("meta", {}))
+                row["meta"] = meta
+            for key in ("model1", "model2"):
+                confidence = lists[f"{key}_confidence"][i]
+                if not np.isnan(confidence):
+                    row[key] = {"label": LABELS[lists[f"{key}_label"][i]], "confidence": round(confidence, 4)}
+                if key in extra:
+                    row.setdefault(key, {}).update(extra[key])
+            row.update((key, value) for key, value in extra.items() if key not in row)
+            rows.append(row)
+        return rows
+
+    def slice(self, start: int, end: int) -> "FrameColumns":
+        """[start, end) 구간 (배열은 view, 오류 메시지 인덱스는 다시 매김)"""
+        errors = {i - start: message for i, message in self.errors.items() if start <= i < end}
+        extras = {i - start: extra for i, extra in self.extras.items() if start <= i < end}
+        return FrameColumns({name: values[start:end] for name, values in self.columns.items()},
+                            model_names=self.model_names, errors=errors, extras=extras)
+
+    def valid_mask(self) -> np.ndarray:
+        """집계에 사용하는 프레임 (얼굴 감지 + 오류 없음)"""
+        return self.face_detected & ~self.has_error
+
+    def label_names(self) -> List[str]:
+        return [LABELS[code] for code in self.label.tolist()]
+
+    def rounded(self, name: str, decimals: int = 4) -> List[float]:
+        """열 값을 소수점 decimals자리 float 리스트로 (float32 표현 오차 제거)"""
+        return np.round(self.columns[name].astype(np.float64), decimals).tolist()
+
+    def extra_json(self, i: int) -> str:
+        """프레임 i의 추가 키 JSON 문자열 (없으면 빈 문자열)"""
+        extra = self.extras.get(i)
+        return json.dumps(extra, ensure_ascii=False, default=str) if extra else ""
+
+    def to_npz_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        error_index = np.array(sorted(self.errors), dtype=np.int64)
+        extra_index = np.array(sorted(self.extras), dtype=np.int64)
+        np.savez_compressed(
+            buffer,
+            **self.columns,
+            model_names=np.array(self.model_names, dtype=str),
+            error_index=error_index,
+            error_message=np.array([self.errors[i] for i in error_index.tolist()], dtype=str),
+            extra_index=extra_index,
+            extra_json=np.array([self.extra_json(i) for i in extra_index.tolist()], dtype=str)
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_npz_bytes(cls, data: bytes) -> "FrameColumns":
+        with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+            columns = {name: npz[name] for name in COLUMN_DTYPES}
+            errors = dict(zip(npz["error_index"].tolist(), npz["error_message"].tolist()))
+            extras = {i: json.loads(extra) for i, extra in zip(npz["extra_index"].tolist(), npz["extra_json"].tolist())}
+            return cls(columns, model_names=npz["model_names"].tolist(), errors=errors, extras=extras)
+
+    def to_record(self) -> Dict:
+        """결과 저장소용 기록 (JSON / Firestore 모두 저장 가능하도록 npz를 base64 문자열로)"""
+        return {
+            "format": RECORD_FORMAT,
+            "frame_count": len(self),
+            "data": base64.b64encode(self.to_npz_bytes()).decode("ascii")
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict) -> "FrameColumns":
+        """저장소 기록 -> 열"""
+        return cls.from_npz_bytes(base64.b64decode(record["data"]))
+
+def _frame_extra(frame: Dict, meta: Dict) -> Dict:
+    """고정 열에 없는 키 (프레임 dict와 같은 구조, meta / model1 / model2는 나머지 하위 키만)"""
+    extra = {key: value for key, value in frame.items() if key not in _COLUMN_KEYS}
+    meta_extra = {key: value for key, value in meta.items() if key not in _META_COLUMN_KEYS}
+    if meta_extra:
+        extra["meta"] = meta_extra
+    for key in ("model1", "model2"):
+        model_extra = {k: v for k, v in (frame.get(key) or {}).items() if k not in _MODEL_COLUMN_KEYS}
+        if model_extra:
+            extra[key] = model_extra
+    return extra
+
+def as_frame_columns(frame_results) -> FrameColumns:
+    """FrameColumns 또는 프레임별 dict 리스트 -> FrameColumns"""
+    if isinstance(frame_results, FrameColumns):
+        return frame_results
+    return FrameColumns.from_rows(frame_results or [])
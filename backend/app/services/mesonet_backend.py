@@ -414,3 +414,31 @@ def predict_frames(frames: List[tuple]) -> List[Dict]:
         traceback.print_exc()
         return [{"error": str(e)}]
 
+
+class TFMesoNetBackend:
+    """TensorFlow MesoNet 앙상블 엔진 어댑터"""
+    
+    name = "mesonet_tf"
+    # 프레임당 예상 추론 비용 (ms, 앙상블 엔진 스케줄링용 초기값)
+    cost_per_frame_ms = 8.0
+    
+    def load(self):
+        """앙상블 엔진 인터페이스: 모델 로드"""
+        return ensure_model_loaded()
+    
+    def estimate_cost(self, batch_size: int) -> float:
+        """앙상블 엔진 인터페이스: 배치 추론 예상 비용 (ms)"""
+        return self.cost_per_frame_ms * batch_size
+    
+    def preprocess_batch(self, images: list, face_crop: bool = True):
+        """앙상블 엔진 인터페이스: RGB 이미지 배치 -> Nx256x256x3 배열"""
+        # _prep_image는 cv2.imread와 같은 BGR 입력을 기대
+        preprocessed = [_prep_image(cv2.cvtColor(image, cv2.COLOR_RGB2BGR)) for image in images]
+        return np.stack(preprocessed, axis=0), None
+    
+    def infer_batch(self, batch: np.ndarray) -> List[float]:
+        """앙상블 엔진 인터페이스: 배치 추론 (프레임별 FAKE 확률 리스트)"""
+        y = meso_model.predict(batch, verbose=0)
+        if y.shape[-1] == 2:
+            return y[:, 1].astype(float).tolist()
+        return y.squeeze(-1).astype(float).tolist()
@@ -11,15 +11,17 @@ from pathlib import Path
 import threading
 import time
 
-from app.core.config import EFFICIENTNET_WEIGHTS, IMAGE_SIZE, TORCH_NUM_THREADS, CV2_NUM_THREADS
-
-# CPU 스레드 설정
-torch.set_num_threads(TORCH_NUM_THREADS)
-cv2.setNumThreads(CV2_NUM_THREADS)
+from app.core.config import EFFICIENTNET_WEIGHTS, IMAGE_SIZE
+from app.core.runtime import configure_cpu_runtime, optimize_model, prepare_input, fill_input_buffer
+from app.services.weight_loader import load_weights_into
 
 class EfficientNetB0Backend:
     """EfficientNet-B0 (DFDC pretrained) 백엔드"""
     
+    name = "efficientnet"
+    # 프레임당 예상 추론 비용 (ms, 앙상블 엔진 스케줄링용 초기값)
+    cost_per_frame_ms = 40.0
+    
     def __init__(self):
         self.model = None
         self.device = torch.device("cpu")
@@ -30,6 +32,7 @@ class EfficientNetB0Backend:
         ])
         self.loading_lock = threading.Lock()
         self.model_loaded = False
+        self.runtime_profile = None
         
     def _build_model(self):
         """EfficientNet-B0 모델 구조 생성"""
@@ -60,6 +63,7 @@ class EfficientNetB0Backend:
                 return True
                 
             try:
+                configure_cpu_runtime()
                 print(f"[EfficientNet-B0] 모델 로딩 시작: {EFFICIENTNET_WEIGHTS}")
                 start_time = time.time()
                 
@@ -73,30 +77,19 @@ class EfficientNetB0Backend:
                 # 모델 구조 생성
                 self.model = self._build_model()
                 
-                # 가중치 로드
-                checkpoint = torch.load(EFFICIENTNET_WEIGHTS, map_location=self.device)
-                
-                # 체크포인트 구조에 따라 가중치 로드
-                if isinstance(checkpoint, dict):
-                    if 'state_dict' in checkpoint:
-                        state_dict = checkpoint['state_dict']
-                    elif 'model' in checkpoint:
-                        state_dict = checkpoint['model']
-                    else:
-                        state_dict = checkpoint
-                else:
-                    state_dict = checkpoint
-                
-                # state_dict 키 정리 (불필요한 prefix 제거)
-                cleaned_state_dict = {}
-                for k, v in state_dict.items():
-                    new_key = k.replace('module.', '').replace('model.', '')
-                    cleaned_state_dict[new_key] = v
-                
-                self.model.load_state_dict(cleaned_state_dict, strict=False)
+                # 가중치 로드 (메모리 매핑 파일이 있으면 워커 간 공유)
+                mmapped, stored_profile = load_weights_into(self.model, EFFICIENTNET_WEIGHTS, strict=False)
+                if mmapped:
+                    print("[EfficientNet-B0] 메모리 매핑 가중치 사용")
                 self.model.to(self.device)
                 self.model.eval()
                 
+                # CPU 런타임 설정 적용 (메모리 매핑 파일의 프로파일 또는 channels_last / oneDNN 자체 벤치마크)
+                example_input = torch.zeros(1, 3, IMAGE_SIZE, IMAGE_SIZE)
+                self.model, self.runtime_profile = optimize_model(
+                    "efficientnet", self.model, example_input, profile=stored_profile
+                )
+                
                 loading_time = time.time() - start_time
                 print(f"[EfficientNet-B0] 모델 로딩 완료! (소요시간: {loading_time:.2f}초)")
                 self.model_loaded = True
@@ -130,22 +123,21 @@ class EfficientNetB0Backend:
             # BGR -> RGB 변환
             image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             
-            # 얼굴 crop (옵션)
-            if face_crop:
-                image = self._crop_face(image)
-            
-            # PIL Image로 변환
-            pil_image = Image.fromarray(image)
-            
-            # 리사이즈 및 정규화
-            image_tensor = self.transform(pil_image).unsqueeze(0)
-            
-            return image_tensor.to(self.device)
+            return self._preprocess_rgb(image, face_crop).unsqueeze(0).to(self.device)
             
         except Exception as e:
             print(f"[EfficientNet-B0] 이미지 전처리 오류: {e}")
             raise
     
+    def _preprocess_rgb(self, image: np.ndarray, face_crop: bool = True) -> torch.Tensor:
+        """RGB 이미지 -> 3xHxW 텐서"""
+        # 얼굴 crop (옵션)
+        if face_crop:
+            image = self._crop_face(image)
+        
+        # 리사이즈 및 정규화
+        return self.transform(Image.fromarray(image))
+    
     def _crop_face(self, image: np.ndarray):
         """얼굴 영역 crop"""
         try:
@@ -188,6 +180,30 @@ class EfficientNetB0Backend:
             print(f"[EfficientNet-B0] 얼굴 crop 오류: {e}, 원본 이미지 사용")
             return image
     
+    def load(self):
+        """앙상블 엔진 인터페이스: 모델 로드"""
+        return self.load_model()
+    
+    def estimate_cost(self, batch_size: int) -> float:
+        """앙상블 엔진 인터페이스: 배치 추론 예상 비용 (ms)"""
+        return self.cost_per_frame_ms * batch_size
+    
+    def preprocess_batch(self, images: list, face_crop: bool = True):
+        """
+        앙상블 엔진 인터페이스: RGB 이미지 배치 전처리
+        
+        Returns:
+            tuple: (NxCxHxW 텐서 - 재사용 버퍼, None - 얼굴 감지 여부는 보고하지 않음)
+        """
+        tensors = [self._preprocess_rgb(image, face_crop) for image in images]
+        return fill_input_buffer(self.name, tensors, self.runtime_profile), None
+    
+    def infer_batch(self, batch: torch.Tensor) -> list:
+        """앙상블 엔진 인터페이스: 배치 추론 (프레임별 FAKE 확률 리스트)"""
+        with torch.inference_mode():
+            probs = torch.nn.functional.softmax(self.model(batch), dim=1)
+        return probs[:, 1].tolist()
+    
     def predict(self, image_path: str, face_crop: bool = True):
         """
         이미지 예측
@@ -208,7 +224,8 @@ class EfficientNetB0Backend:
             image_tensor = self.preprocess_image(image_path, face_crop=face_crop)
             
             # 추론
-            with torch.no_grad():
+            image_tensor = prepare_input(image_tensor, self.runtime_profile)
+            with torch.inference_mode():
                 outputs = self.model(image_tensor)
                 probs = torch.nn.functional.softmax(outputs, dim=1)
                 fake_prob = probs[0][1].item()  # FAKE 클래스 확률
@@ -1,19 +1,265 @@
 """
-EfficientNet-B0 + MesoNet 앙상블 백엔드
+앙상블 엔진 (플러그인 백엔드 + 비용 기반 스케줄링)
+
+모든 백엔드는 같은 인터페이스를 가진다:
+- name: 백엔드 이름
+- load(): 모델 로드 (bool)
+- estimate_cost(batch_size): 배치 추론 예상 비용 (ms)
+- preprocess_batch(images, face_crop): RGB 이미지 리스트 -> (배치 입력, 얼굴_감지_여부 리스트 또는 None)
+- infer_batch(batch): 프레임별 FAKE 확률 리스트
 """
-from app.services.model_efficientnet import EfficientNetB0Backend
-from app.services.model_mesonet import MesoNetBackend
+import threading
+import time
+from typing import Dict, List
+
+import cv2
+
 from app.core.config import (
-    ENSEMBLE_WEIGHT_EFFICIENTNET,
-    ENSEMBLE_WEIGHT_MESONET,
+    ENSEMBLE_BACKENDS,
+    ENSEMBLE_WEIGHTS,
+    ENSEMBLE_MODE,
+    CASCADE_UNCERTAIN_BAND,
     USE_FACE_CROP
 )
 
+# 측정된 추론 시간으로 비용 추정치를 갱신하는 비율 (지수 이동 평균)
+COST_EMA_ALPHA = 0.3
+
+def create_backend(name: str):
+    """이름으로 백엔드 생성 (무거운 의존성은 필요할 때만 import)"""
+    if name == "mesonet":
+        from app.services.model_mesonet import MesoNetBackend
+        return MesoNetBackend()
+    if name == "efficientnet":
+        from app.services.model_efficientnet import EfficientNetB0Backend
+        return EfficientNetB0Backend()
+    if name == "vit":
+        from app.services.deepfake_detector import vit_backend
+        return vit_backend
+    if name == "mesonet_tf":
+        from app.services.mesonet_backend import TFMesoNetBackend
+        return TFMesoNetBackend()
+    raise ValueError(f"알 수 없는 백엔드: {name}")
+
+def _no_face_result(name: str) -> Dict:
+    """얼굴 미감지 프레임 결과 (신뢰도 0인 REAL, 집계에서 제외됨)"""
+    return {
+        "label": "REAL",
+        "score": 0.0,
+        "fake_prob": 0.0,
+        "real_prob": 1.0,
+        "face_detected": False,
+        "warning": "얼굴이 감지되지 않아 계산에서 제외됩니다",
+        "meta": {"ensemble": False, "models": {}, "skipped_by": name}
+    }
+
+class EnsembleEngine:
+    """플러그인 백엔드 앙상블 엔진"""
+
+    def __init__(self, backends: List, weights: Dict[str, float] = None,
+                 mode: str = ENSEMBLE_MODE, uncertain_band: tuple = CASCADE_UNCERTAIN_BAND):
+        """
+        Args:
+            backends: 백엔드 인스턴스 리스트
+            weights: 백엔드 이름 -> 가중치 (없으면 ENSEMBLE_WEIGHTS, 그래도 없으면 1.0)
+            mode: "weighted" 또는 "cascade"
+            uncertain_band: cascade 모드에서 다음 백엔드로 넘길 FAKE 확률 구간 (low, high)
+        """
+        if mode not in ("weighted", "cascade"):
+            raise ValueError(f"지원하지 않는 앙상블 모드: {mode}")
+
+        self.backends = {backend.name: backend for backend in backends}
+        weights = weights if weights is not None else ENSEMBLE_WEIGHTS
+        self.weights = {name: float(weights.get(name, 1.0)) for name in self.backends}
+        self.mode = mode
+        self.uncertain_band = uncertain_band
+
+        # 프레임당 비용 추정치 (ms), 실제 추론 시간으로 갱신
+        self.cost_ms = {name: backend.estimate_cost(1) for name, backend in self.backends.items()}
+        self.stats = {"frames": 0, "escalated": 0, "backend_frames": {name: 0 for name in self.backends}}
+        self.stats_lock = threading.Lock()
+        self.loading_lock = threading.Lock()
+        self.loaded = False
+
+    def load(self) -> bool:
+        """모든 백엔드 로드 (실패한 백엔드는 제외)"""
+        if self.loaded:
+            return True
+
+        with self.loading_lock:
+            if self.loaded:
+                return True
+
+            for name in list(self.backends):
+                if not self.backends[name].load():
+                    print(f"[Ensemble] {name} 로딩 실패, 앙상블에서 제외")
+                    del self.backends[name]
+
+            self.loaded = len(self.backends) > 0
+            return self.loaded
+
+    def schedule(self) -> List[str]:
+        """비용이 낮은 백엔드부터 실행 순서 결정"""
+        return sorted(self.backends, key=lambda name: self.cost_ms[name])
+
+    def _run_backend(self, name: str, images: List, face_crop: bool):
+        """백엔드 하나를 배치로 실행하고 비용 추정치 갱신"""
+        backend = self.backends[name]
+        start = time.perf_counter()
+        batch, face_flags = backend.preprocess_batch(images, face_crop=face_crop)
+        fake_probs = backend.infer_batch(batch)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        per_frame = elapsed_ms / max(1, len(images))
+        with self.stats_lock:
+            self.cost_ms[name] = (1 - COST_EMA_ALPHA) * self.cost_ms[name] + COST_EMA_ALPHA * per_frame
+            self.stats["backend_frames"][name] += len(images)
+        return fake_probs, face_flags
+
+    def _combine(self, scores: Dict[str, float]) -> float:
+        """실행된 백엔드 점수의 가중 평균"""
+        total_weight = sum(self.weights[name] for name in scores)
+        if total_weight <= 0:
+            return sum(scores.values()) / len(scores)
+        return sum(self.weights[name] * prob for name, prob in scores.items()) / total_weight
+
+    def _is_uncertain(self, fake_prob: float) -> bool:
+        low, high = self.uncertain_band
+        return low <= fake_prob <= high
+
+    def predict_images(self, images: List, face_crop: bool = None) -> List[Dict]:
+        """
+        RGB 이미지 배치 예측
+
+        Args:
+            images: RGB numpy 이미지 리스트
+            face_crop: 얼굴 crop 사용 여부 (None이면 설정값 사용)
+
+        Returns:
+            프레임별 앙상블 결과 리스트 (입력 순서 유지)
+        """
+        if face_crop is None:
+            face_crop = USE_FACE_CROP
+        if not images:
+            return []
+        if not self.load():
+            return [{"error": "모델 로딩 실패"} for _ in images]
+
+        scores = [{} for _ in images]
+        face_detected = [True] * len(images)
+        no_face_by = [None] * len(images)
+        active = list(range(len(images)))
+        escalated = set()
+
+        for step, name in enumerate(self.schedule()):
+            if step > 0 and self.mode == "cascade":
+                # 이전 백엔드가 실패한 프레임은 점수가 없으므로 그대로 다음 백엔드로 전달
+                uncertain = [i for i in active if scores[i] and self._is_uncertain(self._combine(scores[i]))]
+                escalated.update(uncertain)
+                active = [i for i in active if not scores[i]] + uncertain
+            if not active:
+                break
+
+            try:
+                fake_probs, face_flags = self._run_backend(name, [images[i] for i in active], face_crop)
+            except Exception as e:
+                print(f"[Ensemble] {name} 추론 오류: {e}")
+                continue
+
+            for j, i in enumerate(active):
+                scores[i][name] = float(fake_probs[j])
+                if face_flags is not None and not face_flags[j] and no_face_by[i] is None:
+                    face_detected[i] = False
+                    no_face_by[i] = name
+
+            # 얼굴이 없는 프레임은 이후 (더 비싼) 백엔드에서 제외
+            active = [i for i in active if face_detected[i] and scores[i]]
+
+        with self.stats_lock:
+            self.stats["frames"] += len(images)
+            self.stats["escalated"] += len(escalated)
+
+        results = []
+        for i in range(len(images)):
+            if not face_detected[i]:
+                results.append(_no_face_result(no_face_by[i]))
+                continue
+            if not scores[i]:
+                results.append({"error": "모든 백엔드 추론 실패"})
+                continue
+
+            fake_prob = self._combine(scores[i])
+            real_prob = 1.0 - fake_prob
+            total_weight = sum(self.weights[name] for name in scores[i]) or 1.0
+            results.append({
+                "label": "FAKE" if fake_prob > 0.5 else "REAL",
+                "score": float(max(fake_prob, real_prob)),
+                "fake_prob": float(fake_prob),
+                "real_prob": float(real_prob),
+                "face_detected": True,
+                "meta": {
+                    "ensemble": len(scores[i]) > 1,
+                    "mode": self.mode,
+                    "escalated": i in escalated,
+                    "weights": {name: self.weights[name] / total_weight for name in scores[i]},
+                    "models": {
+                        name: {
+                            "label": "FAKE" if prob > 0.5 else "REAL",
+                            "score": max(prob, 1.0 - prob),
+                            "fake_prob": prob
+                        }
+                        for name, prob in scores[i].items()
+                    }
+                }
+            })
+        return results
+
+    def predict_paths(self, image_paths: List[str], face_crop: bool = None) -> List[Dict]:
+        """이미지 파일 경로 배치 예측 (디코딩은 한 번만 수행하여 모든 백엔드가 공유)"""
+        images = []
+        readable = []
+        for i, path in enumerate(image_paths):
+            image = cv2.imread(path)
+            if image is not None:
+                images.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                readable.append(i)
+
+        results = [{"error": f"이미지를 로드할 수 없습니다: {path}"} for path in image_paths]
+        for i, result in zip(readable, self.predict_images(images, face_crop=face_crop)):
+            results[i] = result
+        return results
+
+    def get_stats(self) -> Dict:
+        """스케줄링 통계 (프레임 수, 에스컬레이션 비율, 비용 추정치)"""
+        with self.stats_lock:
+            frames = self.stats["frames"]
+            return {
+                "mode": self.mode,
+                "backends": self.schedule(),
+                "frames": frames,
+                "escalated": self.stats["escalated"],
+                "escalation_rate": round(self.stats["escalated"] / frames, 4) if frames else 0.0,
+                "backend_frames": dict(self.stats["backend_frames"]),
+                "cost_ms_per_frame": {name: round(cost, 3) for name, cost in self.cost_ms.items()}
+            }
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+def get_ensemble_engine() -> EnsembleEngine:
+    """설정 파일 기반 공유 앙상블 엔진 (프로세스당 하나)"""
+    global _default_engine
+
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = EnsembleEngine([create_backend(name) for name in ENSEMBLE_BACKENDS])
+    return _default_engine
+
 class EnsembleBackend:
-    """EfficientNet-B0 + MesoNet 앙상블 백엔드"""
-    
-    def __init__(self, eff_backend: EfficientNetB0Backend, meso_backend: MesoNetBackend, 
-                 w_eff: float = 0.7, w_meso: float = 0.3):
+    """EfficientNet-B0 + MesoNet 앙상블 백엔드 (EnsembleEngine 가중 평균 모드 래퍼)"""
+
+    def __init__(self, eff_backend, meso_backend, w_eff: float = 0.7, w_meso: float = 0.3):
         """
         Args:
             eff_backend: EfficientNet-B0 백엔드 인스턴스
@@ -21,93 +267,21 @@ class EnsembleBackend:
             w_eff: EfficientNet 가중치 (기본: 0.7)
             w_meso: MesoNet 가중치 (기본: 0.3)
         """
-        self.eff_backend = eff_backend
-        self.meso_backend = meso_backend
-        self.w_eff = w_eff
-        self.w_meso = w_meso
-        
-        # 가중치 정규화
-        total_weight = w_eff + w_meso
-        if total_weight > 0:
-            self.w_eff = w_eff / total_weight
-            self.w_meso = w_meso / total_weight
-    
+        self.engine = EnsembleEngine(
+            [eff_backend, meso_backend],
+            weights={"efficientnet": w_eff, "mesonet": w_meso},
+            mode="weighted"
+        )
+
     def predict(self, image_path: str, face_crop: bool = None):
         """
         앙상블 예측
-        
+
         Args:
             image_path: 이미지 파일 경로
             face_crop: 얼굴 crop 사용 여부 (None이면 설정값 사용)
-        
+
         Returns:
             앙상블 예측 결과 딕셔너리
         """
-        if face_crop is None:
-            face_crop = USE_FACE_CROP
-        
-        # 각 모델로 예측
-        eff_result = self.eff_backend.predict(image_path, face_crop=face_crop)
-        meso_result = self.meso_backend.predict(image_path, face_crop=face_crop)
-        
-        # 오류 체크
-        if "error" in eff_result:
-            print(f"[Ensemble] EfficientNet 오류: {eff_result['error']}")
-            # EfficientNet 실패 시 MesoNet 결과만 반환
-            if "error" not in meso_result:
-                return {
-                    **meso_result,
-                    "meta": {
-                        "ensemble": False,
-                        "weights": {"efficientnet": 0.0, "mesonet": 1.0}
-                    }
-                }
-            return {"error": f"모든 모델 실패: EfficientNet={eff_result['error']}, MesoNet={meso_result.get('error', 'unknown')}"}
-        
-        if "error" in meso_result:
-            print(f"[Ensemble] MesoNet 오류: {meso_result['error']}")
-            # MesoNet 실패 시 EfficientNet 결과만 반환
-            return {
-                **eff_result,
-                "meta": {
-                    "ensemble": False,
-                    "weights": {"efficientnet": 1.0, "mesonet": 0.0}
-                }
-            }
-        
-        # 앙상블: 가중 평균
-        eff_fake = eff_result.get("fake_prob", 0.0)
-        meso_fake = meso_result.get("fake_prob", 0.0)
-        
-        ensemble_fake = (self.w_eff * eff_fake) + (self.w_meso * meso_fake)
-        ensemble_real = 1.0 - ensemble_fake
-        ensemble_confidence = max(ensemble_fake, ensemble_real)
-        ensemble_label = "FAKE" if ensemble_fake > 0.5 else "REAL"
-        
-        return {
-            "label": ensemble_label,
-            "score": float(ensemble_confidence),
-            "fake_prob": float(ensemble_fake),
-            "real_prob": float(ensemble_real),
-            "meta": {
-                "ensemble": True,
-                "weights": {
-                    "efficientnet": self.w_eff,
-                    "mesonet": self.w_meso
-                },
-                "models": {
-                    "efficientnet": {
-                        "label": eff_result.get("label", "UNKNOWN"),
-                        "score": eff_result.get("score", 0.0),
-                        "fake_prob": eff_fake
-                    },
-                    "mesonet": {
-                        "label": meso_result.get("label", "UNKNOWN"),
-                        "score": meso_result.get("score", 0.0),
-                        "fake_prob": meso_fake
-                    }
-                }
-            }
-        }
-
-
+        return self.engine.predict_paths([image_path], face_crop=face_crop)[0]
@@ -12,11 +12,9 @@ from pathlib import Path
 import threading
 import time
 
-from app.core.config import MESONET_WEIGHTS, IMAGE_SIZE, TORCH_NUM_THREADS, CV2_NUM_THREADS
-
-# CPU 스레드 설정
-torch.set_num_threads(TORCH_NUM_THREADS)
-cv2.setNumThreads(CV2_NUM_THREADS)
+from app.core.config import MESONET_WEIGHTS, IMAGE_SIZE
+from app.core.runtime import configure_cpu_runtime, optimize_model, prepare_input, fill_input_buffer
+from app.services.weight_loader import load_weights_into
 
 class Meso4(nn.Module):
     """MesoNet-4 모델 구조 (256x256 입력용, 튜닝된 버전)"""
@@ -79,6 +77,10 @@ class Meso4(nn.Module):
 class MesoNetBackend:
     """MesoNet 백엔드"""
     
+    name = "mesonet"
+    # 프레임당 예상 추론 비용 (ms, 앙상블 엔진 스케줄링용 초기값)
+    cost_per_frame_ms = 4.0
+    
     def __init__(self):
         self.model = None
         self.device = torch.device("cpu")
@@ -91,6 +93,14 @@ class MesoNetBackend:
         ])
         self.loading_lock = threading.Lock()
         self.model_loaded = False
+        self.runtime_profile = None
+    
+    def _optimize_for_cpu(self, stored_profile=None):
+        """CPU 런타임 설정 적용 (메모리 매핑 파일의 프로파일 또는 channels_last / oneDNN 자체 벤치마크)"""
+        example_input = torch.zeros(1, 3, 256, 256)
+        self.model, self.runtime_profile = optimize_model(
+            "mesonet", self.model, example_input, profile=stored_profile
+        )
     
     def load_model(self):
         """모델 로드"""
@@ -102,6 +112,8 @@ class MesoNetBackend:
                 return True
                 
             try:
+                configure_cpu_runtime()
+                
                 # 모델 구조 생성 (튜닝된 모델: 256x256 입력, dropout=0.4)
                 self.model = Meso4(num_classes=2, dropout_rate=0.4)
                 
@@ -113,34 +125,17 @@ class MesoNetBackend:
                     print(f"   1. 기존 컴퓨터에서 backend/weights/best_model_tuned.pt 파일을 복사")
                     print(f"   2. 또는 python backend/download_models.py 실행")
                     self.model.to(self.device).eval()
+                    self._optimize_for_cpu()
                     self.model_loaded = True
                     return True
                 
-                # 가중치 로드
-                checkpoint = torch.load(MESONET_WEIGHTS, map_location=self.device)
-                
-                # 체크포인트 구조에 따라 가중치 로드
-                if isinstance(checkpoint, dict):
-                    if 'model_state_dict' in checkpoint:
-                        state_dict = checkpoint['model_state_dict']
-                    elif 'state_dict' in checkpoint:
-                        state_dict = checkpoint['state_dict']
-                    elif 'model' in checkpoint:
-                        state_dict = checkpoint['model']
-                    else:
-                        state_dict = checkpoint
-                else:
-                    state_dict = checkpoint
-                
-                # state_dict 키 정리
-                cleaned_state_dict = {}
-                for k, v in state_dict.items():
-                    new_key = k.replace('module.', '').replace('model.', '')
-                    cleaned_state_dict[new_key] = v
-                
-                self.model.load_state_dict(cleaned_state_dict, strict=True)
+                # 가중치 로드 (메모리 매핑 파일이 있으면 워커 간 공유)
+                mmapped, stored_profile = load_weights_into(self.model, MESONET_WEIGHTS, strict=True)
+                if mmapped:
+                    print("[MesoNet] 메모리 매핑 가중치 사용")
                 self.model.to(self.device)
                 self.model.eval()
+                self._optimize_for_cpu(stored_profile)
                 
                 self.model_loaded = True
                 return True
@@ -171,23 +166,23 @@ class MesoNetBackend:
             # BGR -> RGB 변환
             image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             
-            # 얼굴 crop (옵션)
-            face_detected = True
-            if face_crop:
-                image, face_detected = self._crop_face(image)
-            
-            # PIL Image로 변환
-            pil_image = Image.fromarray(image)
-            
-            # 리사이즈 및 정규화
-            image_tensor = self.transform(pil_image).unsqueeze(0)
-            
-            return image_tensor.to(self.device), face_detected
+            image_tensor, face_detected = self._preprocess_rgb(image, face_crop)
+            return image_tensor.unsqueeze(0).to(self.device), face_detected
             
         except Exception as e:
             print(f"[MesoNet] 이미지 전처리 오류: {e}")
             raise
     
+    def _preprocess_rgb(self, image: np.ndarray, face_crop: bool = True):
+        """RGB 이미지 -> (3x256x256 텐서, 얼굴_감지_여부)"""
+        # 얼굴 crop (옵션)
+        face_detected = True
+        if face_crop:
+            image, face_detected = self._crop_face(image)
+        
+        # 리사이즈 및 정규화
+        return self.transform(Image.fromarray(image)), face_detected
+    
     def _crop_face(self, image: np.ndarray):
         """얼굴 영역 crop (화면 녹화 영상에 최적화)
         
@@ -287,6 +282,35 @@ class MesoNetBackend:
             print(f"[MesoNet] 얼굴 crop 오류: {e}, 원본 이미지 사용")
             return image, False
     
+    def load(self):
+        """앙상블 엔진 인터페이스: 모델 로드"""
+        return self.load_model()
+    
+    def estimate_cost(self, batch_size: int) -> float:
+        """앙상블 엔진 인터페이스: 배치 추론 예상 비용 (ms)"""
+        return self.cost_per_frame_ms * batch_size
+    
+    def preprocess_batch(self, images: list, face_crop: bool = True):
+        """
+        앙상블 엔진 인터페이스: RGB 이미지 배치 전처리
+        
+        Returns:
+            tuple: (Nx3x256x256 텐서 - 재사용 버퍼, 얼굴_감지_여부 리스트)
+        """
+        tensors = []
+        face_flags = []
+        for image in images:
+            tensor, face_detected = self._preprocess_rgb(image, face_crop)
+            tensors.append(tensor)
+            face_flags.append(face_detected)
+        return fill_input_buffer(self.name, tensors, self.runtime_profile), face_flags
+    
+    def infer_batch(self, batch: torch.Tensor) -> list:
+        """앙상블 엔진 인터페이스: 배치 추론 (프레임별 FAKE 확률 리스트)"""
+        with torch.inference_mode():
+            probs = F.softmax(self.model(batch), dim=1)
+        return probs[:, 1].tolist()
+    
     def predict(self, image_path: str, face_crop: bool = True):
         """
         이미지 예측
@@ -319,7 +343,8 @@ class MesoNetBackend:
                 }
             
             # 추론
-            with torch.no_grad():
+            image_tensor = prepare_input(image_tensor, self.runtime_profile)
+            with torch.inference_mode():
                 outputs = self.model(image_tensor)
                 probs = F.softmax(outputs, dim=1)
                 fake_prob = probs[0][1].item()  # FAKE 클래스 확률
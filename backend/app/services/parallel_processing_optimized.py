@@ -28,6 +28,11 @@ def get_optimal_workers(task_type: str = "cpu_intensive") -> int:
         # 혼합 작업: 중간값 사용
         return min((cpu_count + logical_count) // 2, 6)
 
+def _analyze_single_frame(frame: Dict) -> Dict:
+    """워커 프로세스에서 단일 프레임 분석 (pickle 가능하도록 모듈 수준 함수)"""
+    from app.services.deepfake_detector_optimized import predict_image
+    return {**predict_image(frame["path"]), "time": frame["time"]}
+
 def analyze_frames_optimized(frames: List[Dict], batch_size: int = 5, 
                            max_workers: int = None) -> List[Dict]:
     """
@@ -53,24 +58,19 @@ def analyze_frames_optimized(frames: List[Dict], batch_size: int = 5,
     results = []
     start_time = time.time()
     
-    # 프레임을 배치로 나누어 처리
-    for i in range(0, len(frames), batch_size):
-        batch = frames[i:i + batch_size]
-        batch_num = i // batch_size + 1
-        
-        print(f"배치 {batch_num} 처리 중... ({len(batch)}개 프레임)")
-        batch_start = time.time()
-        
-        # 작은 배치로 병렬 처리
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    # 워커 풀은 한 번만 생성하여 배치 사이에 모델을 다시 로드하지 않음
+    # 입력 텐서는 워커 안에서 재사용되므로 배치마다 gc.collect()를 호출하지 않음
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # 프레임을 배치로 나누어 처리
+        for i in range(0, len(frames), batch_size):
+            batch = frames[i:i + batch_size]
+            batch_num = i // batch_size + 1
+            
+            print(f"배치 {batch_num} 처리 중... ({len(batch)}개 프레임)")
+            batch_start = time.time()
+            
             try:
-                # analyze_single_frame 함수를 동적으로 임포트
-                from app.services.deepfake_detector_optimized import predict_image
-                
-                def analyze_single_frame(frame):
-                    return {**predict_image(frame["path"]), "time": frame["time"]}
-                
-                batch_results = list(executor.map(analyze_single_frame, batch))
+                batch_results = list(executor.map(_analyze_single_frame, batch))
                 results.extend(batch_results)
                 
             except Exception as e:
@@ -81,13 +81,9 @@ def analyze_frames_optimized(frames: List[Dict], batch_size: int = 5,
                         "error": str(e),
                         "time": frame["time"]
                     })
-        
-        batch_time = time.time() - batch_start
-        print(f"배치 {batch_num} 완료: {batch_time:.2f}초")
-        
-        # 메모리 정리
-        import gc
-        gc.collect()
+            
+            batch_time = time.time() - batch_start
+            print(f"배치 {batch_num} 완료: {batch_time:.2f}초")
     
     total_time = time.time() - start_time
     print(f"프레임 분석 완료: {len(results)}개 결과, 총 소요시간: {total_time:.2f}초")
@@ -0,0 +1,141 @@
+"""
+보고서 파일(PDF / Excel) 캐시
+
+같은 분석 결과에 대한 보고서는 한 번만 생성하고 이후 요청은 캐시 파일을 그대로 반환한다.
+- 키: 분석 ID + 결과 문서 해시 + 보고서 템플릿 버전 (결과가 다시 저장되면 새 키)
+- 전체 크기가 REPORT_CACHE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은 파일부터 삭제
+  (REPORT_CACHE_MIN_AGE_SEC 안에 반환한 파일은 전송 중일 수 있으므로 제외)
+- 파일은 임시 이름으로 생성 후 rename하여 다른 프로세스가 미완성 파일을 반환하지 않음
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict
+
+from app.core.config import (
+    REPORT_CACHE_DIR, REPORT_CACHE_MAX_BYTES, REPORT_CACHE_MIN_AGE_SEC, REPORT_TEMPLATE_VERSION
+)
+
+def result_version(data: Dict) -> str:
+    """결과 문서 내용 해시 (키 순서와 무관)"""
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+class ReportArtifactCache:
+    """분석 ID + 결과 버전으로 주소화한 보고서 파일 캐시 (크기 제한, LRU 삭제)"""
+
+    def __init__(self, directory: str = REPORT_CACHE_DIR, max_bytes: int = REPORT_CACHE_MAX_BYTES,
+                 min_age: float = REPORT_CACHE_MIN_AGE_SEC):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self._lock = threading.Lock()
+        self._key_locks = {}  # 파일명 -> 생성 Lock (같은 보고서 동시 생성 방지)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, kind: str, video_id: str, data: Dict) -> str:
+        key = f"{REPORT_TEMPLATE_VERSION}:{kind}:{video_id}:{result_version(data)}"
+        filename = f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.{kind}"
+        return os.path.join(self.directory, filename)
+
+    def get_or_create(self, kind: str, video_id: str, data: Dict,
+                      generate: Callable[[Dict, str], None]) -> str:
+        """
+        캐시된 보고서 경로 반환 (없으면 generate(data, output_path)로 생성)
+
+        Args:
+            kind: 파일 확장자 ("pdf" / "xlsx")
+            video_id: 분석 ID
+            data: 분석 결과 문서
+            generate: 보고서 생성 함수
+        """
+        path = self._path(kind, video_id, data)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(path, threading.Lock())
+
+        try:
+            with key_lock:
+                try:
+                    # 사용 시각 갱신 (LRU 삭제 기준, 갱신 후 min_age초 동안 삭제되지 않음)
+                    os.utime(path)
+                    with self._lock:
+                        self.hits += 1
+                    return path
+                except FileNotFoundError:
+                    pass
+
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = os.path.join(self.directory, f".{uuid.uuid4().hex}.{kind}")
+                try:
+                    generate(data, tmp_path)
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+                with self._lock:
+                    self.misses += 1
+                    self._evict(keep=path)
+                return path
+        finally:
+            with self._lock:
+                self._key_locks.pop(path, None)
+
+    def _evict(self, keep: str):
+        """
+        전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제
+
+        FileResponse는 응답 전송 시점에 파일을 열므로, 최근 min_age초 안에 반환한
+        (get_or_create에서 사용 시각을 갱신한) 파일은 상한을 넘더라도 남겨 둔다.
+        """
+        recent = time.time() - self.min_age
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if mtime > recent:
+                # 이후 파일은 모두 더 최근에 사용됨
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+
+    def get_status(self) -> Dict:
+        files = 0
+        total = 0
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.startswith("."):
+                    files += 1
+                    total += entry.stat().st_size
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "files": files,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+report_cache = ReportArtifactCache()
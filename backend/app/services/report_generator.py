@@ -5,10 +5,25 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 import openpyxl
+import copy
 import os
+import threading
 
-# 한글 폰트 등록 (Windows 시스템 폰트 사용)
+_korean_font_available = None
+_font_lock = threading.Lock()
+
+# 한글 폰트 등록 (Windows 시스템 폰트 사용, 프로세스당 한 번)
 def register_korean_fonts():
+    global _korean_font_available
+    if _korean_font_available is not None:
+        return _korean_font_available
+
+    with _font_lock:
+        if _korean_font_available is None:
+            _korean_font_available = _register_korean_fonts()
+        return _korean_font_available
+
+def _register_korean_fonts():
     try:
         # Windows 시스템 폰트 경로들
         font_paths = [
@@ -30,11 +45,74 @@ def register_korean_fonts():
         print(f"한글 폰트 등록 실패: {e}")
         return False
 
-def generate_pdf_report(data: dict, output_path: str):
-    # 한글 폰트 등록
-    korean_font_available = register_korean_fonts()
-    
-    doc = SimpleDocTemplate(output_path, pagesize=A4)
+# 보고서의 고정 문구 구간 (분석 결과와 무관, 프로세스당 한 번만 Paragraph로 변환)
+PDF_STATIC_SECTIONS = (
+    ("🔬 분석 방법론", (
+        "• AI 기반 딥페이크 탐지 모델 사용",
+        "• 영상을 프레임 단위로 분석",
+        "• 다중 모델 앙상블 방식 적용",
+        "• 각 프레임별 딥페이크 확률 계산",
+    )),
+    ("⚙️ 기술적 세부사항", (
+        "📋 사용된 AI 모델:",
+        "• Vision Transformer (ViT) 모델 1: Hugging Face 사전훈련 모델",
+        "• Vision Transformer (ViT) 모델 2: 딥페이크 탐지 특화 모델",
+        "• 앙상블 방식: 두 모델의 예측 결과를 가중평균으로 결합",
+        "🔧 분석 파라미터:",
+        "• 프레임 추출 주기: 동적 조정 (영상 길이에 따라 최적화)",
+        "• 이미지 전처리: 224x224 픽셀 리사이징, 정규화",
+        "• 신뢰도 임계값: 0.5 (50% 이상 시 딥페이크로 판정)",
+        "• 배치 처리: 메모리 효율성을 위한 프레임 그룹 처리",
+        "💻 시스템 요구사항:",
+        "• Python 3.8+ 환경",
+        "• PyTorch 딥러닝 프레임워크",
+        "• Transformers 라이브러리 (Hugging Face)",
+        "• GPU 가속 지원 (선택사항)",
+    )),
+    ("📊 모델 성능 지표", (
+        "🎯 정확도 지표:",
+        "• 전체 정확도: 94.2% (검증 데이터셋 기준)",
+        "• 딥페이크 탐지 정밀도: 92.8%",
+        "• 딥페이크 탐지 재현율: 95.6%",
+        "• F1-Score: 94.2%",
+        "📈 신뢰도 지표:",
+        "• 평균 신뢰도: 0.87 (0-1 스케일)",
+        "• 신뢰도 표준편차: 0.12",
+        "• 불확실성 구간: ±5% (95% 신뢰구간)",
+        "⚡ 처리 성능:",
+        "• 평균 처리 시간: 2.3초/초 (영상 길이 대비)",
+        "• 메모리 사용량: 최대 4GB RAM",
+        "• GPU 가속 시: 3-5배 성능 향상",
+        "📚 검증 데이터셋:",
+        "• 총 영상 수: 10,000개",
+        "• 딥페이크 영상: 5,000개 (50%)",
+        "• 실제 영상: 5,000개 (50%)",
+        "• 다양한 해상도: 480p ~ 4K",
+        "• 다양한 딥페이크 기법: FaceSwap, DeepFaceLab, First Order Motion 등",
+    )),
+    ("⚠️ 주의사항", (
+        "• 이 분석 결과는 참고용이며, 100% 정확하지 않을 수 있습니다.",
+        "• 딥페이크 기술이 발전함에 따라 탐지 정확도가 변할 수 있습니다.",
+        "• 중요한 결정을 내리기 전에 추가적인 검증을 권장합니다.",
+    )),
+)
+
+_pdf_styles = None
+_static_paragraphs = None
+_styles_lock = threading.Lock()
+
+def _get_pdf_styles():
+    """(제목, 소제목, 본문) 스타일 (폰트 등록 후 프로세스당 한 번 생성)"""
+    global _pdf_styles
+    if _pdf_styles is not None:
+        return _pdf_styles
+
+    with _styles_lock:
+        if _pdf_styles is None:
+            _pdf_styles = _build_pdf_styles(register_korean_fonts())
+        return _pdf_styles
+
+def _build_pdf_styles(korean_font_available: bool):
     styles = getSampleStyleSheet()
     
     # 한글 폰트가 사용 가능한 경우 스타일 수정
@@ -67,6 +145,38 @@ def generate_pdf_report(data: dict, output_path: str):
         korean_heading_style = styles['Heading2']
         korean_normal_style = styles['Normal']
     
+    return korean_title_style, korean_heading_style, korean_normal_style
+
+def _static_flowables():
+    """
+    고정 문구 구간의 Paragraph 목록 (프로세스당 한 번 파싱, 호출마다 얕은 복사본 반환)
+    
+    Paragraph는 레이아웃 계산(wrap / split) 중 자기 속성을 바꾸므로 원본은 그대로 두고
+    파싱 결과(frags)만 공유하는 복사본을 문서마다 새로 만든다.
+    """
+    global _static_paragraphs
+    if _static_paragraphs is None:
+        styles = _get_pdf_styles()
+        with _styles_lock:
+            if _static_paragraphs is None:
+                _static_paragraphs = _build_static_paragraphs(styles)
+    return [copy.copy(paragraph) for paragraph in _static_paragraphs]
+
+def _build_static_paragraphs(styles):
+    _, korean_heading_style, korean_normal_style = styles
+    paragraphs = []
+    for heading, lines in PDF_STATIC_SECTIONS:
+        paragraphs.append(Paragraph(heading, korean_heading_style))
+        paragraphs.extend(Paragraph(line, korean_normal_style) for line in lines)
+        paragraphs.append(Paragraph("", korean_normal_style))  # 빈 줄
+    return paragraphs
+
+def generate_pdf_report(data: dict, output_path: str):
+    # 스타일 / 고정 문구는 미리 만들어 둔 것을 사용하고 분석 결과 부분만 새로 구성
+    korean_title_style, korean_heading_style, korean_normal_style = _get_pdf_styles()
+    
+    doc = SimpleDocTemplate(output_path, pagesize=A4)
+    
     elements = []
 
     # 제목
@@ -133,79 +243,8 @@ def generate_pdf_report(data: dict, output_path: str):
     
     elements.append(Paragraph("", korean_normal_style))  # 빈 줄
     
-    # 분석 방법론
-    elements.append(Paragraph("🔬 분석 방법론", korean_heading_style))
-    elements.append(Paragraph("• AI 기반 딥페이크 탐지 모델 사용", korean_normal_style))
-    elements.append(Paragraph("• 영상을 프레임 단위로 분석", korean_normal_style))
-    elements.append(Paragraph("• 다중 모델 앙상블 방식 적용", korean_normal_style))
-    elements.append(Paragraph("• 각 프레임별 딥페이크 확률 계산", korean_normal_style))
-    
-    elements.append(Paragraph("", korean_normal_style))  # 빈 줄
-    
-    # 기술적 세부사항
-    elements.append(Paragraph("⚙️ 기술적 세부사항", korean_heading_style))
-    
-    # 사용된 모델 정보
-    elements.append(Paragraph("📋 사용된 AI 모델:", korean_normal_style))
-    elements.append(Paragraph("• Vision Transformer (ViT) 모델 1: Hugging Face 사전훈련 모델", korean_normal_style))
-    elements.append(Paragraph("• Vision Transformer (ViT) 모델 2: 딥페이크 탐지 특화 모델", korean_normal_style))
-    elements.append(Paragraph("• 앙상블 방식: 두 모델의 예측 결과를 가중평균으로 결합", korean_normal_style))
-    
-    # 분석 파라미터
-    elements.append(Paragraph("🔧 분석 파라미터:", korean_normal_style))
-    elements.append(Paragraph("• 프레임 추출 주기: 동적 조정 (영상 길이에 따라 최적화)", korean_normal_style))
-    elements.append(Paragraph("• 이미지 전처리: 224x224 픽셀 리사이징, 정규화", korean_normal_style))
-    elements.append(Paragraph("• 신뢰도 임계값: 0.5 (50% 이상 시 딥페이크로 판정)", korean_normal_style))
-    elements.append(Paragraph("• 배치 처리: 메모리 효율성을 위한 프레임 그룹 처리", korean_normal_style))
-    
-    # 시스템 요구사항
-    elements.append(Paragraph("💻 시스템 요구사항:", korean_normal_style))
-    elements.append(Paragraph("• Python 3.8+ 환경", korean_normal_style))
-    elements.append(Paragraph("• PyTorch 딥러닝 프레임워크", korean_normal_style))
-    elements.append(Paragraph("• Transformers 라이브러리 (Hugging Face)", korean_normal_style))
-    elements.append(Paragraph("• GPU 가속 지원 (선택사항)", korean_normal_style))
-    
-    elements.append(Paragraph("", korean_normal_style))  # 빈 줄
-    
-    # 모델 성능 지표
-    elements.append(Paragraph("📊 모델 성능 지표", korean_heading_style))
-    
-    # 정확도 지표
-    elements.append(Paragraph("🎯 정확도 지표:", korean_normal_style))
-    elements.append(Paragraph("• 전체 정확도: 94.2% (검증 데이터셋 기준)", korean_normal_style))
-    elements.append(Paragraph("• 딥페이크 탐지 정밀도: 92.8%", korean_normal_style))
-    elements.append(Paragraph("• 딥페이크 탐지 재현율: 95.6%", korean_normal_style))
-    elements.append(Paragraph("• F1-Score: 94.2%", korean_normal_style))
-    
-    # 신뢰도 지표
-    elements.append(Paragraph("📈 신뢰도 지표:", korean_normal_style))
-    elements.append(Paragraph("• 평균 신뢰도: 0.87 (0-1 스케일)", korean_normal_style))
-    elements.append(Paragraph("• 신뢰도 표준편차: 0.12", korean_normal_style))
-    elements.append(Paragraph("• 불확실성 구간: ±5% (95% 신뢰구간)", korean_normal_style))
-    
-    # 처리 성능
-    elements.append(Paragraph("⚡ 처리 성능:", korean_normal_style))
-    elements.append(Paragraph("• 평균 처리 시간: 2.3초/초 (영상 길이 대비)", korean_normal_style))
-    elements.append(Paragraph("• 메모리 사용량: 최대 4GB RAM", korean_normal_style))
-    elements.append(Paragraph("• GPU 가속 시: 3-5배 성능 향상", korean_normal_style))
-    
-    # 검증 데이터셋 정보
-    elements.append(Paragraph("📚 검증 데이터셋:", korean_normal_style))
-    elements.append(Paragraph("• 총 영상 수: 10,000개", korean_normal_style))
-    elements.append(Paragraph("• 딥페이크 영상: 5,000개 (50%)", korean_normal_style))
-    elements.append(Paragraph("• 실제 영상: 5,000개 (50%)", korean_normal_style))
-    elements.append(Paragraph("• 다양한 해상도: 480p ~ 4K", korean_normal_style))
-    elements.append(Paragraph("• 다양한 딥페이크 기법: FaceSwap, DeepFaceLab, First Order Motion 등", korean_normal_style))
-    
-    elements.append(Paragraph("", korean_normal_style))  # 빈 줄
-    
-    # 주의사항
-    elements.append(Paragraph("⚠️ 주의사항", korean_heading_style))
-    elements.append(Paragraph("• 이 분석 결과는 참고용이며, 100% 정확하지 않을 수 있습니다.", korean_normal_style))
-    elements.append(Paragraph("• 딥페이크 기술이 발전함에 따라 탐지 정확도가 변할 수 있습니다.", korean_normal_style))
-    elements.append(Paragraph("• 중요한 결정을 내리기 전에 추가적인 검증을 권장합니다.", korean_normal_style))
-    
-    elements.append(Paragraph("", korean_normal_style))  # 빈 줄
+    # 분석 방법론 / 기술적 세부사항 / 모델 성능 지표 / 주의사항 (고정 문구)
+    elements.extend(_static_flowables())
     
     # 보고서 생성 정보
     elements.append(Paragraph("📋 보고서 정보", korean_heading_style))
@@ -215,6 +254,51 @@ def generate_pdf_report(data: dict, output_path: str):
     doc.build(elements)
     return output_path
 
+# 요약 시트의 고정 문구 행 (빈 리스트는 빈 행)
+EXCEL_STATIC_ROWS = (
+    ["🔬 분석 방법론"],
+    ["분석 방식", "AI 기반 딥페이크 탐지 모델 사용"],
+    ["분석 단위", "영상을 프레임 단위로 분석"],
+    ["모델 방식", "다중 모델 앙상블 방식 적용"],
+    ["확률 계산", "각 프레임별 딥페이크 확률 계산"],
+    [],
+    ["⚙️ 기술적 세부사항"],
+    ["AI 모델 1", "Vision Transformer (ViT) - Hugging Face 사전훈련 모델"],
+    ["AI 모델 2", "Vision Transformer (ViT) - 딥페이크 탐지 특화 모델"],
+    ["앙상블 방식", "두 모델의 예측 결과를 가중평균으로 결합"],
+    ["프레임 추출", "동적 조정 (영상 길이에 따라 최적화)"],
+    ["이미지 전처리", "224x224 픽셀 리사이징, 정규화"],
+    ["신뢰도 임계값", "0.5 (50% 이상 시 딥페이크로 판정)"],
+    ["배치 처리", "메모리 효율성을 위한 프레임 그룹 처리"],
+    ["Python 버전", "3.8+ 환경"],
+    ["딥러닝 프레임워크", "PyTorch"],
+    ["라이브러리", "Transformers (Hugging Face)"],
+    ["GPU 가속", "선택사항 (3-5배 성능 향상)"],
+    [],
+    ["📊 모델 성능 지표"],
+    ["전체 정확도", "94.2% (검증 데이터셋 기준)"],
+    ["딥페이크 탐지 정밀도", "92.8%"],
+    ["딥페이크 탐지 재현율", "95.6%"],
+    ["F1-Score", "94.2%"],
+    ["평균 신뢰도", "0.87 (0-1 스케일)"],
+    ["신뢰도 표준편차", "0.12"],
+    ["불확실성 구간", "±5% (95% 신뢰구간)"],
+    ["평균 처리 시간", "2.3초/초 (영상 길이 대비)"],
+    ["메모리 사용량", "최대 4GB RAM"],
+    [],
+    ["📚 검증 데이터셋"],
+    ["총 영상 수", "10,000개"],
+    ["딥페이크 영상", "5,000개 (50%)"],
+    ["실제 영상", "5,000개 (50%)"],
+    ["해상도 범위", "480p ~ 4K"],
+    ["딥페이크 기법", "FaceSwap, DeepFaceLab, First Order Motion 등"],
+    [],
+    ["⚠️ 주의사항"],
+    ["정확도", "이 분석 결과는 참고용이며, 100% 정확하지 않을 수 있습니다."],
+    ["기술 발전", "딥페이크 기술이 발전함에 따라 탐지 정확도가 변할 수 있습니다."],
+    ["추가 검증", "중요한 결정을 내리기 전에 추가적인 검증을 권장합니다."],
+)
+
 def generate_excel_report(data: dict, output_path: str):
     wb = openpyxl.Workbook()
     
@@ -262,60 +346,9 @@ def generate_excel_report(data: dict, output_path: str):
     
     ws_summary.append([])  # 빈 행
     
-    # 분석 방법론
-    ws_summary.append(["🔬 분석 방법론"])
-    ws_summary.append(["분석 방식", "AI 기반 딥페이크 탐지 모델 사용"])
-    ws_summary.append(["분석 단위", "영상을 프레임 단위로 분석"])
-    ws_summary.append(["모델 방식", "다중 모델 앙상블 방식 적용"])
-    ws_summary.append(["확률 계산", "각 프레임별 딥페이크 확률 계산"])
-    
-    ws_summary.append([])  # 빈 행
-    
-    # 기술적 세부사항
-    ws_summary.append(["⚙️ 기술적 세부사항"])
-    ws_summary.append(["AI 모델 1", "Vision Transformer (ViT) - Hugging Face 사전훈련 모델"])
-    ws_summary.append(["AI 모델 2", "Vision Transformer (ViT) - 딥페이크 탐지 특화 모델"])
-    ws_summary.append(["앙상블 방식", "두 모델의 예측 결과를 가중평균으로 결합"])
-    ws_summary.append(["프레임 추출", "동적 조정 (영상 길이에 따라 최적화)"])
-    ws_summary.append(["이미지 전처리", "224x224 픽셀 리사이징, 정규화"])
-    ws_summary.append(["신뢰도 임계값", "0.5 (50% 이상 시 딥페이크로 판정)"])
-    ws_summary.append(["배치 처리", "메모리 효율성을 위한 프레임 그룹 처리"])
-    ws_summary.append(["Python 버전", "3.8+ 환경"])
-    ws_summary.append(["딥러닝 프레임워크", "PyTorch"])
-    ws_summary.append(["라이브러리", "Transformers (Hugging Face)"])
-    ws_summary.append(["GPU 가속", "선택사항 (3-5배 성능 향상)"])
-    
-    ws_summary.append([])  # 빈 행
-    
-    # 모델 성능 지표
-    ws_summary.append(["📊 모델 성능 지표"])
-    ws_summary.append(["전체 정확도", "94.2% (검증 데이터셋 기준)"])
-    ws_summary.append(["딥페이크 탐지 정밀도", "92.8%"])
-    ws_summary.append(["딥페이크 탐지 재현율", "95.6%"])
-    ws_summary.append(["F1-Score", "94.2%"])
-    ws_summary.append(["평균 신뢰도", "0.87 (0-1 스케일)"])
-    ws_summary.append(["신뢰도 표준편차", "0.12"])
-    ws_summary.append(["불확실성 구간", "±5% (95% 신뢰구간)"])
-    ws_summary.append(["평균 처리 시간", "2.3초/초 (영상 길이 대비)"])
-    ws_summary.append(["메모리 사용량", "최대 4GB RAM"])
-    
-    ws_summary.append([])  # 빈 행
-    
-    # 검증 데이터셋 정보
-    ws_summary.append(["📚 검증 데이터셋"])
-    ws_summary.append(["총 영상 수", "10,000개"])
-    ws_summary.append(["딥페이크 영상", "5,000개 (50%)"])
-    ws_summary.append(["실제 영상", "5,000개 (50%)"])
-    ws_summary.append(["해상도 범위", "480p ~ 4K"])
-    ws_summary.append(["딥페이크 기법", "FaceSwap, DeepFaceLab, First Order Motion 등"])
-    
-    ws_summary.append([])  # 빈 행
-    
-    # 주의사항
-    ws_summary.append(["⚠️ 주의사항"])
-    ws_summary.append(["정확도", "이 분석 결과는 참고용이며, 100% 정확하지 않을 수 있습니다."])
-    ws_summary.append(["기술 발전", "딥페이크 기술이 발전함에 따라 탐지 정확도가 변할 수 있습니다."])
-    ws_summary.append(["추가 검증", "중요한 결정을 내리기 전에 추가적인 검증을 권장합니다."])
+    # 분석 방법론 / 기술적 세부사항 / 모델 성능 지표 / 검증 데이터셋 / 주의사항 (고정 문구)
+    for row in EXCEL_STATIC_ROWS:
+        ws_summary.append(list(row))
     
     # 타임라인 시트
     timeline = data.get('timeline', [])
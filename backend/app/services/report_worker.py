@@ -0,0 +1,56 @@
+"""
+보고서 생성 작업자 풀
+
+PDF / Excel 생성(ReportLab / openpyxl, CPU 작업)은 요청 스레드(이벤트 루프)가 아닌
+REPORT_WORKERS개 스레드의 전용 실행기에서 수행하며, 결과는 report_cache에 저장한다.
+- render_report(): 다운로드 요청 - 캐시에 있으면 바로 경로 반환, 없으면 작업자 풀에서 생성 후 반환
+- schedule_reports(): 분석 완료 시 PDF / Excel을 미리 생성 (첫 다운로드도 캐시 적중)
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from app.core.config import REPORT_WORKERS, REPORT_EAGER_KINDS
+from app.services.report_cache import report_cache
+
+_report_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="report")
+
+def _generator(kind: str):
+    # reportlab / openpyxl은 첫 보고서 생성 시점에 import
+    from app.services.report_generator import generate_pdf_report, generate_excel_report
+    return {"pdf": generate_pdf_report, "xlsx": generate_excel_report}[kind]
+
+def _render_sync(kind: str, video_id: str, data: Dict) -> str:
+    return report_cache.get_or_create(kind, video_id, data, _generator(kind))
+
+async def render_report(kind: str, video_id: str, data: Dict) -> str:
+    """
+    보고서 파일 경로 (캐시에 없으면 작업자 풀에서 생성)
+
+    Args:
+        kind: "pdf" / "xlsx"
+        video_id: 분석 ID
+        data: 분석 결과 문서
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_report_executor, _render_sync, kind, video_id, data)
+
+def _render_eagerly(kind: str, video_id: str, data: Dict):
+    try:
+        _render_sync(kind, video_id, data)
+        print(f"[ReportWorker] {video_id} {kind} 보고서 미리 생성 완료")
+    except Exception as e:
+        print(f"[ReportWorker] {video_id} {kind} 보고서 미리 생성 실패: {e}")
+
+def schedule_reports(video_id: str, data: Dict):
+    """
+    분석 완료 직후 REPORT_EAGER_KINDS 보고서를 작업자 풀에서 미리 생성 (완료를 기다리지 않음)
+
+    data는 저장한 결과 문서와 같은 내용이어야 다운로드 요청 시 같은 캐시 키가 된다.
+    """
+    for kind in REPORT_EAGER_KINDS:
+        _report_executor.submit(_render_eagerly, kind, video_id, data)
+
+def shutdown_report_workers():
+    """대기 중인 미리 생성 작업은 취소하고 진행 중인 작업만 마무리"""
+    _report_executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,485 @@
+"""
+분석 결과 저장소
+
+모든 저장소는 같은 비동기 인터페이스를 가진다:
+- save(result_id, result): 결과 저장 (같은 ID면 덮어씀)
+- get(result_id): 결과 조회 (없으면 None)
+- get_many(result_ids): 여러 결과를 한 번에 조회 ({result_id: 결과}, 없는 ID는 제외)
+- query(...): 필터(사용자 / 기간 / 판정)에 맞는 결과를 (analysis_timestamp, id) 순서로 페이지 조회
+- flush(): 진행 중인 저장 완료 대기
+- get_status(): 저장소 상태
+
+컬렉션별로 저장소가 하나씩 있다 (analysis_results: 요약 결과, analysis_frames: 프레임별 점수 부가 기록).
+
+구현:
+- SQLiteResultStore: 로컬 내장 저장소 (온프레미스 / 테스트용, 외부 서비스 불필요)
+- FirestoreResultStore: Firestore 어댑터
+- WriteBehindResultStore: 다른 저장소를 감싸 저장 완료를 기다리지 않고 반환
+- CachedResultStore: 다른 저장소를 감싸 조회 결과를 TTL / LRU 캐시 (저장 시 무효화, 동시 조회는 한 번만 수행)
+
+블로킹 호출(SQLite / Firestore 네트워크 왕복)은 제한된 실행기에서 수행하여 이벤트 루프를 막지 않는다.
+"""
+import asyncio
+import copy
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import (
+    RESULT_STORE_BACKEND, RESULT_STORE_SQLITE_PATH, RESULT_STORE_WORKERS,
+    RESULT_STORE_WRITE_BEHIND, RESULT_STORE_WRITE_RETRIES, RESULT_STORE_RETRY_DELAY_SEC,
+    RESULT_CACHE_ENABLED, RESULT_CACHE_TTL_SEC, RESULT_CACHE_MAX_ENTRIES
+)
+
+ANALYSIS_COLLECTION = "analysis_results"
+FRAME_COLLECTION = "analysis_frames"
+
+# query() 정렬 / 커서 기준 필드 (커서는 마지막 결과의 (analysis_timestamp, id))
+QUERY_ORDER_FIELD = "analysis_timestamp"
+QUERY_LABEL_FIELD = "video_analysis.overall_result"
+
+# 저장소 호출 전용 실행기 (동시 호출 수 상한)
+_store_executor = ThreadPoolExecutor(max_workers=RESULT_STORE_WORKERS, thread_name_prefix="result-store")
+
+async def _run_blocking(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_store_executor, fn, *args)
+
+class ResultStore(ABC):
+    """분석 결과 저장소 인터페이스 (save / get / query 미구현 저장소는 생성 시점에 TypeError)"""
+
+    name = "base"
+
+    @abstractmethod
+    async def save(self, result_id: str, result: Dict):
+        """결과 저장 (같은 ID면 덮어씀)"""
+
+    @abstractmethod
+    async def get(self, result_id: str) -> Optional[Dict]:
+        """결과 조회 (없으면 None)"""
+
+    async def get_many(self, result_ids: List[str]) -> Dict[str, Dict]:
+        results = {}
+        for result_id in result_ids:
+            result = await self.get(result_id)
+            if result is not None:
+                results[result_id] = result
+        return results
+
+    @abstractmethod
+    async def query(self, user_id: Optional[str] = None, label: Optional[str] = None,
+                    since: Optional[str] = None, until: Optional[str] = None,
+                    after: Optional[Tuple[str, str]] = None, limit: int = 100) -> List[Tuple[str, Dict]]:
+        """
+        필터에 맞는 결과 페이지 조회 (keyset 페이지네이션)
+
+        Args:
+            user_id: 사용자 ID
+            label: 영상 판정 (video_analysis.overall_result, "FAKE" / "REAL")
+            since / until: analysis_timestamp 범위 [since, until) (ISO 8601 문자열)
+            after: 이전 페이지 마지막 결과의 (analysis_timestamp, id) - 그 다음부터 조회
+            limit: 페이지 크기
+
+        Returns:
+            [(result_id, 결과), ...] (analysis_timestamp, id 오름차순)
+        """
+
+    async def flush(self):
+        """진행 중인 저장 완료 대기 (동기 저장소는 no-op)"""
+
+    def get_status(self) -> Dict:
+        return {"backend": self.name}
+
+class SQLiteResultStore(ResultStore):
+    """SQLite 로컬 저장소 (컬렉션별 테이블, JSON 문서, WAL 모드, 스레드별 연결)"""
+
+    name = "sqlite"
+
+    def __init__(self, collection: str = ANALYSIS_COLLECTION, path: str = RESULT_STORE_SQLITE_PATH):
+        self.collection = collection
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.collection} ("
+                "id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """실행기 스레드별 연결 (연결은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _save_sync(self, result_id: str, result: Dict):
+        data = json.dumps(result, ensure_ascii=False, default=str)
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.collection} (id, data, updated_at) VALUES (?, ?, ?)",
+                (result_id, data, time.time())
+            )
+
+    def _get_sync(self, result_id: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            f"SELECT data FROM {self.collection} WHERE id = ?", (result_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _get_many_sync(self, result_ids: List[str]) -> Dict[str, Dict]:
+        results = {}
+        conn = self._connect()
+        # SQLite 바인딩 변수 수 제한 안에서 나누어 조회
+        for i in range(0, len(result_ids), 500):
+            chunk = result_ids[i:i + 500]
+            rows = conn.execute(
+                f"SELECT id, data FROM {self.collection} WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            results.update((result_id, json.loads(data)) for result_id, data in rows)
+        return results
+
+    def _query_sync(self, user_id, label, since, until, after, limit) -> List[Tuple[str, Dict]]:
+        order = f"COALESCE(json_extract(data, '$.{QUERY_ORDER_FIELD}'), '')"
+        conditions = []
+        params = []
+        if user_id is not None:
+            conditions.append("json_extract(data, '$.user_id') = ?")
+            params.append(user_id)
+        if label is not None:
+            conditions.append(f"json_extract(data, '$.{QUERY_LABEL_FIELD}') = ?")
+            params.append(label)
+        if since is not None:
+            conditions.append(f"{order} >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append(f"{order} < ?")
+            params.append(until)
+        if after is not None:
+            conditions.append(f"({order} > ? OR ({order} = ? AND id > ?))")
+            params.extend([after[0], after[0], after[1]])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connect().execute(
+            f"SELECT id, data FROM {self.collection} {where} ORDER BY {order}, id LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [(result_id, json.loads(data)) for result_id, data in rows]
+
+    async def save(self, result_id: str, result: Dict):
+        await _run_blocking(self._save_sync, result_id, result)
+
+    async def get(self, result_id: str) -> Optional[Dict]:
+        return await _run_blocking(self._get_sync, result_id)
+
+    async def get_many(self, result_ids: List[str]) -> Dict[str, Dict]:
+        return await _run_blocking(self._get_many_sync, list(result_ids))
+
+    async def query(self, user_id=None, label=None, since=None, until=None, after=None, limit=100):
+        return await _run_blocking(self._query_sync, user_id, label, since, until, after, limit)
+
+    def get_status(self) -> Dict:
+        return {"backend": self.name, "collection": self.collection, "path": self.path}
+
+class FirestoreResultStore(ResultStore):
+    """Firestore 어댑터 (동기 클라이언트 호출을 실행기에서 수행)"""
+
+    name = "firestore"
+
+    def __init__(self, collection: str = ANALYSIS_COLLECTION):
+        self.collection = collection
+
+    def _document(self, result_id: str):
+        from app.core.firebase import get_db
+        return get_db().collection(self.collection).document(result_id)
+
+    def _save_sync(self, result_id: str, result: Dict):
+        self._document(result_id).set(result)
+
+    def _get_sync(self, result_id: str) -> Optional[Dict]:
+        doc = self._document(result_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def _get_many_sync(self, result_ids: List[str]) -> Dict[str, Dict]:
+        from app.core.firebase import get_db
+        # get_all: 여러 문서를 한 번의 배치 읽기로 조회
+        docs = get_db().get_all([self._document(result_id) for result_id in result_ids])
+        return {doc.id: doc.to_dict() for doc in docs if doc.exists}
+
+    def _query_sync(self, user_id, label, since, until, after, limit) -> List[Tuple[str, Dict]]:
+        """(analysis_timestamp, __name__) 정렬 쿼리 (필터 조합별 복합 색인 필요)"""
+        from app.core.firebase import get_db
+        from firebase_admin import firestore
+
+        collection = get_db().collection(self.collection)
+        query = collection
+        if user_id is not None:
+            query = query.where("user_id", "==", user_id)
+        if label is not None:
+            query = query.where(QUERY_LABEL_FIELD, "==", label)
+        if since is not None:
+            query = query.where(QUERY_ORDER_FIELD, ">=", since)
+        if until is not None:
+            query = query.where(QUERY_ORDER_FIELD, "<", until)
+        query = query.order_by(QUERY_ORDER_FIELD).order_by(firestore.FieldPath.document_id())
+        if after is not None:
+            query = query.start_after({
+                QUERY_ORDER_FIELD: after[0],
+                firestore.FieldPath.document_id(): collection.document(after[1])
+            })
+        return [(doc.id, doc.to_dict()) for doc in query.limit(limit).stream()]
+
+    async def save(self, result_id: str, result: Dict):
+        await _run_blocking(self._save_sync, result_id, result)
+
+    async def get(self, result_id: str) -> Optional[Dict]:
+        return await _run_blocking(self._get_sync, result_id)
+
+    async def get_many(self, result_ids: List[str]) -> Dict[str, Dict]:
+        return await _run_blocking(self._get_many_sync, list(result_ids))
+
+    async def query(self, user_id=None, label=None, since=None, until=None, after=None, limit=100):
+        return await _run_blocking(self._query_sync, user_id, label, since, until, after, limit)
+
+    def get_status(self) -> Dict:
+        return {"backend": self.name, "collection": self.collection}
+
+class WriteBehindResultStore(ResultStore):
+    """
+    write-behind 래퍼
+
+    save()는 결과를 대기 목록에 넣고 바로 반환하며, ID별 백그라운드 작업이 최신 결과를 저장한다.
+    - 같은 ID를 연속 저장하면 마지막 결과만 저장될 수 있음 (중간 결과는 건너뜀)
+    - 저장 완료 전 조회는 대기 목록에서 반환 (같은 프로세스 안에서 read-your-writes)
+    - 실패 시 RESULT_STORE_WRITE_RETRIES번 재시도 후 포기
+    """
+
+    def __init__(self, backend: ResultStore,
+                 retries: int = RESULT_STORE_WRITE_RETRIES,
+                 retry_delay: float = RESULT_STORE_RETRY_DELAY_SEC):
+        self.backend = backend
+        self.name = f"{backend.name}+write_behind"
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._versions = itertools.count()
+        self._pending = {}  # result_id -> (버전, 결과)
+        self._tasks = {}  # result_id -> 저장 작업
+        self.written = 0
+        self.failed = 0
+
+    async def save(self, result_id: str, result: Dict):
+        self._pending[result_id] = (next(self._versions), result)
+        if result_id not in self._tasks:
+            self._tasks[result_id] = asyncio.create_task(self._drain(result_id))
+
+    async def _drain(self, result_id: str):
+        """대기 목록이 빌 때까지 해당 ID의 최신 결과 저장"""
+        try:
+            while result_id in self._pending:
+                version, result = self._pending[result_id]
+                for attempt in range(self.retries + 1):
+                    try:
+                        await self.backend.save(result_id, result)
+                        self.written += 1
+                        break
+                    except Exception as e:
+                        print(f"[ResultStore] {result_id} 저장 실패 ({attempt + 1}/{self.retries + 1}): {e}")
+                        if attempt < self.retries:
+                            await asyncio.sleep(self.retry_delay * (attempt + 1))
+                else:
+                    self.failed += 1
+                # 저장 중 새 결과가 들어오지 않았으면 대기 목록에서 제거
+                if self._pending.get(result_id, (None,))[0] == version:
+                    del self._pending[result_id]
+        finally:
+            self._tasks.pop(result_id, None)
+
+    async def get(self, result_id: str) -> Optional[Dict]:
+        pending = self._pending.get(result_id)
+        if pending is not None:
+            return pending[1]
+        return await self.backend.get(result_id)
+
+    async def get_many(self, result_ids: List[str]) -> Dict[str, Dict]:
+        # 대기 목록을 먼저 복사 (조회를 기다리는 동안 저장이 끝나 대기 목록에서 빠져도 결과에 포함)
+        pending = {result_id: self._pending[result_id][1] for result_id in result_ids if result_id in self._pending}
+        results = await self.backend.get_many([result_id for result_id in result_ids if result_id not in pending])
+        results.update(pending)
+        return results
+
+    async def query(self, user_id: Optional[str] = None, label: Optional[str] = None,
+                    since: Optional[str] = None, until: Optional[str] = None,
+                    after: Optional[Tuple[str, str]] = None, limit: int = 100) -> List[Tuple[str, Dict]]:
+        """저장 완료된 결과만 조회 (대기 중인 결과는 다음 조회에 포함)"""
+        return await self.backend.query(user_id, label, since, until, after, limit)
+
+    async def flush(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+        await self.backend.flush()
+
+    def get_status(self) -> Dict:
+        return {
+            **self.backend.get_status(),
+            "write_behind": True,
+            "pending": len(self._pending),
+            "written": self.written,
+            "failed": self.failed
+        }
+
+class CachedResultStore(ResultStore):
+    """
+    read-through 캐시 래퍼 (이벤트 루프 안에서만 사용)
+
+    - 조회 결과를 ttl초 동안 최대 max_entries개 보관 (LRU), 없는 결과(None)는 캐시하지 않음
+    - 같은 ID의 동시 조회는 저장소 조회 한 번으로 합침 (single-flight)
+    - 같은 프로세스의 save()는 캐시를 무효화하며, 저장 전에 시작된 조회 결과는 캐시에 넣지 않음
+    - 호출자가 결과를 수정해도 캐시가 바뀌지 않도록 복사본을 반환
+    """
+
+    def __init__(self, backend: ResultStore,
+                 ttl: float = RESULT_CACHE_TTL_SEC,
+                 max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.backend = backend
+        self.name = f"{backend.name}+cache"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # result_id -> (만료 시각, 결과)
+        self._inflight = {}  # result_id -> 조회 작업
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def _invalidate(self, result_id: str):
+        self._entries.pop(result_id, None)
+        # 진행 중인 조회는 저장 이전 결과일 수 있으므로 이후 조회와 분리
+        self._inflight.pop(result_id, None)
+
+    async def save(self, result_id: str, result: Dict):
+        self._invalidate(result_id)
+        try:
+            await self.backend.save(result_id, result)
+        finally:
+            self._invalidate(result_id)
+            self.invalidations += 1
+
+    async def _fetch(self, result_id: str) -> Optional[Dict]:
+        task = asyncio.current_task()
+        try:
+            result = await self.backend.get(result_id)
+        finally:
+            current = self._inflight.get(result_id) is task
+            if current:
+                del self._inflight[result_id]
+        if result is not None and current:
+            self._entries[result_id] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(result_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    async def get(self, result_id: str) -> Optional[Dict]:
+        entry = self._entries.get(result_id)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(result_id)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            del self._entries[result_id]
+
+        task = self._inflight.get(result_id)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._fetch(result_id))
+            self._inflight[result_id] = task
+        else:
+            self.coalesced += 1
+        # 한 요청이 취소되어도 같은 조회를 기다리는 다른 요청에는 영향 없음
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    async def get_many(self, result_ids: List[str]) -> Dict[str, Dict]:
+        """대량 조회는 캐시를 채우지 않음 (내보내기 등 일회성 조회가 LRU를 밀어내지 않도록)"""
+        return await self.backend.get_many(result_ids)
+
+    async def query(self, user_id: Optional[str] = None, label: Optional[str] = None,
+                    since: Optional[str] = None, until: Optional[str] = None,
+                    after: Optional[Tuple[str, str]] = None, limit: int = 100) -> List[Tuple[str, Dict]]:
+        """조회 결과는 캐시하지 않음 (페이지 조회는 일회성)"""
+        return await self.backend.query(user_id, label, since, until, after, limit)
+
+    async def flush(self):
+        await self.backend.flush()
+
+    def get_status(self) -> Dict:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            **self.backend.get_status(),
+            "cache": {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "invalidations": self.invalidations,
+                "hit_rate": round((self.hits + self.coalesced) / total, 4) if total else 0.0
+            }
+        }
+
+STORE_CLASSES = {
+    store_class.name: store_class
+    for store_class in (SQLiteResultStore, FirestoreResultStore)
+}
+
+_stores = {}
+_store_lock = threading.Lock()
+
+def get_result_store(collection: str = ANALYSIS_COLLECTION) -> ResultStore:
+    """
+    설정(RESULT_STORE_BACKEND / RESULT_STORE_WRITE_BEHIND / RESULT_CACHE_ENABLED)에 따른 컬렉션 저장소 (프로세스당 하나)
+
+    Args:
+        collection: ANALYSIS_COLLECTION(요약 결과) 또는 FRAME_COLLECTION(프레임별 점수)
+    """
+    store = _stores.get(collection)
+    if store is not None:
+        return store
+
+    with _store_lock:
+        store = _stores.get(collection)
+        if store is not None:
+            return store
+
+        store_class = STORE_CLASSES.get(RESULT_STORE_BACKEND)
+        if store_class is None:
+            raise ValueError(f"알 수 없는 결과 저장소: {RESULT_STORE_BACKEND}")
+        store = store_class(collection)
+        if RESULT_STORE_WRITE_BEHIND:
+            store = WriteBehindResultStore(store)
+        if RESULT_CACHE_ENABLED:
+            store = CachedResultStore(store)
+        print(f"[ResultStore] {collection} 저장소: {store.name}")
+        _stores[collection] = store
+        return store
+
+async def flush_result_stores():
+    """모든 컬렉션 저장소의 진행 중인 저장 완료 대기"""
+    for store in list(_stores.values()):
+        await store.flush()
+
+def get_result_store_status() -> dict:
+    """컬렉션별 저장소 상태"""
+    return {collection: store.get_status() for collection, store in _stores.items()}
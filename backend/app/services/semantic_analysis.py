@@ -0,0 +1,218 @@
+"""
+음성-텍스트 의미적 불일치 분석
+
+- 문장 분리: 마침표가 적은 한국어 전사문을 위해 종결 부호 / 줄바꿈 / 종결 어미와 쉼표 뒤에서 분리하고,
+  너무 짧은 조각은 앞 문장에 합치고 너무 긴 문장은 공백 기준으로 나누어 문장 수를 안정화
+- 임베딩 캐시: 문장 텍스트 해시 키 LRU (재업로드 영상의 반복 문장은 다시 인코딩하지 않음)
+- 요청 간 배치: 동시에 들어온 요청들의 미캐시 문장을 모아 encode 한 번으로 처리
+- 유사도: 정규화 임베딩 행렬에서 NumPy로 인접 문장 유사도 / 전체 유사도 행렬 계산
+"""
+import hashlib
+import queue
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import (
+    SEMANTIC_CACHE_SIZE, SEMANTIC_BATCH_WAIT_MS, SEMANTIC_MAX_BATCH,
+    SEMANTIC_MIN_SENTENCE_CHARS, SEMANTIC_MAX_SENTENCE_CHARS, SEMANTIC_MISMATCH_THRESHOLD
+)
+
+# 종결 부호(숫자 사이 소수점 제외) / 줄바꿈 / 한국어 종결 어미(다, 요, 죠, 까) + 쉼표 뒤 공백
+# (어미 뒤 공백만으로는 나누지 않음: "바다 위에서"가 분리되지 않도록)
+_SENTENCE_BOUNDARY = re.compile(
+    r"(?<=[.?!。？！…])(?![.?!。？！…])(?!(?<=\d\.)\d)\s*|\n+|(?<=[다요죠까][,，])\s+"
+)
+
+def split_sentences(text: str) -> List[str]:
+    """전사문 -> 문장 목록 (짧은 조각 병합, 긴 문장 분할)"""
+    pieces = [piece.strip() for piece in _SENTENCE_BOUNDARY.split(text) if piece and piece.strip()]
+
+    sentences = []
+    for piece in pieces:
+        if sentences and len(piece) < SEMANTIC_MIN_SENTENCE_CHARS:
+            sentences[-1] = f"{sentences[-1]} {piece}"
+            continue
+        # 너무 긴 문장은 공백 기준으로 나눔
+        while len(piece) > SEMANTIC_MAX_SENTENCE_CHARS:
+            cut = piece.rfind(" ", 0, SEMANTIC_MAX_SENTENCE_CHARS)
+            cut = cut if cut > 0 else SEMANTIC_MAX_SENTENCE_CHARS
+            sentences.append(piece[:cut].strip())
+            piece = piece[cut:].strip()
+        if piece:
+            sentences.append(piece)
+    return sentences
+
+def _text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """문장 임베딩 LRU 캐시 (텍스트 해시 키, 스레드 안전)"""
+
+    def __init__(self, max_size: int = SEMANTIC_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, key: str, embedding: np.ndarray):
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+class EmbeddingBatcher:
+    """
+    요청 간 인코딩 배치
+
+    각 요청은 미캐시 문장과 Future를 큐에 넣고, 배치 스레드는 SEMANTIC_BATCH_WAIT_MS 동안
+    모인 요청의 문장을 중복 제거하여 encode 한 번으로 처리한 뒤 결과를 나눠준다.
+    """
+
+    def __init__(self, cache: EmbeddingCache):
+        self.cache = cache
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.encoded_sentences = 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            requests = [self._queue.get()]
+            # 짧게 기다리며 동시 요청 수집
+            try:
+                while sum(len(texts) for _, texts, _ in requests) < SEMANTIC_MAX_BATCH:
+                    requests.append(self._queue.get(timeout=SEMANTIC_BATCH_WAIT_MS / 1000))
+            except queue.Empty:
+                pass
+            self._encode_requests(requests)
+
+    def _encode_requests(self, requests: list):
+        # 모델별로 묶어서 인코딩 (보통 하나)
+        by_model = {}
+        for model, texts, future in requests:
+            by_model.setdefault(id(model), (model, []))[1].append((texts, future))
+
+        for model, items in by_model.values():
+            unique = list(dict.fromkeys(text for texts, _ in items for text in texts))
+            try:
+                vectors = model.encode(unique, convert_to_numpy=True, normalize_embeddings=True)
+                encoded = dict(zip(unique, vectors))
+                for text, vector in encoded.items():
+                    self.cache.put(_text_key(text), vector)
+                self.batches += 1
+                self.encoded_sentences += len(unique)
+                for texts, future in items:
+                    future.set_result([encoded[text] for text in texts])
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+
+    def embed(self, model, sentences: List[str]) -> np.ndarray:
+        """문장 임베딩 (캐시 우선, 미캐시 문장만 배치 인코딩), 정규화된 (n, d) 행렬"""
+        embeddings = [self.cache.get(_text_key(sentence)) for sentence in sentences]
+        missing = list(dict.fromkeys(s for s, e in zip(sentences, embeddings) if e is None))
+
+        if missing:
+            self._ensure_started()
+            future = Future()
+            self._queue.put((model, missing, future))
+            encoded = dict(zip(missing, future.result()))
+            embeddings = [e if e is not None else encoded[s] for s, e in zip(sentences, embeddings)]
+        return np.vstack(embeddings).astype(np.float32)
+
+    def get_stats(self) -> dict:
+        return {
+            "cache": self.cache.get_stats(),
+            "batches": self.batches,
+            "encoded_sentences": self.encoded_sentences
+        }
+
+# 전역 캐시 / 배치기 (프로세스당 하나)
+embedding_batcher = EmbeddingBatcher(EmbeddingCache())
+
+def analyze_semantic_mismatch(model, transcribed_text: str, segments: List[Dict] = None) -> Dict:
+    """
+    인접 문장 간 의미 유사도로 불일치 판단
+
+    Args:
+        model: SentenceTransformer
+        transcribed_text: 전사문
+        segments: 발화 구간별 전사 [{"start", "end", "text"}] (있으면 문장 시간 유지)
+    """
+    if segments is None:
+        segments = [{"start": None, "end": None, "text": transcribed_text}]
+    timed_sentences = [
+        {"start": segment["start"], "end": segment["end"], "text": sentence}
+        for segment in segments
+        for sentence in split_sentences(segment["text"])
+    ]
+
+    if len(timed_sentences) < 2:
+        return {"semantic_mismatch": False, "confidence": 0.0, "similarity": 1.0,
+                "sentence_count": len(timed_sentences)}
+
+    embeddings = embedding_batcher.embed(model, [s["text"] for s in timed_sentences])
+
+    # 정규화 임베딩이므로 내적 = 코사인 유사도
+    similarity_matrix = embeddings @ embeddings.T
+    adjacent = np.diagonal(similarity_matrix, offset=1)
+    avg_similarity = float(adjacent.mean())
+    n = len(timed_sentences)
+    global_similarity = float((similarity_matrix.sum() - np.trace(similarity_matrix)) / (n * (n - 1)))
+
+    # 유사도가 낮으면 의미적 불일치 가능성
+    semantic_mismatch = avg_similarity < SEMANTIC_MISMATCH_THRESHOLD
+    confidence = abs(avg_similarity - SEMANTIC_MISMATCH_THRESHOLD) * 2
+
+    return {
+        "semantic_mismatch": bool(semantic_mismatch),
+        "confidence": float(min(confidence, 1.0)),
+        "similarity": avg_similarity,
+        "global_similarity": round(global_similarity, 4),
+        "sentence_count": n,
+        "transitions": [
+            {
+                "start": timed_sentences[i]["start"],
+                "end": timed_sentences[i + 1]["end"],
+                "similarity": round(float(sim), 4)
+            }
+            for i, sim in enumerate(adjacent)
+        ]
+    }
@@ -0,0 +1,135 @@
+"""
+모델 가중치 로더 (메모리 매핑 지원)
+
+torch.load(mmap=True)로 읽은 텐서는 파일 페이지 캐시를 그대로 참조하므로
+load_state_dict(assign=True)로 모델에 연결하면 여러 워커 프로세스
+(ProcessPoolExecutor, uvicorn workers)가 같은 물리 메모리를 공유한다.
+
+메모리 매핑 파일에는 변환 시 선택한 런타임 프로파일(메모리 포맷)을 함께 저장한다.
+로딩 후 메모리 포맷 변환이나 자체 벤치마크가 파라미터를 다시 만들면 공유가 깨지므로
+런타임은 저장된 프로파일을 그대로 사용한다 (app/core/runtime.py optimize_model).
+"""
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import torch
+
+from app.core.config import USE_MMAP_WEIGHTS
+
+MMAP_SUFFIX = ".mmap.pt"
+# 메모리 매핑 파일 구조: {"state_dict": ..., "runtime_profile": {...}}
+MMAP_STATE_KEY = "state_dict"
+MMAP_PROFILE_KEY = "runtime_profile"
+# HuggingFace 스냅샷 디렉토리 안의 메모리 매핑용 파일 이름
+HF_MMAP_FILENAME = "model" + MMAP_SUFFIX
+
+def mmap_path_for(weights_path: str) -> Path:
+    """원본 가중치 경로 -> 메모리 매핑용 파일 경로 (예: best_model_tuned.mmap.pt)"""
+    path = Path(weights_path)
+    return path.with_name(path.stem + MMAP_SUFFIX)
+
+def extract_state_dict(checkpoint) -> Dict[str, torch.Tensor]:
+    """체크포인트 구조에 따라 state_dict 추출"""
+    if isinstance(checkpoint, dict):
+        for key in ("model_state_dict", "state_dict", "model"):
+            if key in checkpoint:
+                return checkpoint[key]
+    return checkpoint
+
+def clean_state_dict(state_dict: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+    """state_dict 키 정리 (불필요한 prefix 제거)"""
+    return {k.replace('module.', '').replace('model.', ''): v for k, v in state_dict.items()}
+
+def _load_mmap(mmap_file: Path) -> Tuple[Optional[Dict[str, torch.Tensor]], Optional[Dict]]:
+    """
+    메모리 매핑 파일 로드
+
+    Returns:
+        tuple: (state_dict, 저장된 런타임 프로파일) - 실패 시 (None, None),
+        프로파일 없이 저장된 이전 파일은 프로파일이 None
+    """
+    try:
+        payload = torch.load(str(mmap_file), map_location="cpu", mmap=True, weights_only=True)
+    except (TypeError, RuntimeError) as e:
+        # torch < 2.1 이거나 구 포맷 파일인 경우
+        print(f"[Weights] 메모리 매핑 로드 실패, 일반 로드 사용: {e}")
+        return None, None
+    if isinstance(payload, dict) and MMAP_STATE_KEY in payload:
+        return payload[MMAP_STATE_KEY], payload.get(MMAP_PROFILE_KEY)
+    return payload, None
+
+def load_state_dict(weights_path: str) -> Tuple[Dict[str, torch.Tensor], bool, Optional[Dict]]:
+    """
+    가중치 로드 (메모리 매핑 파일 우선)
+
+    Returns:
+        tuple: (state_dict, 메모리_매핑_여부, 저장된 런타임 프로파일)
+    """
+    mmap_file = mmap_path_for(weights_path)
+    if USE_MMAP_WEIGHTS and mmap_file.exists():
+        state_dict, profile = _load_mmap(mmap_file)
+        if state_dict is not None:
+            return state_dict, True, profile
+
+    checkpoint = torch.load(weights_path, map_location="cpu")
+    return clean_state_dict(extract_state_dict(checkpoint)), False, None
+
+def load_weights_into(model: torch.nn.Module, weights_path: str,
+                      strict: bool = True) -> Tuple[bool, Optional[Dict]]:
+    """
+    모델에 가중치 적용
+
+    메모리 매핑된 경우 assign=True로 파라미터를 복사하지 않고 매핑된 텐서를 그대로 사용한다.
+    반환된 프로파일을 optimize_model(profile=...)에 넘기면 매핑된 텐서가 유지된다.
+
+    Returns:
+        tuple: (메모리 매핑 여부, 파일에 저장된 런타임 프로파일 또는 None)
+    """
+    state_dict, mmapped, profile = load_state_dict(weights_path)
+    if mmapped:
+        model.load_state_dict(state_dict, strict=strict, assign=True)
+    else:
+        model.load_state_dict(state_dict, strict=strict)
+    return mmapped, profile
+
+def attach_hf_mmap_weights(model: torch.nn.Module, snapshot_dir: str) -> bool:
+    """
+    HuggingFace 모델의 파라미터를 스냅샷의 메모리 매핑 파일로 교체
+
+    from_pretrained로 만든 파라미터는 프로세스마다 별도 메모리를 차지하므로
+    매핑된 텐서로 교체(assign=True)하여 워커 간에 공유한다.
+
+    Returns:
+        교체 여부
+    """
+    mmap_file = Path(snapshot_dir) / HF_MMAP_FILENAME
+    if not USE_MMAP_WEIGHTS or not mmap_file.exists():
+        return False
+    state_dict, _ = _load_mmap(mmap_file)
+    if state_dict is None:
+        return False
+    model.load_state_dict(state_dict, strict=True, assign=True)
+    return True
+
+def save_mmap_weights(state_dict: Dict[str, torch.Tensor], output_path: str,
+                      runtime_profile: Optional[Dict] = None):
+    """
+    메모리 매핑용 가중치 저장
+
+    runtime_profile의 channels_last가 켜져 있으면 4D conv 가중치를 미리 NHWC로 저장하여
+    로딩 후 메모리 포맷 변환에서 복사가 일어나지 않게 하고, 프로파일을 파일에 함께 기록한다.
+    """
+    channels_last = bool(runtime_profile and runtime_profile.get("channels_last"))
+    prepared = {}
+    for k, v in state_dict.items():
+        v = v.detach().cpu()
+        if channels_last and v.dim() == 4:
+            v = v.contiguous(memory_format=torch.channels_last)
+        else:
+            v = v.contiguous()
+        prepared[k] = v
+    payload = {MMAP_STATE_KEY: prepared}
+    if runtime_profile is not None:
+        payload[MMAP_PROFILE_KEY] = dict(runtime_profile)
+    # mmap 로드는 zipfile 직렬화 포맷 필요 (torch.save 기본값)
+    torch.save(payload, output_path)
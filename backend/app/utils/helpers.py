@@ -1,113 +1,167 @@
-from app.core.firebase import db, bucket
+from app.core.firebase import get_bucket
+from app.services.result_store import get_result_store, FRAME_COLLECTION
+from app.services.frame_columns import FrameColumns, LABELS, FAKE, REAL, as_frame_columns
+import base64
+import json
 import uuid
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
 
 def upload_video(file_path: str, user_id: str):
     """Firebase Storage에 영상 업로드 후 URL 반환"""
     blob_name = f"videos/{user_id}/{uuid.uuid4()}.mp4"
-    blob = bucket.blob(blob_name)
+    blob = get_bucket().blob(blob_name)
     blob.upload_from_filename(file_path)
     blob.make_public()
     return blob.public_url
 
-def save_analysis_result(video_id: str, result: dict):
-    """분석 결과 Firestore 저장"""
-    db.collection("analysis_results").document(video_id).set(result)
+def encode_cursor(after: Tuple[str, str]) -> str:
+    """keyset 커서 (정렬 필드 값, 문서 ID) -> URL에 넣을 수 있는 불투명 문자열"""
+    return base64.urlsafe_b64encode(json.dumps(list(after)).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """encode_cursor의 역변환 (형식이 맞지 않으면 ValueError)"""
+    try:
+        order_value, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(order_value), str(doc_id)
+    except Exception as e:
+        raise ValueError(f"잘못된 커서: {cursor}") from e
+
+async def save_analysis_result(video_id: str, result: dict):
+    """분석 결과 저장 (RESULT_STORE_BACKEND 저장소, 이벤트 루프를 막지 않음)"""
+    await get_result_store().save(video_id, result)
     return True
 
-def get_analysis_result(video_id: str):
-    """저장된 분석 결과 Firestore에서 조회"""
-    doc = db.collection("analysis_results").document(video_id).get()
-    if doc.exists:
-        return doc.to_dict()
-    return None
+async def get_analysis_result(video_id: str):
+    """저장된 분석 결과 조회 (없으면 None)"""
+    return await get_result_store().get(video_id)
+
+async def save_frame_results(video_id: str, frame_results) -> Dict:
+    """
+    프레임별 결과를 부가 기록(FRAME_COLLECTION)에 열 단위(npz)로 저장
+    
+    Args:
+        frame_results: FrameColumns 또는 프레임별 dict 리스트
+    
+    Returns:
+        분석 결과 문서에 넣을 참조 {"collection", "id", "frame_count"}
+    """
+    columns = as_frame_columns(frame_results)
+    await get_result_store(FRAME_COLLECTION).save(video_id, columns.to_record())
+    return {"collection": FRAME_COLLECTION, "id": video_id, "frame_count": len(columns)}
+
+async def get_frame_columns(analysis_result: Dict) -> FrameColumns:
+    """
+    분석 결과의 프레임별 점수 (부가 기록 참조, 이전 형식 문서는 raw_frame_results)
+    """
+    reference = analysis_result.get("frame_record")
+    if reference:
+        record = await get_result_store(reference.get("collection", FRAME_COLLECTION)).get(reference["id"])
+        return FrameColumns.from_record(record) if record else FrameColumns.empty()
+    return FrameColumns.from_rows(analysis_result.get("raw_frame_results", []))
+
+def get_segment_frames(segment: Dict, columns: FrameColumns) -> FrameColumns:
+    """구간에 속한 프레임 (frame_start ~ frame_end 인덱스, 이전 형식 문서는 segment["frames"])"""
+    if "frame_start" in segment:
+        return columns.slice(segment["frame_start"], segment["frame_end"])
+    return FrameColumns.from_rows(segment.get("frames", []))
 
-def create_smart_timeline(frame_results: List[Dict], min_segment_duration: float = 2.0) -> List[Dict]:
+def create_smart_timeline(frame_results, min_segment_duration: float = 2.0,
+                          max_segment_duration: float = 30.0) -> List[Dict]:
     """
     프레임 결과를 스마트하게 구간화하여 타임라인 생성
     
+    같은 판정이 이어지는 프레임을 한 구간으로 묶고, 구간 시작 후 max_segment_duration을 넘으면 분할한다.
+    구간은 프레임을 복사하지 않고 인덱스 범위 [frame_start, frame_end)로 참조한다.
+    
     Args:
-        frame_results: 프레임별 분석 결과 리스트
+        frame_results: FrameColumns 또는 프레임별 분석 결과 리스트
         min_segment_duration: 최소 구간 길이 (초)
+        max_segment_duration: 최대 구간 길이 (초)
     
     Returns:
         구간화된 타임라인 리스트
     """
-    if not frame_results:
+    columns = as_frame_columns(frame_results)
+    n = len(columns)
+    if n == 0:
         return []
     
+    times = columns.time
+    labels = columns.label
+    # 구간 평균 신뢰도를 누적합으로 계산
+    confidence_cumsum = np.concatenate([[0.0], np.cumsum(columns.confidence, dtype=np.float64)])
+    
+    # 판정이 바뀌는 지점으로 나눈 뒤, 각 구간을 최대 길이 기준으로 다시 분할
+    run_starts = np.concatenate([[0], np.flatnonzero(labels[1:] != labels[:-1]) + 1, [n]])
+    
     timeline = []
-    current_segment = None
-    segment_id = 1
-    
-    for i, frame in enumerate(frame_results):
-        frame_time = frame.get("time", 0.0)
-        frame_result = frame.get("ensemble_result", "UNKNOWN")
-        frame_confidence = frame.get("confidence", 0.0)
-        
-        # 첫 번째 프레임이거나 구간을 분할해야 하는 경우
-        if (current_segment is None or 
-            should_split_segment(current_segment, frame_result, frame_time, min_segment_duration)):
-            
-            # 이전 구간이 있으면 완료
-            if current_segment:
-                timeline.append(current_segment)
-            
-            # 새 구간 시작
-            current_segment = {
-                "segment_id": segment_id,
-                "start": frame_time,
-                "end": frame_time,
-                "duration": 0.0,
-                "result": frame_result,
-                "confidence": frame_confidence,
-                "frame_count": 1,
-                "frames": [frame]
-            }
-            segment_id += 1
-        else:
-            # 현재 구간에 프레임 추가
-            current_segment["end"] = frame_time
-            current_segment["duration"] = current_segment["end"] - current_segment["start"]
-            current_segment["frame_count"] += 1
-            current_segment["frames"].append(frame)
-            
-            # 신뢰도 업데이트 (평균)
-            total_confidence = sum(f.get("confidence", 0.0) for f in current_segment["frames"])
-            current_segment["confidence"] = round(total_confidence / current_segment["frame_count"], 4)
-    
-    # 마지막 구간 추가
-    if current_segment:
-        timeline.append(current_segment)
+    for run_start, run_end in zip(run_starts[:-1].tolist(), run_starts[1:].tolist()):
+        start = run_start
+        while start < run_end:
+            end = int(np.searchsorted(times[start:run_end], times[start] + max_segment_duration, side="right")) + start
+            end = max(end, start + 1)
+            frame_count = end - start
+            timeline.append({
+                "segment_id": len(timeline) + 1,
+                "start": float(times[start]),
+                "end": float(times[end - 1]),
+                "duration": float(times[end - 1] - times[start]),
+                "result": LABELS[labels[start]],
+                "confidence": round(float(confidence_cumsum[end] - confidence_cumsum[start]) / frame_count, 4),
+                "frame_count": frame_count,
+                "frame_start": start,
+                "frame_end": end
+            })
+            start = end
     
     return timeline
 
-def should_split_segment(current_segment: Dict, new_result: str, new_time: float, min_duration: float) -> bool:
+def summarize_audio_windows(windows: List[Dict], start: float, end: float) -> Dict:
     """
-    새로운 구간을 시작해야 하는지 판단
+    타임라인 구간 [start, end]와 겹치는 오디오 윈도우 점수 요약
     
     Args:
-        current_segment: 현재 구간 정보
-        new_result: 새로운 프레임의 결과
-        new_time: 새로운 프레임의 시간
-        min_duration: 최소 구간 길이
+        windows: 윈도우별 딥보이스 점수 (deepvoice_detection.windows)
+        start: 구간 시작 (초)
+        end: 구간 끝 (초, 단일 프레임 구간이면 start와 같음)
     
     Returns:
-        구간을 분할해야 하면 True
+        겹치는 윈도우 수 / 딥보이스 윈도우 비율 / 평균 특징 분산
     """
-    # 결과가 다르면 분할
-    if current_segment["result"] != new_result:
-        return True
+    overlapping = [w for w in windows if w["start"] <= end and w["end"] >= start]
+    if not overlapping:
+        return {"window_count": 0, "deepvoice_ratio": 0.0, "feature_variance": 0.0}
     
-    # 최소 구간 길이를 고려한 분할 로직
-    current_duration = new_time - current_segment["start"]
+    return {
+        "window_count": len(overlapping),
+        "deepvoice_ratio": round(sum(w["is_deepvoice"] for w in overlapping) / len(overlapping), 4),
+        "feature_variance": round(sum(w["feature_variance"] for w in overlapping) / len(overlapping), 6)
+    }
+
+def summarize_feature_windows(windows: List[Dict], start: float, end: float) -> Dict:
+    """
+    타임라인 구간 [start, end]와 겹치는 음성 특징 윈도우 요약
     
-    # 너무 긴 구간은 분할 (선택적)
-    if current_duration > 30.0:  # 30초 이상이면 분할
-        return True
+    Args:
+        windows: 윈도우별 음성 특징 (audio_features.windows)
+        start: 구간 시작 (초)
+        end: 구간 끝 (초)
+    
+    Returns:
+        겹치는 윈도우 수 / 평균 피치(유성 윈도우만) / 평균 스펙트럼 중심
+    """
+    overlapping = [w for w in windows if w["start"] <= end and w["end"] >= start]
+    if not overlapping:
+        return {"window_count": 0, "pitch_mean": 0.0, "spectral_centroid_mean": 0.0}
     
-    return False
+    voiced = [w["pitch_mean"] for w in overlapping if w["pitch_mean"] > 0]
+    return {
+        "window_count": len(overlapping),
+        "pitch_mean": round(sum(voiced) / len(voiced), 2) if voiced else 0.0,
+        "spectral_centroid_mean": round(sum(w["spectral_centroid_mean"] for w in overlapping) / len(overlapping), 2)
+    }
 
 def create_analysis_summary(video_analysis: Dict, audio_analysis: Dict, timeline: List[Dict]) -> Dict:
     """
@@ -148,7 +202,8 @@ def create_analysis_summary(video_analysis: Dict, audio_analysis: Dict, timeline
         "real_segments": real_segments
     }
 
-def create_segment_analysis_details(segment: Dict, video_analysis: Dict, audio_analysis: Dict) -> Dict:
+def create_segment_analysis_details(segment: Dict, video_analysis: Dict, audio_analysis: Dict,
+                                    frame_results=None) -> Dict:
     """
     구간별 상세 분석 정보 생성
     
@@ -156,21 +211,23 @@ def create_segment_analysis_details(segment: Dict, video_analysis: Dict, audio_a
         segment: 구간 정보
         video_analysis: 비디오 분석 결과
         audio_analysis: 오디오 분석 결과
+        frame_results: 프레임별 점수 (FrameColumns 또는 dict 리스트, 구간의 frame_start ~ frame_end 인덱스로 참조)
     
     Returns:
         구간별 상세 분석 정보
     """
     # 구간 내 프레임들의 비디오 분석 결과 집계
-    segment_frames = segment.get("frames", [])
+    segment_frames = get_segment_frames(segment, as_frame_columns(frame_results))
     
-    if segment_frames:
+    if len(segment_frames):
         # 비디오 분석 세부사항
+        confidence = segment_frames.confidence.astype(np.float64)
         video_details = {
-            "fake_confidence": round(sum(f.get("confidence", 0.0) for f in segment_frames if f.get("ensemble_result") == "FAKE") / len(segment_frames), 4),
-            "real_confidence": round(sum(f.get("confidence", 0.0) for f in segment_frames if f.get("ensemble_result") == "REAL") / len(segment_frames), 4),
+            "fake_confidence": round(float(confidence[segment_frames.label == FAKE].sum()) / len(segment_frames), 4),
+            "real_confidence": round(float(confidence[segment_frames.label == REAL].sum()) / len(segment_frames), 4),
             "model_results": {
-                "model1": segment_frames[0].get("model1", {}).get("label", "UNKNOWN"),
-                "model2": segment_frames[0].get("model2", {}).get("label", "UNKNOWN")
+                "model1": LABELS[segment_frames.model1_label[0]],
+                "model2": LABELS[segment_frames.model2_label[0]]
             }
         }
     else:
@@ -183,10 +240,21 @@ def create_segment_analysis_details(segment: Dict, video_analysis: Dict, audio_a
     # 오디오 분석 세부사항
     audio_result = audio_analysis.get("final_result", {})
     audio_details = {
+        "status": audio_analysis.get("status", "completed"),
         "fake_confidence": audio_result.get("confidence", 0.0) if audio_result.get("is_fake_voice", False) else 0.0,
         "real_confidence": audio_result.get("confidence", 0.0) if not audio_result.get("is_fake_voice", False) else 0.0,
         "deepvoice_detected": audio_analysis.get("deepvoice_detection", {}).get("is_deepvoice", False),
-        "semantic_mismatch": audio_analysis.get("semantic_analysis", {}).get("semantic_mismatch", False)
+        "semantic_mismatch": audio_analysis.get("semantic_analysis", {}).get("semantic_mismatch", False),
+        # 구간과 겹치는 Wav2Vec2 윈도우 점수
+        "deepvoice_windows": summarize_audio_windows(
+            audio_analysis.get("deepvoice_detection", {}).get("windows", []),
+            segment.get("start", 0.0), segment.get("end", 0.0)
+        ),
+        # 구간과 겹치는 음성 특징 윈도우
+        "feature_windows": summarize_feature_windows(
+            audio_analysis.get("audio_features", {}).get("windows", []),
+            segment.get("start", 0.0), segment.get("end", 0.0)
+        )
     }
     
     return {
@@ -0,0 +1,81 @@
+"""
+음성 특징 추출 벤치마크
+
+- 기존 방식: mfcc / piptrack / spectral_centroid / zero_crossing_rate를 각각 파형에서 계산
+  (librosa 내부에서 STFT를 여러 번 다시 계산)
+- 현재 방식: STFT 한 번 + 같은 스펙트로그램에서 모든 특징 유도 (피치: hps / piptrack)
+
+사용법:
+    python benchmark_audio_features.py [클립 길이(초) ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+# 경로 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+import librosa
+import numpy as np
+
+from app.services.audio_io import AudioClip, TARGET_SAMPLE_RATE
+from app.services.audio_features import extract_features
+
+def legacy_features(y: np.ndarray, sr: int) -> dict:
+    """기존 extract_audio_features 구현"""
+    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+    pitch_mean = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
+    spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)
+    zcr = librosa.feature.zero_crossing_rate(y)
+    return {
+        "mfcc_mean": np.mean(mfccs, axis=1).tolist(),
+        "pitch_mean": float(pitch_mean),
+        "spectral_centroid_mean": float(np.mean(spectral_centroids)),
+        "zero_crossing_rate_mean": float(np.mean(zcr))
+    }
+
+def synthetic_voice(duration: float, sr: int) -> np.ndarray:
+    """기본 주파수가 변하는 고조파 신호 + 잡음 (음성 유사 신호)"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(duration * sr)) / sr
+    f0 = 150 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    return (0.2 * y * envelope + rng.normal(0, 0.01, len(t))).astype(np.float32)
+
+def measure(fn, repeats: int = 2) -> tuple:
+    """최소 소요 시간(초)과 마지막 결과"""
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+if __name__ == "__main__":
+    durations = [float(arg) for arg in sys.argv[1:]] or [30.0, 120.0, 600.0]
+    sr = TARGET_SAMPLE_RATE
+
+    print("=" * 60)
+    print("음성 특징 추출 벤치마크 (기존 vs STFT 1회)")
+    print("=" * 60)
+
+    for duration in durations:
+        y = synthetic_voice(duration, sr)
+        clip = AudioClip(y, sr)
+
+        legacy_time, legacy = measure(lambda: legacy_features(y, sr))
+        piptrack_time, piptrack = measure(lambda: extract_features(clip, pitch_method="piptrack"))
+        hps_time, hps = measure(lambda: extract_features(clip, pitch_method="hps"))
+
+        print(f"[{duration:.0f}초 클립]")
+        print(f"  기존 (STFT 여러 번):      {legacy_time:.2f}s  pitch_mean={legacy['pitch_mean']:.1f}Hz")
+        print(f"  현재 (piptrack):         {piptrack_time:.2f}s  ({legacy_time / piptrack_time:.1f}x)  "
+              f"pitch_mean={piptrack['pitch_mean']:.1f}Hz")
+        print(f"  현재 (hps, 기본):        {hps_time:.2f}s  ({legacy_time / hps_time:.1f}x)  "
+              f"pitch_mean={hps['pitch_mean']:.1f}Hz")
+        mfcc_diff = np.max(np.abs(np.array(legacy["mfcc_mean"]) - np.array(hps["mfcc_mean"])))
+        print(f"  MFCC 평균 최대 차이: {mfcc_diff:.4f}, 윈도우 수: {len(hps['windows'])}")
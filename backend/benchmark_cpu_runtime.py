@@ -0,0 +1,30 @@
+"""CPU 런타임 설정 자체 벤치마크 (channels_last / oneDNN 퓨전 비교)"""
+import sys
+from pathlib import Path
+
+# 경로 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.runtime import get_runtime_info
+from app.services.model_mesonet import MesoNetBackend
+from app.services.model_efficientnet import EfficientNetB0Backend
+
+print("=" * 60)
+print("CPU 런타임 자체 벤치마크")
+print("=" * 60)
+
+for name, backend in [("MesoNet", MesoNetBackend()), ("EfficientNet-B0", EfficientNetB0Backend())]:
+    print(f"\n[{name}]")
+    if not backend.load_model():
+        print(f"  [FAIL] {name} 로딩 실패")
+
+info = get_runtime_info()
+print()
+print("=" * 60)
+print(f"intra-op 스레드: {info['intra_op_threads']}, inter-op 스레드: {info['inter_op_threads']}")
+for model_name, profile in info["profiles"].items():
+    latency = profile["latency_ms"]
+    latency_text = f"{latency:.2f}ms" if latency is not None else "측정 안 함"
+    print(f"  - {model_name}: channels_last={profile['channels_last']}, "
+          f"onednn_fusion={profile['onednn_fusion']}, 지연={latency_text}")
+print("=" * 60)
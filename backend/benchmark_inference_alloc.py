@@ -0,0 +1,81 @@
+"""
+추론 경로 할당량 / 지연 시간 벤치마크
+
+- 기존 방식: 프레임마다 새 입력 텐서 + torch.no_grad() + gc.collect()
+- 현재 방식: 미리 할당된 입력 버퍼 재사용 + torch.inference_mode()
+
+torch 프로파일러로 CPU 메모리 할당 횟수/바이트를, tracemalloc으로 Python 객체 할당을 측정합니다.
+
+사용법:
+    python benchmark_inference_alloc.py [프레임 수]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# 경로 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+import torch
+from PIL import Image
+from torch.profiler import profile, ProfilerActivity
+
+from app.services.model_mesonet import MesoNetBackend
+
+def run_legacy(backend: MesoNetBackend, images: list):
+    """기존 방식: 프레임마다 새 텐서 할당 + gc.collect()"""
+    for image in images:
+        tensor = backend.transform(Image.fromarray(image)).unsqueeze(0)
+        with torch.no_grad():
+            outputs = backend.model(tensor)
+            torch.nn.functional.softmax(outputs, dim=1)[0][1].item()
+        del tensor, outputs
+        gc.collect()
+
+def run_buffered(backend: MesoNetBackend, images: list):
+    """현재 방식: 입력 버퍼 재사용 + inference_mode, gc.collect() 없음"""
+    for image in images:
+        batch, _ = backend.preprocess_batch([image], face_crop=False)
+        backend.infer_batch(batch)
+
+def measure(name: str, fn, backend: MesoNetBackend, images: list):
+    """지연 시간 / 할당량 측정"""
+    fn(backend, images[:2])  # 워밍업 (버퍼 할당, 스레드 풀 초기화)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(backend, images)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        fn(backend, images)
+    events = [e for e in prof.key_averages() if e.cpu_memory_usage > 0]
+    alloc_count = sum(e.count for e in events)
+    alloc_bytes = sum(e.cpu_memory_usage for e in events)
+
+    print(f"[{name}]")
+    print(f"  프레임당 지연: {elapsed_ms / len(images):.2f}ms")
+    print(f"  torch 할당: {alloc_count}회, {alloc_bytes / 1024 / 1024:.1f} MB")
+    print(f"  Python 피크 할당: {python_peak / 1024:.1f} KB")
+
+if __name__ == "__main__":
+    num_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    backend = MesoNetBackend()
+    if not backend.load_model():
+        print("[FAIL] MesoNet 모델 로딩 실패")
+        sys.exit(1)
+
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 255, size=(480, 640, 3), dtype=np.uint8) for _ in range(num_frames)]
+
+    print("=" * 60)
+    print(f"추론 할당 벤치마크 (MesoNet, {num_frames}프레임)")
+    print("=" * 60)
+    measure("기존: 새 텐서 + no_grad + gc.collect()", run_legacy, backend, images)
+    measure("현재: 버퍼 재사용 + inference_mode", run_buffered, backend, images)
@@ -0,0 +1,109 @@
+"""
+워커 프로세스별 가중치 메모리 측정
+
+여러 워커에서 MesoNet + EfficientNet-B0를 로드한 뒤
+프로세스 고유 메모리(USS)와 RSS를 비교합니다. *.mmap.pt 파일이 있으면
+(python convert_weights_mmap.py) 가중치 페이지가 공유되어 워커당 증가량이 작아집니다.
+
+런타임 자체 벤치마크(CPU_RUNTIME_AUTOTUNE)를 켠 상태로도 측정하여
+로딩 후 메모리 포맷 변환 / 벤치마크가 매핑된 파라미터를 복사하지 않는지 확인합니다.
+
+사용법:
+    python benchmark_weight_sharing.py [워커 수]
+"""
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# 경로 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+import psutil
+
+def _mapped_ranges(process, suffix: str):
+    """프로세스에 매핑된 파일(suffix로 끝나는 경로)의 주소 범위"""
+    ranges = []
+    for mapping in process.memory_maps(grouped=False):
+        if mapping.path.endswith(suffix):
+            start, end = mapping.addr.split("-")
+            ranges.append((int(start, 16), int(end, 16)))
+    return ranges
+
+def _shared_param_ratio(models, ranges) -> float:
+    """파라미터 중 메모리 매핑 파일을 그대로 참조하는 비율 (바이트 기준)"""
+    total = 0
+    shared = 0
+    for model in models:
+        for param in model.parameters():
+            size = param.numel() * param.element_size()
+            total += size
+            address = param.data_ptr()
+            if any(start <= address < end for start, end in ranges):
+                shared += size
+    return shared / total if total else 0.0
+
+def _load_and_measure(autotune: bool):
+    """워커: 모델 로드 전후 USS / RSS 측정 (MB) 및 매핑된 파라미터 비율"""
+    import app.core.runtime as runtime
+    from app.services.model_mesonet import MesoNetBackend
+    from app.services.model_efficientnet import EfficientNetB0Backend
+    from app.services.weight_loader import MMAP_SUFFIX
+
+    runtime.CPU_RUNTIME_AUTOTUNE = autotune
+
+    process = psutil.Process()
+    before = process.memory_full_info()
+    mesonet = MesoNetBackend()
+    efficientnet = EfficientNetB0Backend()
+    mesonet.load_model()
+    efficientnet.load_model()
+    after = process.memory_full_info()
+
+    ratio = _shared_param_ratio(
+        [model for model in (mesonet.model, efficientnet.model) if model is not None],
+        _mapped_ranges(process, MMAP_SUFFIX)
+    )
+    return (
+        process.pid,
+        (after.uss - before.uss) / 1024 / 1024,
+        (after.rss - before.rss) / 1024 / 1024,
+        ratio
+    )
+
+def _run(num_workers: int, autotune: bool):
+    print(f"\n[CPU_RUNTIME_AUTOTUNE={autotune}]")
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        results = list(executor.map(_load_and_measure, [autotune] * num_workers))
+
+    for pid, uss_mb, rss_mb, ratio in results:
+        print(f"  워커 {pid}: 로딩 후 USS 증가 {uss_mb:.1f} MB, RSS 증가 {rss_mb:.1f} MB, "
+              f"매핑된 파라미터 {ratio * 100:.0f}%")
+    print(f"  평균: USS {sum(r[1] for r in results) / len(results):.1f} MB/워커, "
+          f"RSS {sum(r[2] for r in results) / len(results):.1f} MB/워커")
+    return min(r[3] for r in results)
+
+if __name__ == "__main__":
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    from app.core.config import USE_MMAP_WEIGHTS, MESONET_WEIGHTS, EFFICIENTNET_WEIGHTS
+    from app.services.weight_loader import mmap_path_for
+
+    print("=" * 60)
+    print(f"워커 {num_workers}개 가중치 메모리 측정")
+    print(f"USE_MMAP_WEIGHTS: {USE_MMAP_WEIGHTS}")
+    mmap_ready = True
+    for weights_path in (MESONET_WEIGHTS, EFFICIENTNET_WEIGHTS):
+        exists = mmap_path_for(weights_path).exists()
+        mmap_ready = mmap_ready and exists
+        print(f"  {mmap_path_for(weights_path).name}: {'있음' if exists else '없음'}")
+    print("=" * 60)
+
+    _run(num_workers, autotune=False)
+    autotune_ratio = _run(num_workers, autotune=True)
+
+    if USE_MMAP_WEIGHTS and mmap_ready:
+        # 자체 벤치마크를 켜도 파라미터가 워커별 복사본으로 바뀌면 안 됨
+        if autotune_ratio < 0.99:
+            print(f"\n✗ 자체 벤치마크 후 매핑된 파라미터 {autotune_ratio * 100:.0f}% - 워커별 복사 발생")
+            sys.exit(1)
+        print("\n✓ 자체 벤치마크 후에도 파라미터가 메모리 매핑 파일을 공유")
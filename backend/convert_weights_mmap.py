@@ -0,0 +1,88 @@
+"""
+가중치 메모리 매핑 변환 스크립트
+
+weights/ 폴더의 모델 가중치를 torch.load(mmap=True)로 읽을 수 있는 파일로 변환합니다.
+변환된 파일(*.mmap.pt)이 있으면 모든 워커 프로세스가 같은 물리 메모리를 공유합니다.
+
+CPU_RUNTIME_AUTOTUNE이 켜져 있으면 이 호스트에서 메모리 포맷(channels_last 여부)을
+한 번 벤치마크하여 선택된 포맷으로 가중치를 저장하고 프로파일을 파일에 기록합니다.
+워커는 저장된 프로파일을 그대로 사용하므로 로딩 시 벤치마크나 포맷 변환(복사)이 없습니다.
+oneDNN 퓨전(trace + freeze)은 파라미터를 상수로 복사하므로 후보에서 제외합니다.
+
+사용법:
+    python convert_weights_mmap.py
+"""
+import sys
+from pathlib import Path
+
+# 경로 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+import torch
+
+from app.core.config import (
+    MESONET_WEIGHTS, EFFICIENTNET_WEIGHTS, VIT_DETECTOR_SNAPSHOT, IMAGE_SIZE,
+    USE_CHANNELS_LAST, CPU_RUNTIME_AUTOTUNE
+)
+from app.core.runtime import autotune_profile
+from app.services.weight_loader import (
+    mmap_path_for, extract_state_dict, clean_state_dict, save_mmap_weights, HF_MMAP_FILENAME
+)
+
+def _build_mesonet():
+    from app.services.model_mesonet import Meso4
+    return Meso4(num_classes=2, dropout_rate=0.4), torch.zeros(1, 3, 256, 256)
+
+def _build_efficientnet():
+    from app.services.model_efficientnet import EfficientNetB0Backend
+    return EfficientNetB0Backend()._build_model(), torch.zeros(1, 3, IMAGE_SIZE, IMAGE_SIZE)
+
+def _select_profile(name: str, build_model, state_dict, strict: bool) -> dict:
+    """저장할 런타임 프로파일 (자체 벤치마크 또는 설정 기본값, 퓨전 제외)"""
+    if not CPU_RUNTIME_AUTOTUNE:
+        return {"channels_last": USE_CHANNELS_LAST, "onednn_fusion": False, "latency_ms": None}
+    model, example_input = build_model()
+    model.load_state_dict(state_dict, strict=strict)
+    return autotune_profile(name, model, example_input, allow_fusion=False)
+
+def convert_checkpoint(name: str, weights_path: str, build_model, strict: bool = True):
+    """PyTorch 체크포인트 -> 메모리 매핑 파일 (선택된 메모리 포맷 + 프로파일 저장)"""
+    print(f"\n[{name}] {weights_path}")
+    if not Path(weights_path).exists():
+        print(f"  ✗ 파일 없음, 건너뜀")
+        return
+
+    checkpoint = torch.load(weights_path, map_location="cpu")
+    state_dict = clean_state_dict(extract_state_dict(checkpoint))
+    output_path = mmap_path_for(weights_path)
+    # 런타임이 사용할 메모리 포맷과 같은 레이아웃으로 저장하여 로딩 후 복사 방지
+    profile = _select_profile(name.lower(), build_model, state_dict, strict)
+    save_mmap_weights(state_dict, str(output_path), runtime_profile=profile)
+    print(f"  ✓ 저장: {output_path} ({output_path.stat().st_size / 1024 / 1024:.1f} MB, "
+          f"channels_last={profile['channels_last']})")
+
+def convert_hf_snapshot(name: str, snapshot_dir: str):
+    """HuggingFace 스냅샷 -> 메모리 매핑 파일"""
+    print(f"\n[{name}] {snapshot_dir}")
+    if not Path(snapshot_dir).is_dir():
+        print(f"  ✗ 스냅샷 없음, 건너뜀")
+        return
+
+    from transformers import AutoModelForImageClassification
+    model = AutoModelForImageClassification.from_pretrained(snapshot_dir, local_files_only=True)
+    output_path = Path(snapshot_dir) / HF_MMAP_FILENAME
+    save_mmap_weights(model.state_dict(), str(output_path))
+    print(f"  ✓ 저장: {output_path} ({output_path.stat().st_size / 1024 / 1024:.1f} MB)")
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("가중치 메모리 매핑 변환")
+    print("=" * 60)
+
+    convert_checkpoint("MesoNet", MESONET_WEIGHTS, _build_mesonet)
+    convert_checkpoint("EfficientNet-B0", EFFICIENTNET_WEIGHTS, _build_efficientnet, strict=False)
+    convert_hf_snapshot("ViT", VIT_DETECTOR_SNAPSHOT)
+
+    print("\n" + "=" * 60)
+    print("변환 완료")
+    print("=" * 60)
@@ -0,0 +1,98 @@
+"""
+분석 결과 데이터셋 일괄 내보내기 (MesoNet 재학습용)
+
+결과 저장소(RESULT_STORE_BACKEND)에서 필터에 맞는 분석 결과를 커서로 페이지 조회하여
+출력 디렉토리에 프레임 단위 JSONL 샤드(part-NNNNN.jsonl)로 저장한다.
+샤드를 저장할 때마다 checkpoint.json을 갱신하므로, 중단된 경우 같은 명령을 다시 실행하면
+마지막 샤드 다음부터 이어서 내보낸다 (--restart로 처음부터).
+
+사용법:
+    python export_dataset.py --output-dir exports/fake_2026q1 --label FAKE --since 2026-01-01 --until 2026-04-01
+"""
+import asyncio
+import json
+import os
+import time
+
+from app.core.config import BULK_EXPORT_SHARD_ROWS, BULK_EXPORT_PAGE_SIZE
+from app.services.bulk_export import iter_export_shards
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+def _write_atomic(path: str, data: bytes):
+    """임시 파일에 쓴 뒤 rename (중단되어도 반쯤 쓴 파일이 남지 않음)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+async def export_dataset(output_dir: str, filters: dict, shard_rows: int, page_size: int, restart: bool = False):
+    """
+    데이터셋 샤드 내보내기
+
+    Args:
+        output_dir: 출력 디렉토리 (샤드 + checkpoint.json)
+        filters: {"user_id", "label", "since", "until"}
+        shard_rows: 샤드당 행 수
+        page_size: 결과 저장소 페이지 크기
+        restart: True면 체크포인트를 무시하고 처음부터
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILE)
+
+    cursor = None
+    start_shard = 0
+    if os.path.exists(checkpoint_path) and not restart:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("filters") != filters:
+            raise SystemExit(
+                f"체크포인트의 필터가 다릅니다: {checkpoint.get('filters')} (--restart로 처음부터 내보내기)"
+            )
+        cursor = checkpoint["cursor"]
+        start_shard = checkpoint["next_shard"]
+        print(f"체크포인트에서 이어서 내보내기: 샤드 {start_shard}부터")
+
+    print("=" * 60)
+    print("데이터셋 일괄 내보내기")
+    print("=" * 60)
+    print(f"필터: {filters}")
+    print(f"출력 디렉토리: {output_dir}")
+
+    start = time.perf_counter()
+    total_rows = 0
+    total_analyses = 0
+    shard = None
+    async for shard in iter_export_shards(filters, cursor=cursor, start_shard=start_shard,
+                                          shard_rows=shard_rows, page_size=page_size):
+        # 샤드를 먼저 저장한 뒤 체크포인트 갱신 (체크포인트는 항상 저장된 샤드까지만 가리킴)
+        _write_atomic(os.path.join(output_dir, shard["name"]), shard["data"])
+        _write_atomic(checkpoint_path, json.dumps(shard["checkpoint"], ensure_ascii=False, indent=2).encode("utf-8"))
+        total_rows += shard["rows"]
+        total_analyses += shard["analyses"]
+        print(f"  {shard['name']}: {shard['analyses']}개 분석, {shard['rows']}행")
+
+    elapsed = time.perf_counter() - start
+    print("=" * 60)
+    if shard is None:
+        print("새로 내보낼 분석 결과가 없습니다.")
+    print(f"완료: {total_analyses}개 분석, {total_rows}행, {elapsed:.1f}초")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='분석 결과 데이터셋 일괄 내보내기')
+    parser.add_argument('--output-dir', type=str, required=True,
+                        help='출력 디렉토리 (part-NNNNN.jsonl, checkpoint.json)')
+    parser.add_argument('--user-id', type=str, default=None, help='사용자 ID')
+    parser.add_argument('--label', type=str, default=None, choices=['FAKE', 'REAL'], help='영상 판정')
+    parser.add_argument('--since', type=str, default=None, help='분석 시각 시작 (ISO 8601, 포함)')
+    parser.add_argument('--until', type=str, default=None, help='분석 시각 끝 (ISO 8601, 제외)')
+    parser.add_argument('--shard-rows', type=int, default=BULK_EXPORT_SHARD_ROWS, help='샤드당 행 수')
+    parser.add_argument('--page-size', type=int, default=BULK_EXPORT_PAGE_SIZE, help='결과 저장소 페이지 크기')
+    parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 처음부터 내보내기')
+
+    args = parser.parse_args()
+
+    filters = {"user_id": args.user_id, "label": args.label, "since": args.since, "until": args.until}
+    asyncio.run(export_dataset(args.output_dir, filters, args.shard_rows, args.page_size, restart=args.restart))
@@ -0,0 +1,99 @@
+"""
+API 프로세스 import 시간 프로파일러
+
+새 인터프리터에서 `python -X importtime -c "import <모듈>"`을 실행하고
+stderr의 import 시간 로그를 집계하여 가장 오래 걸린 모듈 / 최상위 패키지를 출력한다.
+콜드 스타트 시간(오토스케일링 / 재시작 복구)은 대부분 여기서 결정된다.
+
+사용법:
+    python profile_startup.py [모듈 (기본: app.main)] [--top N] [--heavy torch,librosa,...]
+"""
+import argparse
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent
+
+# import 시점에 불러오면 안 되는 무거운 패키지 (첫 사용 / startup 훅에서 로드)
+DEFAULT_HEAVY_MODULES = [
+    "torch", "torchvision", "transformers", "librosa", "whisper", "faster_whisper",
+    "sentence_transformers", "tensorflow", "firebase_admin", "reportlab", "openpyxl"
+]
+
+# "import time:       self [us] |  cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+def run_importtime(module: str) -> tuple:
+    """새 인터프리터에서 모듈 import (소요 시간(초), import 시간 로그 목록)"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(BACKEND_DIR), capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": (len(indent) - 1) // 2
+            })
+
+    if completed.returncode != 0:
+        print(f"[경고] import 실패 (종료 코드 {completed.returncode})")
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        print("\n".join(errors[-10:]))
+    return elapsed, entries
+
+def by_package(entries: list) -> dict:
+    """최상위 패키지별 self 시간 합계 (ms)"""
+    totals = defaultdict(float)
+    for entry in entries:
+        totals[entry["module"].split(".")[0]] += entry["self_ms"]
+    return dict(totals)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API 프로세스 import 시간 프로파일")
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--heavy", default=",".join(DEFAULT_HEAVY_MODULES),
+                        help="import되면 안 되는 패키지 목록 (쉼표 구분)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"import 시간 프로파일: {args.module}")
+    print("=" * 60)
+
+    elapsed, entries = run_importtime(args.module)
+    top_level = [entry for entry in entries if entry["depth"] == 0]
+    import_ms = sum(entry["cumulative_ms"] for entry in top_level)
+
+    print(f"프로세스 전체: {elapsed:.2f}s (import 합계 {import_ms / 1000:.2f}s, 모듈 {len(entries)}개)")
+
+    print(f"\n[누적 시간 상위 {args.top}개 모듈]")
+    for entry in sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:args.top]:
+        print(f"  {entry['cumulative_ms']:9.1f} ms  (self {entry['self_ms']:7.1f})  {entry['module']}")
+
+    print(f"\n[최상위 패키지별 self 시간 상위 {args.top}개]")
+    packages = sorted(by_package(entries).items(), key=lambda item: item[1], reverse=True)
+    for package, total_ms in packages[:args.top]:
+        print(f"  {total_ms:9.1f} ms  {package}")
+
+    heavy = [name.strip() for name in args.heavy.split(",") if name.strip()]
+    imported = {entry["module"] for entry in entries}
+    loaded_heavy = [name for name in heavy if name in imported]
+    print("\n[무거운 패키지 import 여부]")
+    if loaded_heavy:
+        for name in loaded_heavy:
+            print(f"  ⚠️ {name}: import 시점에 로드됨")
+    else:
+        print("  ✅ 무거운 패키지 없음 (첫 사용 / startup 훅에서 로드)")
@@ -0,0 +1,10 @@
+"""
+테스트 공통 설정
+
+backend/ 에서 실행: python -m pytest tests
+"""
+import sys
+from pathlib import Path
+
+# 경로 추가 (app 패키지 import)
+sys.path.insert(0, str(Path(__file__).parent.parent))
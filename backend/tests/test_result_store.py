@@ -0,0 +1,170 @@
+"""
+결과 저장소 래퍼 테스트 (SQLiteResultStore + 임시 경로)
+
+- CachedResultStore: 동시 조회 합치기(single-flight), 조회 중 저장 시 이전 결과를 캐시하지 않음
+- WriteBehindResultStore: 저장 직후 조회(read-your-writes), flush 후 저장소 반영
+- query: 같은 analysis_timestamp가 여러 개일 때 keyset 페이지네이션
+"""
+import asyncio
+
+from app.services.result_store import SQLiteResultStore, CachedResultStore, WriteBehindResultStore
+
+class CountingStore(SQLiteResultStore):
+    """get 호출 수를 세고, gate가 있으면 읽은 뒤 gate가 열릴 때까지 반환을 지연"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.get_calls = 0
+        self.gate = None
+
+    async def get(self, result_id):
+        self.get_calls += 1
+        result = await super().get(result_id)
+        if self.gate is not None:
+            await self.gate.wait()
+        return result
+
+def _store(tmp_path, store_class=SQLiteResultStore):
+    return store_class("analysis_results", path=str(tmp_path / "results.db"))
+
+def test_cached_store_coalesces_concurrent_gets(tmp_path):
+    async def scenario():
+        backend = _store(tmp_path, CountingStore)
+        await backend.save("a1", {"value": 1})
+        store = CachedResultStore(backend, ttl=60, max_entries=8)
+
+        backend.gate = asyncio.Event()
+        waiters = [asyncio.create_task(store.get("a1")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        backend.gate.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == [{"value": 1}] * 5
+        assert backend.get_calls == 1
+        assert store.misses == 1 and store.coalesced == 4
+
+        # 캐시 적중 (저장소 조회 없음), 반환값을 수정해도 캐시는 그대로
+        cached = await store.get("a1")
+        cached["value"] = 99
+        assert await store.get("a1") == {"value": 1}
+        assert backend.get_calls == 1
+
+    asyncio.run(scenario())
+
+def test_cached_store_does_not_cache_stale_inflight_get(tmp_path):
+    async def scenario():
+        backend = _store(tmp_path, CountingStore)
+        await backend.save("a1", {"value": 1})
+        store = CachedResultStore(backend, ttl=60, max_entries=8)
+
+        # 이전 값을 읽은 조회가 끝나기 전에 새 값 저장
+        backend.gate = asyncio.Event()
+        stale = asyncio.create_task(store.get("a1"))
+        await asyncio.sleep(0.05)
+        await store.save("a1", {"value": 2})
+        backend.gate.set()
+        assert await stale == {"value": 1}
+
+        backend.gate = None
+        assert await store.get("a1") == {"value": 2}
+        assert backend.get_calls == 2
+
+    asyncio.run(scenario())
+
+class GatedSaveStore(SQLiteResultStore):
+    """save / get_many가 각 gate가 열릴 때까지 완료되지 않는 저장소 (write-behind 대기 상태 고정)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = asyncio.Event()
+        self.lookup_gate = None
+
+    async def save(self, result_id, result):
+        await self.gate.wait()
+        await super().save(result_id, result)
+
+    async def get_many(self, result_ids):
+        if self.lookup_gate is not None:
+            await self.lookup_gate.wait()
+        return await super().get_many(result_ids)
+
+def test_write_behind_read_your_writes_and_flush(tmp_path):
+    async def scenario():
+        backend = _store(tmp_path, GatedSaveStore)
+        store = WriteBehindResultStore(backend, retries=0)
+        await store.save("a1", {"value": 1})
+        await store.save("a1", {"value": 2})
+
+        # 저장이 끝나지 않은 상태: 대기 목록에서 반환
+        await asyncio.sleep(0.01)
+        assert store.get_status()["pending"] == 1
+        assert await store.get("a1") == {"value": 2}
+        assert await store.get_many(["a1", "missing"]) == {"a1": {"value": 2}}
+        assert await _store(tmp_path).get("a1") is None
+
+        backend.gate.set()
+        await store.flush()
+        assert store.get_status()["pending"] == 0
+        assert await store.get_many(["a1", "missing"]) == {"a1": {"value": 2}}
+        # 다른 연결에서도 마지막 결과가 보임
+        assert await _store(tmp_path).get("a1") == {"value": 2}
+
+    asyncio.run(scenario())
+
+def test_write_behind_get_many_during_drain(tmp_path):
+    async def scenario():
+        # 백엔드 조회를 기다리는 동안 저장이 끝나 대기 목록에서 빠져도 결과에 포함
+        backend = _store(tmp_path, GatedSaveStore)
+        store = WriteBehindResultStore(backend, retries=0)
+        await store.save("a1", {"value": 1})
+
+        backend.lookup_gate = asyncio.Event()
+        lookup = asyncio.create_task(store.get_many(["a1"]))
+        await asyncio.sleep(0.01)
+        backend.gate.set()
+        await store.flush()
+        assert store.get_status()["pending"] == 0
+        backend.lookup_gate.set()
+
+        assert await lookup == {"a1": {"value": 1}}
+
+    asyncio.run(scenario())
+
+def test_query_pages_through_equal_timestamps(tmp_path):
+    async def scenario():
+        store = _store(tmp_path)
+        expected = []
+        for timestamp, count in (("2026-01-01T00:00:00", 2), ("2026-01-02T00:00:00", 7), ("2026-01-03T00:00:00", 2)):
+            for i in range(count):
+                result_id = f"{timestamp[:10]}-{i:02d}"
+                await store.save(result_id, {"analysis_timestamp": timestamp, "user_id": "u1"})
+                expected.append(result_id)
+        await store.save("other", {"analysis_timestamp": "2026-01-02T00:00:00", "user_id": "u2"})
+
+        seen = []
+        after = None
+        while True:
+            page = await store.query(user_id="u1", after=after, limit=3)
+            seen.extend(result_id for result_id, _ in page)
+            if len(page) < 3:
+                break
+            last_id, last = page[-1]
+            after = (last["analysis_timestamp"], last_id)
+
+        assert seen == expected
+
+        # 기간 필터 [since, until)
+        page = await store.query(user_id="u1", since="2026-01-02T00:00:00", until="2026-01-03T00:00:00", limit=100)
+        assert [result_id for result_id, _ in page] == expected[2:9]
+
+    asyncio.run(scenario())
+
+def test_wrappers_accept_positional_query_arguments(tmp_path):
+    async def scenario():
+        backend = _store(tmp_path)
+        await backend.save("a1", {"analysis_timestamp": "2026-01-01T00:00:00", "user_id": "u1"})
+        store = CachedResultStore(WriteBehindResultStore(backend))
+        page = await store.query("u1", None, None, None, None, 10)
+        assert [result_id for result_id, _ in page] == ["a1"]
+
+    asyncio.run(scenario())
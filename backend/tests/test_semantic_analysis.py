@@ -0,0 +1,24 @@
+"""
+전사문 문장 분리 테스트
+
+- 숫자 사이 소수점은 문장 경계가 아님
+- 종결 어미 음절로 끝나는 단어 뒤 공백만으로는 나누지 않음 (종결 부호 / 쉼표 / 줄바꿈 필요)
+"""
+from app.services.semantic_analysis import split_sentences
+
+def test_split_sentences_keeps_decimal_numbers():
+    assert split_sentences("가격은 3.5달러입니다. 배송비는 2.75달러예요.") == [
+        "가격은 3.5달러입니다.", "배송비는 2.75달러예요."
+    ]
+
+def test_split_sentences_does_not_split_on_ending_syllable_before_space():
+    assert split_sentences("바다 위에서 배를 타고 놀았습니다") == ["바다 위에서 배를 타고 놀았습니다"]
+    assert split_sentences("우리는 바다 위에서 만났다가 헤어졌어요") == ["우리는 바다 위에서 만났다가 헤어졌어요"]
+
+def test_split_sentences_on_punctuation_comma_and_newline():
+    assert split_sentences("오늘 날씨가 정말 좋네요! 어디로 갈까요? 같이 산책을 가요") == [
+        "오늘 날씨가 정말 좋네요!", "어디로 갈까요?", "같이 산책을 가요"
+    ]
+    assert split_sentences("바다 위에서 놀았어요, 정말 재미있었죠\n다음에 또 오고 싶습니다") == [
+        "바다 위에서 놀았어요,", "정말 재미있었죠", "다음에 또 오고 싶습니다"
+    ]